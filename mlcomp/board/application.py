@@ -3,6 +3,7 @@ import json
 import os
 import re
 from contextlib import contextmanager
+from logging import getLogger
 
 import six
 from flask import Flask
@@ -10,9 +11,13 @@ from flask import Flask
 from mlcomp import __version__
 from mlcomp.persist import Storage
 from mlcomp.persist.storage_tree import StorageTree, StorageTreeWatcher
+from mlcomp.persist.storage_tree_index import get_tree_index_file
 from mlcomp.utils import object_to_dict, is_windows, BackgroundWorker
 from . import config
 from .views import api_bp, main_bp, storage_bp, report_bp
+from .changefeed import StorageChangeFeed
+from .listing import StorageListing
+from .snapshot import StorageSnapshot
 from .utils import MountTree
 from .webpack import Webpack
 
@@ -65,9 +70,27 @@ class BoardApp(BaseApp):
 
     disable_watcher : bool
         Whether or not to disable the file system watcher? (default False)
+
+    coalesce_window : float
+        Number of seconds to coalesce the file system events before
+        applying them to the storage trees.  If zero, the events will be
+        applied immediately. (default 1)
+
+    index_dir : str
+        If specified, the persistent index of each storage tree will be
+        saved in this directory, so as to speed up the startup of the
+        board.  (default None, no persistent index)
+
+        The indices are saved by every worker process of the board,
+        thus the directory should be writable, and should not be
+        shared by boards serving different versions of MLComp.
     """
 
-    def __init__(self, mappings, disable_watcher=False):
+    #: Number of seconds between two attempts to save the tree indices.
+    INDEX_SAVE_INTERVAL = 60
+
+    def __init__(self, mappings, disable_watcher=False, coalesce_window=1.,
+                 index_dir=None):
         if not disable_watcher and is_windows():
             raise RuntimeError('MLComp Board does not support watching file '
                                'system changes on windows yet.')
@@ -79,20 +102,46 @@ class BoardApp(BaseApp):
             for url, path in six.iteritems(mappings)
         }
 
-        # build the storage tree and watcher
+        # build the storage tree and watcher.  The storage objects are not
+        # constructed lazily, since the listing and the snapshot need the
+        # meta information of all the storage anyway.
+        def make_tree(path):
+            if index_dir is None:
+                return StorageTree(path)
+            return StorageTree(
+                path, index_file=get_tree_index_file(index_dir, path))
+
         self.trees = {
-            url: StorageTree(path)
+            url: make_tree(path)
             for url, path in six.iteritems(self.mappings)
         }
         self.mounts = MountTree()
         for url, tree in six.iteritems(self.trees):
             self.mounts.mount(url, tree)
+        self.storage_snapshot = StorageSnapshot(self.trees)
+        self.storage_listing = StorageListing(self.trees)
+        self.storage_changes = StorageChangeFeed(
+            self.trees, skew=coalesce_window + 5.)
         if disable_watcher:
             self.watcher = None
         else:
-            self.watcher = StorageTreeWatcher(six.itervalues(self.trees))
+            self.watcher = StorageTreeWatcher(
+                six.itervalues(self.trees),
+                coalesce_window=coalesce_window
+            )
             self.watcher.start()
 
+        # save the tree indices now and periodically after
+        self._index_save_failed = set()
+        if index_dir is None:
+            self.index_worker = None
+        else:
+            self.index_worker = BackgroundWorker(
+                self.save_tree_indices, self.INDEX_SAVE_INTERVAL,
+                name='tree index saver'
+            )
+            self.index_worker.start()
+
         # setup the plugins and views
         self.register_blueprint(main_bp, url_prefix='')
         self.register_blueprint(api_bp, url_prefix='/_api')
@@ -103,6 +152,26 @@ class BoardApp(BaseApp):
         """This method is provided for `storage_bp`."""
         return True
 
+    def save_tree_indices(self):
+        """Save the persistent indices of all storage trees."""
+        for tree in six.itervalues(self.trees):
+            try:
+                if tree.save_index():
+                    getLogger(__name__).debug(
+                        'Storage tree index of %r saved.', tree.path)
+                self._index_save_failed.discard(tree)
+            except Exception:
+                # warn only once until the index is saved successfully,
+                # since the failure might persist, e.g., on a read-only
+                # file system.
+                if tree in self._index_save_failed:
+                    log = getLogger(__name__).debug
+                else:
+                    log = getLogger(__name__).warning
+                    self._index_save_failed.add(tree)
+                log('Failed to save storage tree index of %r.', tree.path,
+                    exc_info=True)
+
 
 class StorageApp(BaseApp):
     """The single storage application.
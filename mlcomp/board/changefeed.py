@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import six
+
+from .utils import join_path
+
+__all__ = ['StorageChangeFeed']
+
+
+class StorageChangeFeed(object):
+    """Feed of the changes of the storage trees.
+
+    Every change reported by the storage trees is stamped with the
+    wall-clock time in milliseconds (made strictly increasing), and kept
+    in a bounded buffer, so that clients can ask for the changes since a
+    certain stamp, and wait for new changes if there is none yet.
+
+    Different worker processes serving the same board have their own
+    feeds, and each of them observes the file system changes on its own.
+    Since all of these feeds share the same clock, a stamp obtained from
+    one worker is also meaningful to the others: each query also reports
+    the changes stamped up to `skew` seconds before the requested stamp,
+    which covers the delay of one worker observing a change after another.
+    As a result, the same change might be reported more than once.
+
+    The feed ID is derived from the roots of the storage trees, thus is
+    identical among all the workers of a board.  A client should start
+    over if the feed ID differs from the one it has seen, or if the
+    changes it asks for are not available (either discarded from the
+    buffer, or happened before the worker process started).
+
+    Parameters
+    ----------
+    trees : dict[str, mlcomp.persist.storage_tree.StorageTree]
+        Mappings from URL prefix to storage tree.
+
+    capacity : int
+        The maximum number of changes to keep in the buffer.
+
+    skew : float
+        The maximum number of seconds between two worker processes
+        observing the same change. (default 5)
+    """
+
+    def __init__(self, trees, capacity=10000, skew=5.):
+        self.feed_id = self._get_feed_id(trees)
+        self.capacity = capacity
+        self.skew = skew
+        self._changes = deque()  # type: deque[(int, str)]
+        self._start = self._last = self._clock()
+        self._lost = 0  # stamp of the latest discarded change
+        self._cond = threading.Condition()
+        for prefix, tree in six.iteritems(trees):
+            tree.add_listener(self._make_listener(join_path(prefix)))
+
+    @staticmethod
+    def _get_feed_id(trees):
+        roots = sorted(
+            (join_path(prefix), os.path.realpath(tree.path))
+            for prefix, tree in six.iteritems(trees)
+        )
+        cnt = json.dumps(roots).encode('utf-8')
+        return hashlib.md5(cnt).hexdigest()
+
+    def _clock(self):
+        return int(time.time() * 1000)
+
+    def _make_listener(self, prefix):
+        def listener(path):
+            self.push(join_path(prefix, path))
+        return listener
+
+    @property
+    def seq(self):
+        """Get the stamp which covers all the changes recorded so far."""
+        return max(self._clock(), self._last)
+
+    def push(self, path):
+        """Push a change into the feed.
+
+        Parameters
+        ----------
+        path : str
+            The path of the change.  All the storage at or under this
+            path should be regarded as changed.
+
+        Returns
+        -------
+        int
+            The stamp of this change.
+        """
+        with self._cond:
+            self._last = max(self._clock(), self._last + 1)
+            if len(self._changes) >= self.capacity:
+                self._lost = self._changes.popleft()[0]
+            self._changes.append((self._last, path))
+            self._cond.notify_all()
+            return self._last
+
+    def since(self, seq, timeout=0):
+        """Get the changes after `seq`.
+
+        Parameters
+        ----------
+        seq : int
+            The stamp returned to the client by the previous query.
+
+        timeout : float
+            If there is no change after `seq`, wait for at most this
+            number of seconds for new changes. (default 0)
+
+        Returns
+        -------
+        (int, list[str] | None)
+            The stamp which covers all the returned changes, and the paths
+            of the changes after `seq` (including those within `skew`
+            seconds before `seq`).  Paths under another changed path will
+            be omitted.  If the changes after `seq` are no longer
+            available, None will be returned instead of the paths.
+        """
+        deadline = time.time() + timeout
+        threshold = seq - int(self.skew * 1000)
+        with self._cond:
+            if seq < self._start or threshold < self._lost:
+                return self.seq, None
+            while self._last <= seq:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            latest = max(self.seq, seq)
+            paths = set()
+            for s, p in reversed(self._changes):
+                if s <= threshold:
+                    break
+                paths.add(p)
+
+        # remove the paths under other changed paths
+        if '' in paths:
+            return latest, ['']
+        ret = []
+        for path in sorted(paths):
+            names = path.split('/')
+            if not any('/'.join(names[:i]) in paths
+                       for i in range(1, len(names))):
+                ret.append(path)
+        return latest, ret
@@ -127,11 +127,17 @@ else:
               help='Number of worker processes.')
 @click.option('--disable-watcher', default=False, is_flag=True,
               help='Whether or not to disable the file system watcher?')
+@click.option('--coalesce-window', default=1., type=click.FLOAT,
+              help='Number of seconds to coalesce the file system events '
+                   'before applying them to the storage trees.')
+@click.option('--index-dir', default=None,
+              help='Directory to save the persistent storage tree indices, '
+                   'which speed up the startup of the board.')
 @click.option('--debug', default=False, is_flag=True,
               help='Whether or not to enable debugging features?')
 @click.argument('root-dir', default=None, required=False)
 def main(host, port, log_file, log_level, log_format, root_dir, prefix, workers,
-         disable_watcher, debug):
+         disable_watcher, coalesce_window, index_dir, debug):
     """MLComp experiment browser."""
     if ':' in host:
         print('Specify PORT in HOST argument is now deprecated.')
@@ -166,6 +172,9 @@ def main(host, port, log_file, log_level, log_format, root_dir, prefix, workers,
         cls, args, kwargs = BoardApp, (mappings,), {}
 
     kwargs.setdefault('disable_watcher', disable_watcher)
+    if issubclass(cls, BoardApp):
+        kwargs.setdefault('coalesce_window', coalesce_window)
+        kwargs.setdefault('index_dir', index_dir)
 
     # initialize the logging
     init_logging(log_file, log_level, log_format)
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+import base64
+import itertools
+import json
+import threading
+import time
+from collections import deque
+
+import six
+from sortedcontainers import SortedList
+
+from mlcomp.persist.storage import STORAGE_RUNNING_STATUS_INTERVAL
+from .utils import join_path
+
+__all__ = ['StorageListing']
+
+
+def encode_cursor(key):
+    """Encode the sort key of the last item in a page as a cursor."""
+    cnt = json.dumps(list(key)).encode('utf-8')
+    return base64.urlsafe_b64encode(cnt).decode('utf-8')
+
+
+def decode_cursor(cursor):
+    """Decode the cursor produced by `encode_cursor`.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed.
+    """
+    try:
+        if isinstance(cursor, six.text_type):
+            cursor = cursor.encode('utf-8')
+        key = json.loads(base64.urlsafe_b64decode(cursor).decode('utf-8'))
+    except Exception:
+        raise ValueError('Malformed cursor %r.' % (cursor,))
+    if not isinstance(key, list) or len(key) != 2 or \
+            not isinstance(key[1], six.string_types):
+        raise ValueError('Malformed cursor %r.' % (cursor,))
+    # the sort value must be a path or a (non-NaN) timestamp, otherwise
+    # it would not be comparable with the sort keys of the index
+    value = key[0]
+    if not isinstance(value, six.string_types) and (
+            isinstance(value, bool) or
+            not isinstance(value, six.integer_types + (float,)) or
+            value != value):
+        raise ValueError('Malformed cursor %r.' % (cursor,))
+    return tuple(key)
+
+
+class _Record(object):
+    """Indexed fields of a storage."""
+
+    __slots__ = ('tree', 'path', 'values', 'create_time', 'update_time',
+                 'tags', 'active_time')
+
+    def __init__(self, tree, path, values):
+        running_status = values.get('running_status') or {}
+        self.tree = tree
+        self.path = path
+        self.values = values
+        self.create_time = values.get('create_time') or 0.
+        self.update_time = values.get('update_time') or 0.
+        self.tags = frozenset(values.get('tags') or ())
+        self.active_time = running_status.get('active_time')
+
+    def is_active(self, now):
+        active_time = self.active_time
+        return bool(active_time) and \
+            now - active_time < STORAGE_RUNNING_STATUS_INTERVAL * 2
+
+    def sort_key(self, sort_by):
+        if sort_by == 'path':
+            return self.path, self.path
+        return getattr(self, sort_by), self.path
+
+    def to_dict(self, now):
+        ret = dict(self.values)
+        ret['path'] = self.path
+        ret['is_active'] = self.is_active(now)
+        return ret
+
+
+class StorageListing(object):
+    """In-memory index for listing the storage in the storage trees.
+
+    The index keeps the dicts of all the storage, ordered by path,
+    create time and update time, while the storage grouped by tags are
+    looked up from the meta indexes of the trees (see
+    :attr:`~mlcomp.persist.storage_tree.StorageTree.meta_index`).
+    A query is answered by scanning only the smallest candidate set
+    among these indexes, and is paginated by cursors, which are the
+    sort keys of the last items in the previous pages.
+
+    The index is fed by the meta indexes of the trees, which load each
+    changed storage only once for all their subscribers.  The re-indexed
+    storage are not applied at once, but only before the next query, so
+    that a storage changed many times between two queries is only
+    applied once.
+
+    Parameters
+    ----------
+    trees : dict[str, mlcomp.persist.storage_tree.StorageTree]
+        Mappings from URL prefix to storage tree.
+    """
+
+    #: The keys which the storage can be sorted by.
+    SORT_KEYS = ('path', 'create_time', 'update_time')
+
+    def __init__(self, trees):
+        self.trees = {tree: join_path(prefix)
+                      for prefix, tree in six.iteritems(trees)}
+        self._lock = threading.Lock()
+        self._records = {}      # type: dict[str, _Record]
+        self._sorted = {k: SortedList() for k in self.SORT_KEYS}
+        # the re-indexed storage reported by the meta indexes, which are
+        # appended without locking, since `deque.append` is thread-safe
+        self._pending = deque()
+        for tree in self.trees:
+            tree.meta_index.add_listener(self._make_listener(tree))
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._records)
+
+    def _make_listener(self, tree):
+        def listener(path, items):
+            self._pending.append((tree, path, items))
+        return listener
+
+    def _remove(self, path):
+        record = self._records.pop(path)
+        for k in self.SORT_KEYS:
+            self._sorted[k].remove(record.sort_key(k))
+
+    def _add(self, tree, path, values):
+        if path in self._records:
+            self._remove(path)
+        record = _Record(tree, path, values)
+        self._records[path] = record
+        for k in self.SORT_KEYS:
+            self._sorted[k].add(record.sort_key(k))
+
+    def _refresh(self):
+        for tree in self.trees:
+            tree.meta_index.refresh()
+        while self._pending:
+            tree, path, items = self._pending.popleft()
+            prefix = self.trees[tree]
+            full_path = join_path(prefix, path)
+            if full_path:
+                keys = [k for _, k in self._prefix_keys(full_path)]
+            else:
+                keys = list(self._records)
+            # the records with unchanged values are kept as they are, so
+            # that re-indexing a large subtree (e.g., the whole tree when
+            # its root directory has changed) only touches the changed ones
+            added = {join_path(prefix, p): values for p, _, values in items}
+            for k in keys:
+                record = self._records[k]
+                if record.tree is tree:
+                    if record.values == added.get(k):
+                        del added[k]
+                    else:
+                        self._remove(k)
+            for k, values in six.iteritems(added):
+                self._add(tree, k, values)
+
+    def list_prefix(self, prefix):
+        """Get the dicts of all the storage at or under `prefix`.
+
+        Parameters
+        ----------
+        prefix : str
+            The path prefix.  All the storage will be returned if
+            `prefix` is empty.
+
+        Returns
+        -------
+        list[dict]
+            The dicts of the storage, sorted by path.
+        """
+        prefix = join_path(prefix)
+        now = time.time()
+        with self._lock:
+            self._refresh()
+            if prefix:
+                keys = self._prefix_keys(prefix)
+            else:
+                keys = self._sorted['path']
+            return [self._records[k].to_dict(now) for _, k in keys]
+
+    def query(self, prefix=None, tags=None, has_error=None, is_active=None,
+              create_time=(None, None), update_time=(None, None),
+              sort_by='path', reverse=False, limit=100, cursor=None):
+        """Query the storage.
+
+        Parameters
+        ----------
+        prefix : str
+            If specified, only the storage at or under this path will
+            be selected.
+
+        tags : collections.Iterable[str]
+            If specified, only the storage with all these tags will be
+            selected.
+
+        has_error : bool
+            If specified, only the storage with (or without) error will
+            be selected.
+
+        is_active : bool
+            If specified, only the active (or inactive) storage will
+            be selected.
+
+        create_time, update_time : (float, float)
+            If specified, only the storage with create (or update) time
+            within the range ``[min, max)`` will be selected.  Either side
+            of the range can be None, indicating no bound.
+
+        sort_by : {'path', 'create_time', 'update_time'}
+            The key to sort the storage.
+
+        reverse : bool
+            Whether or not to sort the storage in descending order?
+
+        limit : int
+            The maximum number of storage to return.
+
+        cursor : str
+            The cursor returned by the previous query, to get the next
+            page of the storage.
+
+        Returns
+        -------
+        (list[dict], str)
+            The dicts of the selected storage, and the cursor of the next
+            page (or None if there is no more page).
+
+        Raises
+        ------
+        ValueError
+            If `sort_by` or `cursor` is invalid.
+        """
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError('Unknown sort key %r.' % (sort_by,))
+        if cursor is not None:
+            cursor = decode_cursor(cursor)
+            if isinstance(cursor[0], six.string_types) != (sort_by == 'path'):
+                raise ValueError('The cursor does not match the sort key.')
+        prefix = join_path(prefix) if prefix else None
+        tags = frozenset(tags) if tags else None
+        now = time.time()
+
+        def in_range(value, r):
+            return (r[0] is None or value >= r[0]) and \
+                (r[1] is None or value < r[1])
+
+        def match(record):
+            return (
+                (not prefix or record.path == prefix or
+                 record.path.startswith(prefix + '/')) and
+                (tags is None or tags.issubset(record.tags)) and
+                (has_error is None or
+                 bool(record.values.get('has_error')) == has_error) and
+                (is_active is None or record.is_active(now) == is_active) and
+                in_range(record.create_time, create_time) and
+                in_range(record.update_time, update_time)
+            )
+
+        with self._lock:
+            self._refresh()
+            keys = self._candidates(prefix, tags, create_time, update_time,
+                                    sort_by, reverse, cursor)
+            items = []
+            last_key = None
+            for key in keys:
+                record = self._records[key[1]]
+                if match(record):
+                    if len(items) >= limit:
+                        return items, encode_cursor(last_key)
+                    items.append(record.to_dict(now))
+                    last_key = key
+            return items, None
+
+    def _candidates(self, prefix, tags, create_time, update_time, sort_by,
+                    reverse, cursor):
+        """Get the sort keys of the smallest candidate set, in order."""
+        def range_size(sort_key, r):
+            sl = self._sorted[sort_key]
+            start = sl.bisect_left((r[0],)) if r[0] is not None else 0
+            stop = sl.bisect_left((r[1],)) if r[1] is not None else len(sl)
+            return max(stop - start, 0)
+
+        # gather the candidate sets and their sizes
+        candidates = [(len(self._records), sort_by, (None, None))]
+        if prefix:
+            size = range_size('path', (prefix + '/', prefix + '0')) + 1
+            candidates.append((size, 'path', prefix))
+        for k, r in (('create_time', create_time),
+                     ('update_time', update_time)):
+            if r[0] is not None or r[1] is not None:
+                candidates.append((range_size(k, r), k, r))
+        if tags:
+            tag_sets = sorted((self._tag_paths(t) for t in tags), key=len)
+            candidates.append((len(tag_sets[0]), None, tag_sets[0]))
+
+        # choose the smallest candidate set, preferring the ordered one
+        size, key, source = min(
+            candidates, key=lambda v: (v[0], v[1] != sort_by))
+        if key == sort_by:
+            if isinstance(source, six.string_types):
+                return self._prefix_keys(source, reverse, cursor)
+            return self._range_keys(key, source, reverse, cursor)
+
+        # the candidate set is not ordered by the sort key
+        if key is None:
+            paths = source
+        elif key == 'path':
+            paths = [p for _, p in self._prefix_keys(source)]
+        else:
+            paths = [p for _, p in self._range_keys(key, source)]
+        keys = sorted((self._records[p].sort_key(sort_by) for p in paths),
+                      reverse=reverse)
+        if cursor is not None:
+            if reverse:
+                keys = [k for k in keys if k < cursor]
+            else:
+                keys = [k for k in keys if k > cursor]
+        return keys
+
+    def _tag_paths(self, tag):
+        """Get the paths of the storage with `tag`."""
+        # the meta indexes are refreshed separately from this index, so
+        # the paths not yet (or no longer) in this index are excluded.
+        return [
+            p
+            for tree, prefix in six.iteritems(self.trees)
+            for p in (join_path(prefix, q)
+                      for q, _ in tree.meta_index.find_by_tag(tag))
+            if p in self._records and self._records[p].tree is tree
+        ]
+
+    def _range_keys(self, sort_key, r, reverse=False, cursor=None):
+        """Iterate the sort keys with values in the range ``[min, max)``."""
+        lo = (r[0],) if r[0] is not None else None
+        hi = (r[1],) if r[1] is not None else None
+        sl = self._sorted[sort_key]
+        if reverse:
+            if cursor is not None and (hi is None or cursor < hi):
+                hi = cursor
+            return sl.irange(lo, hi, inclusive=(True, False), reverse=True)
+        if cursor is not None and (lo is None or cursor >= lo):
+            return sl.irange(cursor, hi, inclusive=(False, False))
+        return sl.irange(lo, hi, inclusive=(True, False))
+
+    def _prefix_keys(self, prefix, reverse=False, cursor=None):
+        """Iterate the path sort keys at or under `prefix`."""
+        exact = (prefix, prefix)
+        if exact not in self._sorted['path'] or (
+                cursor is not None and
+                (exact >= cursor if reverse else exact <= cursor)):
+            exact = None
+        children = self._range_keys(
+            'path', (prefix + '/', prefix + '0'), reverse, cursor)
+        if exact is None:
+            return children
+        if reverse:
+            return itertools.chain(children, [exact])
+        return itertools.chain([exact], children)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+
+import six
+from sortedcontainers import SortedSet
+
+from mlcomp.persist.storage import STORAGE_RUNNING_STATUS_INTERVAL
+from .utils import join_path
+
+__all__ = ['StorageSnapshot']
+
+
+class _SnapshotNode(object):
+    """Node of the snapshot, with the cached JSON fragment of its subtree."""
+
+    __slots__ = ('name', 'parent', 'children', 'data', 'fragment')
+
+    def __init__(self, name=None, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = {}      # type: dict[str, _SnapshotNode]
+        self.data = None        # type: (StorageTree, dict)
+        self.fragment = None    # type: str
+
+    def touch(self):
+        """Discard the cached fragments of this node and its ancestors."""
+        self.fragment = None
+        # the fragments of the ancestors of a built node without fragment
+        # have been discarded as well
+        node = self.parent
+        while node is not None and node.fragment is not None:
+            node.fragment = None
+            node = node.parent
+
+
+class StorageSnapshot(object):
+    """Cached JSON snapshot of all the storage in the storage trees.
+
+    The snapshot is built from the dicts of all the storage, which are
+    reported by the meta indexes of the trees (see
+    :attr:`~mlcomp.persist.storage_tree.StorageTree.meta_index`).
+    The JSON fragment of each subtree is cached, and only the fragments
+    on the paths to the changed storage are serialized again, while the
+    others are spliced as they are.  An active storage also discards its
+    fragments when it is about to become inactive.  Polling an unchanged
+    snapshot thus costs nothing but a check of the root fragment.
+
+    The changes are queued without locking, and applied before the next
+    request of the snapshot, thus never block the storage trees.
+
+    Parameters
+    ----------
+    trees : dict[str, mlcomp.persist.storage_tree.StorageTree]
+        Mappings from URL prefix to storage tree.
+    """
+
+    def __init__(self, trees):
+        self.trees = dict(trees)
+        self._lock = threading.Lock()
+        self._root = _SnapshotNode()
+        self._snapshot = None       # type: (str, bytes)
+        # the time when each active storage becomes inactive
+        self._expiry = SortedSet()  # type: SortedSet[(float, str)]
+        # the re-indexed storage reported by the meta indexes, which are
+        # appended without locking, since `deque.append` is thread-safe
+        self._pending = deque()
+        for prefix, tree in six.iteritems(self.trees):
+            tree.meta_index.add_listener(
+                self._make_listener(join_path(prefix), tree))
+
+    def _make_listener(self, prefix, tree):
+        def listener(path, items):
+            self._pending.append((prefix, tree, path, items))
+        return listener
+
+    def _get_node(self, path, create=False):
+        node = self._root
+        for name in (v for v in path.split('/') if v):
+            child = node.children.get(name)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[name] = _SnapshotNode(name, node)
+            node = child
+        return node
+
+    def _remove(self, tree, path):
+        """Remove the dicts of `tree` at or under `path`."""
+        def remove(node):
+            changed = False
+            if node.data is not None and node.data[0] is tree:
+                node.data = None
+                changed = True
+            for name, child in list(six.iteritems(node.children)):
+                if remove(child):
+                    changed = True
+                    if child.data is None and not child.children:
+                        del node.children[name]
+            if changed:
+                node.fragment = None
+            return changed
+
+        node = self._get_node(path)
+        if node is not None and remove(node):
+            # remove the ancestors left without data or children
+            while node.parent is not None and node.data is None and \
+                    not node.children:
+                del node.parent.children[node.name]
+                node = node.parent
+            node.touch()
+
+    def _apply_pending(self, now):
+        for tree in six.itervalues(self.trees):
+            tree.meta_index.refresh()
+        while self._pending:
+            prefix, tree, path, items = self._pending.popleft()
+            self._remove(tree, join_path(prefix, path))
+            for p, _, d in items:
+                node = self._get_node(join_path(prefix, p), create=True)
+                node.data = (tree, d)
+                node.touch()
+        while self._expiry and self._expiry[0][0] <= now:
+            node = self._get_node(self._expiry.pop(0)[1])
+            if node is not None:
+                node.touch()
+
+    def _build(self, node, path, now):
+        if node.fragment is None:
+            pieces = []
+            for name in sorted(six.iterkeys(node.children)):
+                child = node.children[name]
+                fragment = self._build(child, path + '/' + name, now)
+                if fragment:
+                    pieces.append('[%s, %s]' % (json.dumps(name), fragment))
+            if pieces:
+                node.fragment = '[%s]' % ', '.join(pieces)
+            elif node.data is not None:
+                d = dict(node.data[1])
+                active_time = (d.get('running_status') or {}).get(
+                    'active_time')
+                expire_time = None
+                if active_time:
+                    expire_time = \
+                        active_time + STORAGE_RUNNING_STATUS_INTERVAL * 2
+                d['is_active'] = expire_time is not None and \
+                    expire_time > now
+                if d['is_active']:
+                    self._expiry.add((expire_time, path))
+                node.fragment = json.dumps(d, sort_keys=True)
+            else:
+                node.fragment = ''
+        return node.fragment
+
+    def get(self):
+        """Get the snapshot, rebuilding it if necessary.
+
+        Returns
+        -------
+        (str, bytes)
+            The ETag and the JSON content of the snapshot.
+        """
+        now = time.time()
+        with self._lock:
+            self._apply_pending(now)
+            if self._snapshot is None or self._root.fragment is None:
+                cnt = (self._build(self._root, '', now) or '[]')
+                cnt = cnt.encode('utf-8')
+                etag = hashlib.sha1(cnt).hexdigest()
+                self._snapshot = (etag, cnt)
+            return self._snapshot
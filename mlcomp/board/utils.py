@@ -1,5 +1,14 @@
 # -*- coding: utf-8 -*-
-__all__ = ['MountTree']
+__all__ = ['MountTree', 'join_path']
+
+
+def join_path(*paths):
+    """Join the "/" separated paths, with the empty segments ignored.
+
+    The joined path neither starts nor ends with "/", for example,
+    ``join_path('/a/', 'b//c/')`` returns ``'a/b/c'``.
+    """
+    return '/'.join(v for p in paths for v in p.split('/') if v)
 
 
 class MountTreeNode(object):
@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
-import six
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, jsonify, current_app, request
+from werkzeug.exceptions import BadRequest
 
-from ..utils import MountTree
 from .utils import is_testing
 
 api_bp = Blueprint('api', __name__.rsplit('.')[1])
 
+#: Default number of storage in a page of `/list`.
+LIST_STORAGE_DEFAULT_LIMIT = 100
+
+#: Maximum number of storage in a page of `/list`.
+LIST_STORAGE_MAX_LIMIT = 1000
+
+#: Maximum number of seconds for `/changes` to wait for new changes.
+#: The board is served by synchronous gunicorn workers, each of which is
+#: occupied by a waiting request, so the wait is kept short.
+CHANGES_MAX_TIMEOUT = 5
+
 
 if is_testing():
     @api_bp.route('/_hello/')
@@ -16,27 +26,142 @@ if is_testing():
 
 @api_bp.route('/all')
 def all_storage():
-    """Get all storage in JSON."""
-    trees = current_app.trees
-    mounts = MountTree()
-    for prefix, tree in six.iteritems(trees):
-        for path, storage in tree.iter_storage():
-            mounts.mount(prefix + '/' + path, storage)
-
-    # get a compressed representation of the tree
-    def dfs(node):
-        children = node.children
-        if children:
-            ret = []
-            for name in sorted(six.iterkeys(children)):
-                child = children[name]
-                child_ret = dfs(child)
-                if child_ret:
-                    ret.append((name, child_ret))
-            if ret:
-                return ret
-        data = node.data
-        if data:
-            return data.to_dict()
-
-    return jsonify(dfs(mounts.root) or [])
+    """Get all storage in JSON.
+
+    The response carries an ETag, so that clients polling this API
+    would receive "304 Not Modified" if nothing has changed.
+    """
+    etag, cnt = current_app.storage_snapshot.get()
+    resp = current_app.response_class(cnt, mimetype='application/json')
+    resp.set_etag(etag)
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
+
+
+@api_bp.route('/watcher')
+def watcher_stats():
+    """Get the counters of the file system watcher in JSON.
+
+    The response is null if the watcher is disabled, otherwise it
+    contains the coalesce window, as well as the number of events
+    received, dropped, coalesced and applied.
+    """
+    watcher = current_app.watcher
+    if watcher is None:
+        return jsonify(None)
+    stats = dict(watcher.stats)
+    stats['coalesce_window'] = watcher.queue.window
+    stats['pending'] = len(watcher.queue)
+    return jsonify(stats)
+
+
+def _parse_bool_arg(name):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    value = value.lower()
+    if value in ('1', 'true', 'yes', 'on'):
+        return True
+    if value in ('0', 'false', 'no', 'off'):
+        return False
+    raise BadRequest('Invalid value for argument %r.' % (name,))
+
+
+def _parse_float_arg(name):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise BadRequest('Invalid value for argument %r.' % (name,))
+
+
+@api_bp.route('/list')
+def list_storage():
+    """Query the storage, returning one page of the results in JSON.
+
+    The following query arguments are supported:
+
+    *   prefix: only the storage at or under this path.
+    *   tag: only the storage with this tag (can be specified repeatedly).
+    *   has_error, is_active: "true" or "false".
+    *   create_time_min, create_time_max, update_time_min, update_time_max:
+        the range of create (or update) time, as timestamps.
+    *   sort: one of "path", "create_time" and "update_time", optionally
+        prefixed by "-" to indicate descending order.
+    *   limit: the maximum number of storage in a page.
+    *   cursor: the "next_cursor" from the response of the previous page.
+    """
+    sort_by = request.args.get('sort') or 'path'
+    reverse = sort_by.startswith('-')
+    if reverse:
+        sort_by = sort_by[1:]
+    try:
+        limit = int(request.args.get('limit') or LIST_STORAGE_DEFAULT_LIMIT)
+    except ValueError:
+        raise BadRequest('Invalid value for argument \'limit\'.')
+    limit = min(max(limit, 1), LIST_STORAGE_MAX_LIMIT)
+
+    try:
+        items, next_cursor = current_app.storage_listing.query(
+            prefix=request.args.get('prefix'),
+            tags=request.args.getlist('tag'),
+            has_error=_parse_bool_arg('has_error'),
+            is_active=_parse_bool_arg('is_active'),
+            create_time=(_parse_float_arg('create_time_min'),
+                         _parse_float_arg('create_time_max')),
+            update_time=(_parse_float_arg('update_time_min'),
+                         _parse_float_arg('update_time_max')),
+            sort_by=sort_by,
+            reverse=reverse,
+            limit=limit,
+            cursor=request.args.get('cursor') or None,
+        )
+    except ValueError as ex:
+        raise BadRequest(str(ex))
+    return jsonify({'items': items, 'next_cursor': next_cursor})
+
+
+@api_bp.route('/changes')
+def storage_changes():
+    """Get the changes of the storage since a certain stamp.
+
+    The following query arguments are supported:
+
+    *   feed, since: the "feed" and "seq" from the response of the previous
+        request.  If not specified, only the current "feed" and "seq" will
+        be returned, after which the client should fetch the full listing.
+        These values are shared by all the worker processes of the board.
+    *   timeout: if there is no change yet, wait for at most this number
+        of seconds for new changes (long-polling).  It is capped at
+        `CHANGES_MAX_TIMEOUT` seconds.
+
+    The response contains the dicts of all the storage at or under each
+    changed path (an empty list indicates the path has been removed).
+    If "reset" is true, the changes are no longer available, and the
+    client should fetch the full listing again.
+    """
+    feed = current_app.storage_changes
+    since = request.args.get('since')
+    timeout = _parse_float_arg('timeout') or 0.
+    timeout = min(max(timeout, 0.), CHANGES_MAX_TIMEOUT)
+    if since is None or request.args.get('feed') != feed.feed_id:
+        seq, paths = feed.seq, None
+    else:
+        try:
+            since = int(since)
+        except ValueError:
+            raise BadRequest('Invalid value for argument \'since\'.')
+        seq, paths = feed.since(since, timeout=timeout)
+
+    listing = current_app.storage_listing
+    return jsonify({
+        'feed': feed.feed_id,
+        'seq': seq,
+        'reset': paths is None,
+        'changes': [
+            {'path': p, 'storage': listing.list_prefix(p)}
+            for p in (paths or ())
+        ],
+    })
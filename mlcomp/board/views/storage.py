@@ -12,8 +12,10 @@ import six
 import zipstream
 from flask import (Blueprint, current_app, send_from_directory, render_template,
                    jsonify, request, url_for, safe_join, Response)
-from werkzeug.exceptions import NotFound, MethodNotAllowed, InternalServerError
+from werkzeug.exceptions import (NotFound, MethodNotAllowed, BadRequest,
+                                 InternalServerError)
 
+from mlcomp.persist import read_metrics_log
 from .utils import is_testing, send_from_directory_ex
 
 if six.PY2:
@@ -149,6 +151,27 @@ def handle_file_stat(storage, root_url, path):
         return jsonify(stat_to_entity(os.path.split(fpath)[1], st))
 
 
+def handle_metrics_log(storage, path):
+    # with the `offset` argument, only the records after this byte offset
+    # are returned, along with the offset for the next request.  This is
+    # intended for clients polling for new records; the board pages do not
+    # use it yet.
+    offset = request.args.get('offset', None)
+    if offset is None:
+        return send_from_directory_ex(storage.path, path)
+    try:
+        offset = int(offset)
+        if offset < 0:
+            raise ValueError()
+    except ValueError:
+        raise BadRequest()
+    fpath = safe_join(storage.path, path)
+    if fpath is None or not os.path.isfile(fpath):
+        raise NotFound()
+    records, offset = read_metrics_log(fpath, offset)
+    return jsonify({'records': records, 'offset': offset})
+
+
 def handle_storage_zip(storage):
     def collect(z, path, relpath):
         if os.path.isdir(path):
@@ -208,6 +231,10 @@ def resources(storage, root, path):
     if request.method != 'GET':
         raise MethodNotAllowed()
 
+    # if the metrics logs are requested, optionally from specified offset
+    if path.startswith('metrics/'):
+        return handle_metrics_log(storage, path)
+
     # if some static resources displayed at storage index are requested
     if path.startswith('report/') or path in ('console.log', 'storage.json'):
         return send_from_directory_ex(storage.path, path)
@@ -2,9 +2,11 @@
 import mimetypes
 import os
 
-from flask import send_from_directory
+from flask import send_from_directory, safe_join, request, Response
 from werkzeug.exceptions import NotFound
 
+from mlcomp.report.compression import iter_codecs
+
 
 def is_testing():
     """Whether or not the testing routes should be added?"""
@@ -15,7 +17,10 @@ def send_from_directory_ex(directory, filename, **kwargs):
     """Extended `send_from_directory`.
 
     This version of `send_from_directory` will would send 'abc.xxx.gz' as
-    response to the request for 'abc.xxx'.
+    response to the request for 'abc.xxx'.  Files compressed by other
+    codecs in `mlcomp.report.compression` are sent in the same way if
+    the client accepts their "Content-Encoding", or are decompressed
+    before being sent otherwise.
     """
 
     try:
@@ -30,6 +35,22 @@ def send_from_directory_ex(directory, filename, **kwargs):
                 'application/octet-stream'
             )
             kwargs['mimetype'] = mimetype
-        ret = send_from_directory(directory, filename + '.gz', **kwargs)
-        ret.headers['Content-Encoding'] = 'gzip'
-        return ret
\ No newline at end of file
+        for codec in iter_codecs():
+            path = safe_join(directory, filename + codec.suffix)
+            if not os.path.isfile(path):
+                continue
+            # gzip is always sent as it is, as the browsers all support it
+            encoding = codec.content_encoding
+            if encoding == 'gzip' or (
+                    encoding and encoding in request.accept_encodings):
+                ret = send_from_directory(
+                    directory, filename + codec.suffix, **kwargs)
+                ret.headers['Content-Encoding'] = encoding
+            else:
+                with open(path, 'rb') as f:
+                    ret = Response(codec.decompress(f.read()),
+                                   mimetype=kwargs['mimetype'])
+            if encoding != 'gzip':
+                ret.vary.add('Accept-Encoding')
+            return ret
+        raise
@@ -8,5 +8,6 @@ in a web application.
 """
 
 from .errors import *
+from .metrics_log import *
 from .storage import *
 from .storage_group import *
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import time
+
+import numpy as np
+import six
+
+from mlcomp.utils import JsonEncoder, makedirs
+
+__all__ = [
+    'MetricsLogWriter', 'MetricsLogReader', 'read_metrics_log',
+    'METRICS_LOG_STEP_KEY',
+]
+
+#: The key of the step in each metrics record.
+METRICS_LOG_STEP_KEY = 'step'
+
+
+def _truncate_incomplete_line(path, chunk_size=8192):
+    """Truncate the incomplete last line left by a crashed writer."""
+    try:
+        f = open(path, 'rb+')
+    except (IOError, OSError):
+        if not os.path.exists(path):
+            return
+        raise
+    with f:
+        f.seek(0, 2)
+        end = size = f.tell()
+        while end > 0:
+            start = max(end - chunk_size, 0)
+            f.seek(start)
+            chunk = f.read(end - start)
+            if end == size and chunk.endswith(b'\n'):
+                return
+            pos = chunk.rfind(b'\n')
+            if pos >= 0:
+                end = start + pos + 1
+                break
+            end = start
+        f.truncate(end)
+
+
+class MetricsLogWriter(object):
+    """Append-only writer of a training metrics log.
+
+    The metrics log is a line-delimited JSON file, where each line is a
+    record of metrics at one step, for example::
+
+        {"step": 100, "loss": 0.25, "valid loss": 0.31}
+
+    The records are buffered in memory, and are appended to the file once
+    there are `flush_size` buffered records, or `flush_interval` seconds
+    has elapsed since the last flush.  Only complete lines are appended,
+    so that the readers never see partial records.  If the log is left
+    with an incomplete last line by a crashed writer, the line is
+    truncated when the log is opened again.
+
+    Parameters
+    ----------
+    path : str
+        Path of the metrics log file.
+
+    flush_interval : float
+        Maximum number of seconds to buffer the records. (default 5)
+
+    flush_size : int
+        Maximum number of records to buffer. (default 1000)
+    """
+
+    def __init__(self, path, flush_interval=5., flush_size=1000):
+        parent = os.path.split(path)[0]
+        if parent:
+            makedirs(parent, exist_ok=True)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._buffer = []
+        self._last_flush = time.time()
+        _truncate_incomplete_line(path)
+        self._file = open(path, 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def closed(self):
+        """Whether or not this writer has been closed?"""
+        return self._file is None
+
+    def write(self, step, **metrics):
+        """Write the metrics at specified step.
+
+        Parameters
+        ----------
+        step : int | float
+            The step of the metrics.
+
+        **metrics
+            The metric values, e.g., ``loss=0.25``.
+        """
+        if self._file is None:
+            raise IOError('The metrics log has been closed.')
+        record = {METRICS_LOG_STEP_KEY: step}
+        record.update(metrics)
+        self._buffer.append(
+            json.dumps(record, cls=JsonEncoder, sort_keys=True))
+        if len(self._buffer) >= self.flush_size or \
+                time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Append all the buffered records to the file."""
+        if self._buffer:
+            self._file.write(
+                ('\n'.join(self._buffer) + '\n').encode('utf-8'))
+            self._buffer = []
+        self._file.flush()
+        self._last_flush = time.time()
+
+    def close(self):
+        """Flush the buffered records and close the file."""
+        if self._file is not None:
+            try:
+                self.flush()
+            finally:
+                self._file.close()
+                self._file = None
+
+
+def read_metrics_log(path, offset=0):
+    """Read the records of a metrics log starting from `offset`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the metrics log file.
+
+    offset : int
+        The byte offset to start reading from, which should be the offset
+        returned by a previous call. (default 0)
+
+    Returns
+    -------
+    (list[dict], int)
+        The complete records after `offset`, and the byte offset after the
+        last complete line.  An incomplete line at the end of the file
+        is not consumed, while the malformed lines are skipped.
+    """
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            cnt = f.read()
+    except (IOError, OSError):
+        if not os.path.exists(path):
+            return [], offset
+        raise
+    end = cnt.rfind(b'\n') + 1
+    records = []
+    for line in cnt[:end].splitlines():
+        if line.strip():
+            try:
+                record = json.loads(line.decode('utf-8'))
+            except ValueError:
+                continue
+            if isinstance(record, dict) and METRICS_LOG_STEP_KEY in record:
+                records.append(record)
+    return records, offset + end
+
+
+class _ArrayBuffer(object):
+    """Growable array, with amortized O(1) cost for each appended item."""
+
+    def __init__(self):
+        self._array = None
+        self._size = 0
+
+    def extend(self, values):
+        values = np.asarray(values)
+        size = self._size + len(values)
+        if self._array is None:
+            self._array = np.empty(max(size, 16), dtype=values.dtype)
+        elif size > len(self._array) or \
+                not np.can_cast(values.dtype, self._array.dtype):
+            dtype = np.result_type(self._array, values)
+            array = np.empty(max(size, 2 * len(self._array)), dtype=dtype)
+            array[:self._size] = self._array[:self._size]
+            self._array = array
+        self._array[self._size: size] = values
+        self._size = size
+
+    def view(self):
+        return self._array[:self._size]
+
+
+class MetricsLogReader(object):
+    """Incremental reader of a training metrics log.
+
+    Each call to `update` only reads the records appended since the
+    previous call, and appends them to the growable arrays of each metric,
+    so keeping the arrays up-to-date costs time proportional to the number
+    of new records.
+
+    Parameters
+    ----------
+    path : str
+        Path of the metrics log file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self._steps = {}    # type: dict[str, _ArrayBuffer]
+        self._values = {}   # type: dict[str, _ArrayBuffer]
+
+    def update(self):
+        """Read the newly appended records.
+
+        Returns
+        -------
+        int
+            The number of new records.
+        """
+        records, self.offset = read_metrics_log(self.path, self.offset)
+        new_steps, new_values = {}, {}
+        for record in records:
+            step = record[METRICS_LOG_STEP_KEY]
+            for k, v in six.iteritems(record):
+                if k != METRICS_LOG_STEP_KEY:
+                    new_steps.setdefault(k, []).append(step)
+                    new_values.setdefault(k, []).append(v)
+        for k in new_steps:
+            if k not in self._steps:
+                self._steps[k] = _ArrayBuffer()
+                self._values[k] = _ArrayBuffer()
+            self._steps[k].extend(new_steps[k])
+            self._values[k].extend(new_values[k])
+        return len(records)
+
+    @property
+    def names(self):
+        """Get the sorted names of the metrics read so far."""
+        return sorted(self._steps)
+
+    def get(self, name):
+        """Get the steps and values of a metric.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray)
+            The steps and values of the metric, which are views of the
+            internal buffers and should not be modified.
+        """
+        if name not in self._steps:
+            raise KeyError('Metric %r is not found.' % (name,))
+        return self._steps[name].view(), self._values[name].view()
+
+    def loss_accuracy_curve(self, metrics, secondary_metrics=None, **kwargs):
+        """Update and build a loss and accuracy curve of the metrics.
+
+        Only the reading of the log is incremental: the chart is built
+        from all the points of the metrics on every call, which costs time
+        proportional to the length of the whole log.  Clients polling for
+        new records should use `update` and `get`, or request the metrics
+        log from the board with the `offset` query argument instead.
+
+        Parameters
+        ----------
+        metrics : collections.Iterable[str]
+            Names of the main metrics.
+
+        secondary_metrics : collections.Iterable[str]
+            Names of the secondary metrics (with secondary y-axis at right).
+
+        **kwargs
+            Other arguments passed to `loss_accuracy_curve`.  Specify
+            `max_points` to bound the size of the chart.
+
+        Returns
+        -------
+        mlcomp.report.CanvasJS
+            The chart of the metrics.
+        """
+        from mlcomp.report import loss_accuracy_curve
+
+        def to_dicts(names):
+            ret = []
+            for name in names or ():
+                steps, values = self.get(name)
+                ret.append({'name': name, 'steps': steps, 'values': values})
+            return ret
+
+        self.update()
+        return loss_accuracy_curve(
+            to_dicts(metrics), secondary_metrics=to_dicts(secondary_metrics),
+            **kwargs
+        )
@@ -17,9 +17,11 @@ import six
 from mlcomp.utils import (BackgroundWorker, PathExcludes, default_path_excludes,
                           makedirs, statpath)
 from .errors import StorageReadOnlyError
+from .metrics_log import MetricsLogWriter, MetricsLogReader
 from .storage_meta import StorageMeta
 from .storage_status import StorageRunningStatus
-from .utils import duplicate_console_output
+from .utils import (duplicate_console_output, write_file_atomically,
+                    file_signature, is_signature_racy)
 
 if six.PY2:
     JsonDecodeError = ValueError
@@ -30,7 +32,8 @@ __all__ = [
     'Storage',
     'STORAGE_META_FILE', 'STORAGE_CONSOLE_LOG', 'STORAGE_RUNNING_STATUS',
     'STORAGE_RUNNING_STATUS_INTERVAL', 'STORAGE_REPORT_DIR',
-    'STORAGE_SCRIPT_DIR',
+    'STORAGE_REPORT_BLOB_DIR',
+    'STORAGE_SCRIPT_DIR', 'STORAGE_METRICS_DIR', 'STORAGE_METRICS_LOG_EXT',
 ]
 
 # Constants for storage classes
@@ -39,7 +42,10 @@ STORAGE_CONSOLE_LOG = 'console.log'
 STORAGE_RUNNING_STATUS = 'running.json'
 STORAGE_RUNNING_STATUS_INTERVAL = 2 * 60
 STORAGE_REPORT_DIR = 'report'
+STORAGE_REPORT_BLOB_DIR = '.blobs'
 STORAGE_SCRIPT_DIR = 'script'
+STORAGE_METRICS_DIR = 'metrics'
+STORAGE_METRICS_LOG_EXT = '.jsonl'
 
 
 def storage_property(name):
@@ -116,8 +122,7 @@ class Storage(object):
             initial_cnt = json.dumps({
                 'create_time': time.time()
             })
-            with codecs.open(meta_file, 'wb', 'utf-8') as f:
-                f.write(initial_cnt)
+            write_file_atomically(meta_file, initial_cnt, fsync=True)
         else:
             # non-directory entry should cause an error
             if not stat.S_ISDIR(st.st_mode):
@@ -136,7 +141,9 @@ class Storage(object):
         self._path = path
         self._mode = mode
         self._meta = StorageMeta(self, meta_file)
-        self._running_status = self._load_running_status()
+        self._running_status = None
+        self._running_status_signature = None
+        self._reload_running_status()
         self._logging_captured = False
 
     # the read-only properties of this class
@@ -207,6 +214,24 @@ class Storage(object):
                     active_time=values.get('active_time')
                 )
 
+    def _reload_running_status(self):
+        status_file = self.resolve_path(STORAGE_RUNNING_STATUS)
+        signature = file_signature(status_file)
+        if signature is None:
+            changed = self._running_status is not None
+            self._running_status = None
+            self._running_status_signature = None
+            return changed
+        if signature == self._running_status_signature:
+            return False
+        status = self._load_running_status()
+        changed = not (status == self._running_status)
+        self._running_status = status
+        if status is None or is_signature_racy(signature):
+            signature = None
+        self._running_status_signature = signature
+        return changed
+
     @property
     def readonly(self):
         """Whether or not the storage is read-only?"""
@@ -241,9 +266,20 @@ class Storage(object):
         return path
 
     def reload(self):
-        """Reload contents from the storage."""
-        self._meta.reload()
-        self._running_status = self._load_running_status()
+        """Reload contents from the storage.
+
+        The meta information and the running status files will be parsed
+        only if their signatures (inode, size and mtime) have changed, thus
+        reloading an unchanged storage costs only two `stat` calls.
+
+        Returns
+        -------
+        bool
+            Whether or not the contents have been changed.
+        """
+        meta_changed = self._meta.reload()
+        status_changed = self._reload_running_status()
+        return meta_changed or status_changed
 
     def reopen(self, mode):
         """Re-open the storage in alternative mode.
@@ -270,6 +306,25 @@ class Storage(object):
         ret['update_time'] = self.update_or_active_time
         return ret
 
+    @contextmanager
+    def batch_update(self):
+        """Open a context to modify the meta information in batch.
+
+        All the modifications of the meta information within this context,
+        e.g., setting the description and adding tags, will be saved by
+        one atomic write after leaving the context.  If an error is raised
+        within this context, none of them will be saved.
+
+        Examples
+        --------
+        >>> with storage.batch_update():
+        ...     storage.description = 'some experiment'
+        ...     for tag in ('tag1', 'tag2'):
+        ...         storage.tags.add(tag)
+        """
+        with self._meta.modify_context():
+            yield self
+
     @contextmanager
     def capture_logging(self, filename=STORAGE_CONSOLE_LOG, append=True):
         """Capture the console output and logs within a context.
@@ -343,6 +398,7 @@ class Storage(object):
             # the object will lose track of the latest status.
             # thus we need to set the status here.
             self._running_status = status
+            self._running_status_signature = None
 
         worker = BackgroundWorker(update_status, update_interval)
         try:
@@ -368,6 +424,7 @@ class Storage(object):
         This method will open all other contexts, including `capture_logging()`
         and `keep_running_status()`.
         """
+        has_error = True
         try:
             with self.capture_logging(), self.keep_running_status():
                 try:
@@ -378,13 +435,12 @@ class Storage(object):
                     getLogger(__name__).exception(
                         'An error occurred within storage context.')
                     raise
-            self._meta.has_error = False
-        except Exception:
-            self._meta.has_error = True
-            raise
+            has_error = False
         finally:
             try:
-                self._meta.update_time = time.time()
+                with self._meta.modify_context():
+                    self._meta.has_error = has_error
+                    self._meta.update_time = time.time()
             except Exception:
                 getLogger(__name__).info(
                     'Failed to write update time of %r.', self, exc_info=True)
@@ -410,7 +466,8 @@ class Storage(object):
         except IOError:
             return []
 
-    def save_report(self, report, dir_name='default', overwrite=False):
+    def save_report(self, report, dir_name='default', overwrite=False,
+                    deduplicate=False):
         """Save a report object into the storage.
 
         Parameters
@@ -426,16 +483,125 @@ class Storage(object):
 
         overwrite : bool
             Whether or not to overwrite existing files?  Default is False.
+
+        deduplicate : bool
+            Whether or not to store the resources as content-addressed
+            blobs under `'report/' + STORAGE_REPORT_BLOB_DIR`, shared by
+            all the reports of this storage?  Identical resources will
+            then be stored only once.  Default is False.
+
+        Notes
+        -----
+        If this storage has any blob, the resources of an overwritten
+        report will be removed before saving the new one, and the blobs
+        no longer used by any report will be removed after saving.
         """
         if not dir_name:
             raise ValueError('`dir_name` must be non-empty.')
         if '/' in dir_name or '\\' in dir_name:
             raise ValueError('`dir_name` must not contain "/" or "\\".')
+        if dir_name == STORAGE_REPORT_BLOB_DIR:
+            raise ValueError('`dir_name` must not be %r.' %
+                             (STORAGE_REPORT_BLOB_DIR,))
         self.check_write()
-        from mlcomp.report import ReportSaver
-        s = ReportSaver(self.resolve_path(STORAGE_REPORT_DIR, dir_name),
-                        overwrite=overwrite)
+        from mlcomp.report import ReportSaver, REPORT_RESOURCE_DIR
+        save_dir = self.resolve_path(STORAGE_REPORT_DIR, dir_name)
+        blob_dir = self.resolve_path(STORAGE_REPORT_DIR,
+                                     STORAGE_REPORT_BLOB_DIR)
+        has_blobs = deduplicate or os.path.isdir(blob_dir)
+        if overwrite and has_blobs:
+            # the stale resources of the previous report might be hard
+            # links to the blobs, which would keep them from being removed.
+            shutil.rmtree(os.path.join(save_dir, REPORT_RESOURCE_DIR),
+                          ignore_errors=True)
+        s = ReportSaver(save_dir, overwrite=overwrite,
+                        blob_dir=blob_dir if deduplicate else None)
         s.save(report)
+        if has_blobs:
+            self.collect_report_blobs()
+
+    def collect_report_blobs(self):
+        """Remove the report blobs which are no longer used by any report.
+
+        This should be called after removing the reports saved with
+        `deduplicate`, in order to reclaim the disk space of their blobs.
+
+        Returns
+        -------
+        int
+            The number of removed blobs.
+        """
+        self.check_write()
+        from mlcomp.report import collect_blobs
+        return collect_blobs(self.resolve_path(STORAGE_REPORT_DIR,
+                                               STORAGE_REPORT_BLOB_DIR))
+
+    def _metrics_log_path(self, name):
+        if not name:
+            raise ValueError('`name` must be non-empty.')
+        if '/' in name or '\\' in name:
+            raise ValueError('`name` must not contain "/" or "\\".')
+        return self.resolve_path(STORAGE_METRICS_DIR,
+                                 name + STORAGE_METRICS_LOG_EXT)
+
+    def list_metrics_logs(self):
+        """List the metrics logs of this storage.
+
+        Returns
+        -------
+        list[str]
+            The names of the metrics logs under "metrics/" of this storage.
+        """
+        metrics_dir = self.resolve_path(STORAGE_METRICS_DIR)
+        try:
+            return sorted(
+                fname[: -len(STORAGE_METRICS_LOG_EXT)]
+                for fname in os.listdir(metrics_dir)
+                if fname.endswith(STORAGE_METRICS_LOG_EXT)
+            )
+        except (IOError, OSError):
+            return []
+
+    def open_metrics_log(self, name='default', flush_interval=5.,
+                         flush_size=1000):
+        """Open a metrics log of this storage for appending.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metrics log.
+
+            The log will be actually placed at
+            `'metrics/' + name + STORAGE_METRICS_LOG_EXT`.
+            Default value for this argument is 'default'.
+
+        flush_interval, flush_size
+            Arguments passed to `MetricsLogWriter`.
+
+        Returns
+        -------
+        MetricsLogWriter
+            The writer of the metrics log.
+        """
+        self.check_write()
+        return MetricsLogWriter(self._metrics_log_path(name),
+                                flush_interval=flush_interval,
+                                flush_size=flush_size)
+
+    def metrics_log_reader(self, name='default'):
+        """Get an incremental reader of a metrics log of this storage.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metrics log. (default 'default')
+
+        Returns
+        -------
+        MetricsLogReader
+            The reader of the metrics log.
+        """
+        return MetricsLogReader(self._metrics_log_path(name))
 
     _PROTECTED_FILES = re.compile(
         r'''
@@ -445,7 +611,7 @@ class Storage(object):
           # the main file pattern
           (?:
             # match protected directories
-            (report)(?:$|[/\\].*)
+            (report|metrics)(?:$|[/\\].*)
 
             # match protected files
           | (storage\.json|console\.log|running.json)$
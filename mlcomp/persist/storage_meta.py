@@ -7,6 +7,8 @@ from contextlib import contextmanager
 from sortedcontainers import SortedSet
 
 from .errors import StorageReadOnlyError
+from .utils import (write_file_atomically, file_signature,
+                    is_signature_racy)
 
 __all__ = []
 
@@ -108,6 +110,8 @@ class StorageMeta(object):
         self.meta_file = meta_file
         self.values = {}
         self._tags = None
+        self._modify_depth = 0
+        self._signature = None
         self.reload()
 
     def __repr__(self):
@@ -119,9 +123,24 @@ class StorageMeta(object):
 
         The meta information will be saved to storage immediately
         after leaving this context, if no error is raised.
+
+        The contexts can be nested, in which case the meta information
+        will be saved only once after leaving the outermost context.
+        If an error is raised out of the outermost context, all the
+        modifications within it will be discarded.
         """
         self.storage.check_write()
+        if self._modify_depth > 0:
+            self._modify_depth += 1
+            try:
+                yield
+            finally:
+                self._modify_depth -= 1
+            return
+
         old_values = copy.copy(self.values)
+        old_tags = list(self._tags)
+        self._modify_depth = 1
         try:
             yield
             if self._tags:
@@ -129,17 +148,40 @@ class StorageMeta(object):
             else:
                 self.values.pop('tags', None)
             serialized = json.dumps(self.values)
-            with codecs.open(self.meta_file, 'wb', 'utf-8') as f:
-                f.write(serialized)
+            write_file_atomically(self.meta_file, serialized, fsync=True)
+            self._signature = None
         except Exception:
+            # restore the tags in place, since the callers might be
+            # holding the `StorageMetaTags` object
             self.values = old_values
+            self._tags.set_items(old_tags)
             raise
+        finally:
+            self._modify_depth = 0
 
     def reload(self):
-        """Reload the meta information from file."""
+        """Reload the meta information from file.
+
+        The file will not be parsed if its signature is the same as the
+        one when it was parsed last time.
+
+        Returns
+        -------
+        bool
+            Whether or not the meta information has been changed.
+        """
+        signature = file_signature(self.meta_file)
+        if signature is not None and signature == self._signature:
+            return False
         with codecs.open(self.meta_file, 'rb', 'utf-8') as f:
-            self.values = json.load(f)
-            self._tags = StorageMetaTags(self, self.values.get('tags'))
+            values = json.load(f)
+        changed = values != self.values
+        self.values = values
+        self._tags = StorageMetaTags(self, values.get('tags'))
+        if signature is None or is_signature_racy(signature):
+            signature = None
+        self._signature = signature
+        return changed
 
     # mappers from json attributes to properties
     create_time = StorageMetaProperty.named('create_time', readonly=True)
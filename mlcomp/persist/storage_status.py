@@ -6,6 +6,8 @@ import socket
 
 import time
 
+from .utils import write_file_atomically
+
 __all__ = ['StorageRunningStatus']
 
 
@@ -47,6 +49,11 @@ class StorageRunningStatus(object):
             return self.to_dict() == other.to_dict()
         return False
 
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
     def to_dict(self):
         return {
             'pid': self.pid,
@@ -95,5 +102,4 @@ class StorageRunningStatus(object):
 
     def save_file(self, status_file):
         """Save the running status to file."""
-        with codecs.open(status_file, 'wb', 'utf-8') as f:
-            json.dump(self.to_dict(), f)
+        write_file_atomically(status_file, json.dumps(self.to_dict()))
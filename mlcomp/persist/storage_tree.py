@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
 import re
+import threading
 from logging import getLogger
 
 import six
@@ -8,8 +9,11 @@ from sortedcontainers import SortedDict
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
-from mlcomp.utils import default_path_excludes
-from .storage import Storage, STORAGE_META_FILE
+from mlcomp.utils import default_path_excludes, BackgroundWorker
+from .storage import Storage, STORAGE_META_FILE, STORAGE_RUNNING_STATUS
+from .storage_tree_index import (StorageTreeIndex, list_storage_dir,
+                                 STORAGE_TREE_INDEX_DIR)
+from .storage_tree_meta_index import StorageTreeMetaIndex
 
 __all__ = ['StorageTree', 'StorageTreeWatcher']
 
@@ -39,34 +43,84 @@ class StorageTreeNode(object):
 
     need_reload : bool
         Whether or not this node needs reloading?
+
+    index : StorageTreeIndex
+        The persistent index of the tree, which should be used and
+        updated when reloading this node.
+
+    is_storage : bool
+        Whether or not this node is a storage?
+
+        If `storage` is not specified while `is_storage` is True,
+        the storage object will be constructed at its first access.
+        (default is whether or not `storage` is specified)
+
+    lazy : bool
+        Whether or not to construct the storage objects lazily when
+        reloading this node? (default False)
     """
 
     def __init__(self, name, path, mode, children=None, storage=None,
-                 need_reload=False):
+                 need_reload=False, index=None, is_storage=None, lazy=False):
         if mode not in ('read', 'write'):
             raise ValueError('Invalid mode %r.' % mode)
+        if is_storage is None:
+            is_storage = storage is not None
         self.name = name
         self.path = os.path.abspath(path)
         self.mode = mode
+        self.index = index          # type: StorageTreeIndex
+        self.lazy = lazy
         self._children = children   # type: SortedDict[str, StorageTreeNode]
         self._storage = storage     # type: Storage
+        self._is_storage = is_storage
         self._need_reload = need_reload
 
     def __repr__(self):
         return 'StorageTreeNode(%r)' % (self.path,)
 
     @classmethod
-    def from_dir(cls, root_dir, mode):
-        """Create the node from specified path."""
+    def from_dir(cls, root_dir, mode, index=None, lazy=False):
+        """Create the node from specified path.
+
+        Parameters
+        ----------
+        root_dir : str
+            The directory of this node.
+
+        mode : {'read', 'write'}
+            In which mode should the storage to be open?
+
+        index : StorageTreeIndex
+            If specified, will use this index to avoid listing the
+            directories which have not been changed.
+
+        lazy : bool
+            If True, will only record whether or not a node is a storage,
+            and defer the construction of storage objects until they are
+            actually accessed. (default False)
+        """
+        def inspect_dir(path):
+            if index is not None:
+                return index.inspect_dir(path)
+            if os.path.isdir(path):
+                return list_storage_dir(path)
+
         def scan_dir(name, path):
             if not default_path_excludes.is_excluded(path):
-                meta_file = os.path.join(path, STORAGE_META_FILE)
-                if os.path.isfile(meta_file):
-                    s = Storage(path, mode)
-                    return StorageTreeNode(s.name, path, mode, storage=s)
-                elif os.path.isdir(path):
+                inspected = inspect_dir(path)
+                if inspected is None:
+                    return
+                is_storage, subdirs = inspected
+                if is_storage:
+                    s = None if lazy else Storage(path, mode)
+                    return StorageTreeNode(
+                        os.path.split(path)[1], path, mode, storage=s,
+                        index=index, is_storage=True, lazy=lazy
+                    )
+                else:
                     children = []
-                    for f in sorted(os.listdir(path)):
+                    for f in subdirs:
                         f_path = os.path.join(path, f)
                         node = scan_dir(f, f_path)
                         if node:
@@ -74,19 +128,34 @@ class StorageTreeNode(object):
                     if children:
                         children = SortedDict(children)
                         ret = StorageTreeNode(
-                            name, path, mode, children=children)
+                            name, path, mode, children=children, index=index,
+                            lazy=lazy
+                        )
                         return ret
         return scan_dir('', os.path.abspath(root_dir))
 
     def _reload(self):
-        nd = self.from_dir(self.path, self.mode)
+        nd = self.from_dir(self.path, self.mode, index=self.index,
+                           lazy=self.lazy)
         if nd:
-            self._children = nd.children
-            self._storage = nd.storage
+            self._children = nd._children
+            self._storage = nd._storage
+            self._is_storage = nd._is_storage
         else:
             self._children = self._storage = None
+            self._is_storage = False
         self._need_reload = False
 
+    def _load_storage(self):
+        try:
+            return Storage(self.path, self.mode)
+        except Exception:
+            # the storage might have been removed or broken after the
+            # tree was scanned, in which case we just leave it unloaded,
+            # and let the next access to try again.
+            getLogger(__name__).warning(
+                'Failed to load storage %r.', self.path, exc_info=True)
+
     def reload(self):
         """Force reloading the node."""
         self._reload()
@@ -105,10 +174,23 @@ class StorageTreeNode(object):
             self._reload()
         return self._children
 
+    @property
+    def is_storage(self):
+        """Whether or not this node is a storage?
+
+        Different from checking `storage`, this property would not
+        construct the storage object of a lazy node.
+        """
+        if self._need_reload:
+            self._reload()
+        return self._is_storage
+
     @property
     def storage(self):
         if self._need_reload:
             self._reload()
+        if self._storage is None and self._is_storage:
+            self._storage = self._load_storage()
         return self._storage
 
 
@@ -122,23 +204,110 @@ class StorageTree(object):
 
     mode : {'read', 'write'}
         In which mode should the storage to be open?
+
+    index_file : str
+        If specified, will use a persistent index at this path to build
+        the tree, so that only the directories whose mtime have changed
+        since the index was saved need to be re-scanned.
+        The index will not be saved automatically, see `save_index()`.
+
+    lazy : bool
+        Whether or not to construct the storage objects lazily, i.e.,
+        only when they are actually accessed? (default False)
+
+        Note this only defers the construction from building the tree
+        to the first access.  Iterating the storage via `iter_storage`,
+        or looking them up via `meta_index`, still constructs all the
+        storage objects under the iterated path.
     """
 
-    def __init__(self, path, mode='read'):
-        self.root = StorageTreeNode.from_dir(path, mode=mode)
+    def __init__(self, path, mode='read', index_file=None, lazy=False):
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._meta_index = None
+        if index_file is not None:
+            self.index = StorageTreeIndex(path, index_file)
+            self.index.load()
+        else:
+            self.index = None
+        self.root = StorageTreeNode.from_dir(
+            path, mode=mode, index=self.index, lazy=lazy)
         # if the path does not exist, the root might be None
         # in this case we need to construct an empty root
         if self.root is None:
-            self.root = StorageTreeNode('', os.path.abspath(path), mode)
+            self.root = StorageTreeNode('', os.path.abspath(path), mode,
+                                        index=self.index, lazy=lazy)
 
     @property
     def path(self):
         return self.root.path
 
-    def iter_storage(self):
-        """Iterate through all the storage in this tree."""
-        stack = [(False, self.root)]
-        names = []
+    def add_listener(self, callback):
+        """Add a listener to be notified when the tree has been changed.
+
+        Parameters
+        ----------
+        callback : (str) -> None
+            The callback, which receives the path of the changed node,
+            relative to the tree root.  All the storage at or under this
+            path should be regarded as changed.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Remove a listener added by `add_listener`."""
+        self._listeners.remove(callback)
+
+    def _notify_change(self, path):
+        for callback in list(self._listeners):
+            try:
+                callback(path)
+            except Exception:
+                getLogger(__name__).warning(
+                    'Storage tree listener %r failed.', callback,
+                    exc_info=True
+                )
+
+    def save_index(self):
+        """Save the persistent index of this tree, if it has been changed.
+
+        Returns
+        -------
+        bool
+            Whether or not the index file has been written.
+        """
+        if self.index is not None:
+            return self.index.save()
+        return False
+
+    def iter_storage(self, path=''):
+        """Iterate through all the storage in this tree.
+
+        Parameters
+        ----------
+        path : str
+            If specified, only iterate through the storage at or under
+            this path, relative to the tree root.
+
+        Yields
+        ------
+        (str, Storage)
+            The path and the storage object of each storage.
+            The storage objects of a lazy tree are constructed on demand.
+        """
+        node = self.root
+        names = self._split_path(path)
+        for name in names:
+            if node.is_storage:
+                return
+            children = node.children
+            if not children or name not in children:
+                return
+            node = children[name]
+        names = names[:-1]
+        if node is not self.root:
+            names.insert(0, self.root.name)
+        stack = [(False, node)]
         while stack:
             expanded, node = stack.pop()
             if expanded:
@@ -154,6 +323,74 @@ class StorageTree(object):
                     for c in reversed(list(six.itervalues(children))):
                         stack.append((False, c))
 
+    @property
+    def meta_index(self):
+        """Get the secondary indexes over the meta information.
+
+        The indexes are built at the first access of this property,
+        and are kept updated with the changes of this tree since then.
+
+        Returns
+        -------
+        StorageTreeMetaIndex
+        """
+        if self._meta_index is None:
+            with self._lock:
+                if self._meta_index is None:
+                    self._meta_index = StorageTreeMetaIndex(self)
+        return self._meta_index
+
+    def find_by_tag(self, tag):
+        """Find the storage with specified tag.
+
+        Parameters
+        ----------
+        tag : str
+            The tag of the storage.
+
+        Returns
+        -------
+        list[(str, Storage)]
+            The paths and the storage objects, sorted by paths.
+        """
+        return self.meta_index.find_by_tag(tag)
+
+    def find_by_hostname(self, hostname):
+        """Find the storage with specified hostname in running status.
+
+        Parameters
+        ----------
+        hostname : str
+            The hostname of the running status.
+
+        Returns
+        -------
+        list[(str, Storage)]
+            The paths and the storage objects, sorted by paths.
+        """
+        return self.meta_index.find_by_hostname(hostname)
+
+    def find_by_create_time(self, start=None, stop=None, reverse=False):
+        """Find the storage created within specified time range.
+
+        Parameters
+        ----------
+        start, stop : float
+            The time range ``[start, stop)``.  Either side can be None,
+            indicating no bound.
+
+        reverse : bool
+            Whether or not to sort the storage from the latest to the
+            earliest? (default False)
+
+        Returns
+        -------
+        list[(str, Storage)]
+            The paths and the storage objects, sorted by create time.
+        """
+        return self.meta_index.find_by_create_time(
+            start=start, stop=stop, reverse=reverse)
+
     def find_storage(self, path):
         """Find a storage according to the path.
 
@@ -193,6 +430,7 @@ class StorageTree(object):
         path : str
             The path to be reloaded.
         """
+        self._notify_change('/'.join(self._split_path(path)))
         names = re.split(r'[/\\]+', path)
         node = self.root
         for name in filter(lambda v: v, names):
@@ -206,72 +444,469 @@ class StorageTree(object):
             node = children[name]
         node.set_reload()
 
+    @staticmethod
+    def _split_path(path):
+        return [v for v in re.split(r'[/\\]+', path) if v]
+
+    def _replace_node(self, names, new_node):
+        """Replace the node at path `names` with `new_node`.
+
+        Missing intermediate nodes will be created if `new_node` is not
+        None, while intermediate nodes left without children will be
+        removed if `new_node` is None.  The children of every changed
+        node will be replaced by an updated copy instead of being modified
+        in place, so that readers holding the old ones are not affected.
+
+        Returns
+        -------
+        bool
+            Whether or not the tree has been changed.
+        """
+        root = self.root
+        nodes = [root]
+        attached = [True]
+        for name in names[:-1]:
+            node = nodes[-1]
+            if node._is_storage:
+                # the path is inside a storage, thus not a part of the tree
+                return False
+            child = node._children.get(name) if node._children else None
+            attached.append(child is not None)
+            if child is None:
+                if new_node is None:
+                    return False
+                child = StorageTreeNode(
+                    name, os.path.join(node.path, name), root.mode,
+                    index=root.index, lazy=root.lazy
+                )
+            nodes.append(child)
+        if nodes[-1]._is_storage:
+            return False
+
+        # update the nodes from bottom to top
+        name, child = names[-1], new_node
+        for node, is_attached in zip(reversed(nodes), reversed(attached)):
+            children = SortedDict(node._children or ())
+            if child is not None:
+                children[name] = child
+            elif name in children:
+                del children[name]
+            else:
+                return False
+            node._children = children or None
+            if child is not None:
+                if is_attached:
+                    return True
+                # attach this newly created node to its parent
+                name, child = node.name, node
+            else:
+                if children or node is root:
+                    return True
+                # remove this node from its parent since it's now empty
+                name = node.name
+        return True
+
+    def is_inside_storage(self, path):
+        """Check whether or not `path` is inside a storage.
+
+        A path is inside a storage if any of its proper ancestors is a
+        storage.  Such paths are not parts of the tree, and the changes
+        of them need not to be watched.
+
+        Parameters
+        ----------
+        path : str
+            The path to be checked, relative to the tree root.
+        """
+        node = self.root
+        for name in self._split_path(path):
+            if node._is_storage:
+                return True
+            children = node._children
+            if not children or name not in children:
+                return False
+            node = children[name]
+        return False
+
+    def update_path(self, path):
+        """Scan the directory at `path` and update the tree accordingly.
+
+        Only the directory at `path` will be scanned, as well as its
+        descendants if it is not a storage.  This method should be
+        called when a directory is created or moved into the tree,
+        or when a directory becomes (or ceases to be) a storage.
+
+        Parameters
+        ----------
+        path : str
+            The path of the directory, relative to the tree root.
+
+        Returns
+        -------
+        bool
+            Whether or not the tree has been changed.
+        """
+        names = self._split_path(path)
+        with self._lock:
+            if not names:
+                self.root.reload()
+                changed = True
+            else:
+                root = self.root
+                dir_path = os.path.join(root.path, *names)
+                if root.index is not None:
+                    root.index.invalidate(os.path.split(dir_path)[0])
+                node = StorageTreeNode.from_dir(
+                    dir_path, root.mode, index=root.index, lazy=root.lazy)
+                if node is not None:
+                    node.name = names[-1]
+                changed = self._replace_node(names, node)
+        if changed:
+            self._notify_change('/'.join(names))
+        return changed
+
+    def remove_path(self, path):
+        """Remove the node at `path` from the tree.
+
+        This method should be called when a directory is removed or
+        moved out of the tree.
+
+        Parameters
+        ----------
+        path : str
+            The path of the directory, relative to the tree root.
+
+        Returns
+        -------
+        bool
+            Whether or not the tree has been changed.
+        """
+        names = self._split_path(path)
+        with self._lock:
+            if not names:
+                self.root._children = self.root._storage = None
+                self.root._is_storage = False
+                changed = True
+            else:
+                root = self.root
+                if root.index is not None:
+                    root.index.invalidate(
+                        os.path.split(os.path.join(root.path, *names))[0])
+                changed = self._replace_node(names, None)
+        if changed:
+            self._notify_change('/'.join(names))
+        return changed
+
+    def reload_storage(self, path):
+        """Reload the storage at `path`.
+
+        If the node at `path` is a storage, only its meta information and
+        running status will be reloaded (a lazy storage which has not been
+        constructed does not need to be reloaded at all), and the listeners
+        will be notified only if they have actually changed.  Otherwise the
+        directory will be scanned by `update_path`.
+
+        Parameters
+        ----------
+        path : str
+            The path of the storage, relative to the tree root.
+
+        Returns
+        -------
+        bool
+            Whether or not the tree has been changed.
+        """
+        names = self._split_path(path)
+        node = self.root
+        for name in names:
+            if node._is_storage:
+                # the path is inside a storage
+                return False
+            children = node._children
+            if not children or name not in children:
+                node = None
+                break
+            node = children[name]
+        if node is not None and node._is_storage:
+            storage = node._storage
+            if storage is not None and storage.reload():
+                self._notify_change('/'.join(names))
+            return False
+        return self.update_path(path)
+
+
+class StorageTreeEventQueue(object):
+    """Queue which coalesces the pending changes of storage trees.
+
+    A running experiment may touch its storage many times per second,
+    thus applying every file system event to the tree at once would be
+    wasteful.  This queue instead collects the changes of each path over
+    a short window, merges the duplicated ones, and applies them at once
+    when flushed.  An update of some directory would also absorb the
+    pending changes of its descendants, since they will be re-scanned
+    by the update anyway.
+
+    Parameters
+    ----------
+    window : float
+        Number of seconds to collect the changes before applying them.
+        If zero, the changes will be applied immediately. (default 0)
+    """
+
+    #: Reload the storage at the path.
+    RELOAD = 1
+
+    #: Re-scan the directory at the path, which absorbs `RELOAD`.
+    UPDATE = 2
+
+    def __init__(self, window=0):
+        self.window = window
+        self._pending = {}      # type: dict[(StorageTree, str), int]
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._worker = None     # type: BackgroundWorker
+        self._received = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._applied = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def stats(self):
+        """Get the counters of this queue.
+
+        Returns
+        -------
+        dict[str, int]
+            The number of events received, the number of events dropped
+            as irrelevant, the number of changes coalesced with others,
+            and the number of changes actually applied to the trees.
+        """
+        with self._lock:
+            return {
+                'received': self._received,
+                'dropped': self._dropped,
+                'coalesced': self._coalesced,
+                'applied': self._applied,
+            }
+
+    def drop(self):
+        """Record an event which is irrelevant to the trees."""
+        with self._lock:
+            self._received += 1
+            self._dropped += 1
+
+    def put(self, tree, path, action):
+        """Put a change into the queue.
+
+        Parameters
+        ----------
+        tree : StorageTree
+            The storage tree.
+
+        path : str
+            The normalized path of the change, relative to the tree root.
+
+        action : int
+            Either `UPDATE` or `RELOAD`.
+        """
+        key = (tree, path)
+        with self._lock:
+            self._received += 1
+            old_action = self._pending.get(key)
+            if old_action is not None:
+                self._coalesced += 1
+                if old_action >= action:
+                    action = None
+            if action is not None:
+                self._pending[key] = action
+        if not self.window:
+            self.flush()
+
+    def flush(self):
+        """Apply all the pending changes to the trees.
+
+        Returns
+        -------
+        int
+            The number of changes applied.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            # group the changes by trees, such that the parent directories
+            # will be processed before their children
+            by_tree = {}
+            for (tree, path), action in six.iteritems(pending):
+                by_tree.setdefault(tree, []).append((path, action))
+
+            applied = coalesced = 0
+            for tree, changes in six.iteritems(by_tree):
+                updated = set()
+                for path, action in sorted(changes):
+                    names = path.split('/') if path else []
+                    if any('/'.join(names[:i]) in updated
+                           for i in range(len(names))):
+                        coalesced += 1
+                        continue
+                    if action == self.UPDATE:
+                        updated.add(path)
+                    self._apply(tree, path, action)
+                    applied += 1
+
+            with self._lock:
+                self._coalesced += coalesced
+                self._applied += applied
+            return applied
+
+    def _apply(self, tree, path, action):
+        try:
+            if action == self.UPDATE:
+                changed = tree.update_path(path)
+            else:
+                changed = tree.reload_storage(path)
+            if changed:
+                getLogger(__name__).info(
+                    'File monitor: %r has been updated.', path)
+        except Exception:
+            getLogger(__name__).info('File monitor error.', exc_info=True)
+
+    def start(self):
+        """Start flushing the queue periodically in background."""
+        if self.window and self._worker is None:
+            self._worker = BackgroundWorker(
+                self.flush, self.window, name='storage tree event queue')
+            self._worker.start()
+
+    def stop(self):
+        """Stop the background flushing, and flush the remaining changes."""
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+        self.flush()
+
 
 class StorageTreeFileEventHandler(FileSystemEventHandler):
     """File system event handler for a storage tree.
 
+    Each event is translated into an incremental change of the tree,
+    affecting only the path it regards: a created or deleted directory
+    is re-scanned, and a changed meta or running status file only causes
+    the storage to be reloaded.  All other events, including everything
+    inside the storage directories, are dropped.
+
     Parameters
     ----------
     tree : StorageTree
         The storage tree.
+
+    queue : StorageTreeEventQueue
+        The queue to coalesce the changes.  If not specified, the changes
+        will be applied immediately.
     """
 
-    def __init__(self, tree):
+    def __init__(self, tree, queue=None):
+        if queue is None:
+            queue = StorageTreeEventQueue()
         self.tree = tree
+        self.queue = queue
 
     def get_relative_path(self, path):
         """Get the relative path according to tree root."""
         return os.path.relpath(path, self.tree.root.path)
 
-    def path_event(self, path):
-        """Handle the event regarding specified path."""
-        try:
-            # normalize the path and check whether or not it's in the tree
-            rel_path = self.get_relative_path(path)
-            path_pieces = [
-                v for v in rel_path.split(os.sep)
-                if v not in ('', '.')
-            ]
-            if not path_pieces or path_pieces == '..':
+    def normalize_path(self, path):
+        """Get the normalized relative path, or None if not in the tree."""
+        root_path = self.tree.root.path
+        if path == root_path:
+            return ''
+        prefix = root_path.rstrip(os.sep) + os.sep
+        if not path.startswith(prefix):
+            return None
+        path_pieces = [v for v in path[len(prefix):].split(os.sep) if v]
+        if STORAGE_TREE_INDEX_DIR in path_pieces or '..' in path_pieces:
+            return None
+        return '/'.join(path_pieces)
+
+    def path_event(self, path, is_directory, exists):
+        """Handle the event regarding specified path.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file or directory.
+
+        is_directory : bool
+            Whether or not the path is a directory?
+
+        exists : bool
+            Whether or not the path exists after this event?
+            (i.e., it has been created or modified, instead of deleted)
+        """
+        queue = self.queue
+        if not is_directory and os.path.basename(path) not in (
+                STORAGE_META_FILE, STORAGE_RUNNING_STATUS):
+            queue.drop()
+            return
+        path = self.normalize_path(path)
+        if path is None:
+            queue.drop()
+            return
+
+        if is_directory:
+            # changes of the root directory should have been handled
+            # by the events of its children.
+            dir_path, action = path, StorageTreeEventQueue.UPDATE
+            if not dir_path:
+                queue.drop()
                 return
-            path = '/'.join(path_pieces)
+        else:
+            dir_path, name = path.rpartition('/')[::2]
+            if name == STORAGE_META_FILE and not exists:
+                action = StorageTreeEventQueue.UPDATE
+            else:
+                action = StorageTreeEventQueue.RELOAD
 
-            # set the specified tree node to be reloaded later
-            self.tree.set_reload(path)
-            getLogger(__name__).info(
-                'File monitor: %r will be reloaded.' % path)
-        except Exception:
-            getLogger(__name__).info('File monitor error.', exc_info=True)
+        if self.tree.is_inside_storage(dir_path):
+            queue.drop()
+        else:
+            queue.put(self.tree, dir_path, action)
 
     def on_moved(self, event):
         super(StorageTreeFileEventHandler, self).on_moved(event)
         getLogger(__name__).debug(
             "FS event: moved: %r -> %r", event.src_path, event.dest_path)
 
-        # for a move event, we need to set their parents to be reloaded
-        self.path_event(os.path.split(event.src_path)[0])
-        self.path_event(os.path.split(event.dest_path)[0])
+        # a move event is regarded as a remove event at the source path
+        # plus a create event at the destination path.
+        self.path_event(event.src_path, event.is_directory, False)
+        self.path_event(event.dest_path, event.is_directory, True)
 
     def on_created(self, event):
         super(StorageTreeFileEventHandler, self).on_created(event)
         getLogger(__name__).debug("FS event: created %r", event.src_path)
-
-        # for a create event, we need to set the parent to be reloaded.
-        self.path_event(os.path.split(event.src_path)[0])
+        self.path_event(event.src_path, event.is_directory, True)
 
     def on_deleted(self, event):
         super(StorageTreeFileEventHandler, self).on_deleted(event)
         getLogger(__name__).debug("FS event: removed %r", event.src_path)
-
-        # for a remove event, we need to set the parent to be reloaded.
-        self.path_event(os.path.split(event.src_path)[0])
+        self.path_event(event.src_path, event.is_directory, False)
 
     def on_modified(self, event):
         super(StorageTreeFileEventHandler, self).on_modified(event)
         getLogger(__name__).debug("FS event: changed: %r", event.src_path)
 
-        # for a modify event, we need to set the path to be reloaded.
-        self.path_event(event.src_path)
+        # the modification of a directory only indicates that its entries
+        # have been changed, which should be handled by their own events.
+        if event.is_directory:
+            self.queue.drop()
+        else:
+            self.path_event(event.src_path, False, True)
 
 
 class StorageTreeWatcher(object):
@@ -281,19 +916,32 @@ class StorageTreeWatcher(object):
     ----------
     trees : collections.Iterable[StorageTree]
         The storage tree instances.
+
+    coalesce_window : float
+        Number of seconds to coalesce the file system events before
+        applying them to the trees.  If zero, the events will be applied
+        immediately. (default 1)
     """
 
-    def __init__(self, trees):
+    def __init__(self, trees, coalesce_window=1.):
         self.trees = list(trees)
+        self.queue = StorageTreeEventQueue(coalesce_window)
         self.observer = Observer()
         for t in self.trees:
-            handler = StorageTreeFileEventHandler(t)
+            handler = StorageTreeFileEventHandler(t, self.queue)
             self.observer.schedule(handler, t.root.path, recursive=True)
 
+    @property
+    def stats(self):
+        """Get the counters of the event queue."""
+        return self.queue.stats
+
     def start(self):
         """Start the watcher."""
+        self.queue.start()
         self.observer.start()
 
     def stop(self):
         """Stop the watcher."""
         self.observer.stop()
+        self.queue.stop()
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+import codecs
+import hashlib
+import json
+import os
+import stat
+import threading
+import time
+from logging import getLogger
+
+import six
+
+from mlcomp.utils import makedirs
+from .storage import STORAGE_META_FILE
+from .utils import write_file_atomically, RACY_SECONDS
+
+__all__ = [
+    'StorageTreeIndex', 'STORAGE_TREE_INDEX_DIR', 'STORAGE_TREE_INDEX_FILE',
+    'get_tree_index_file',
+]
+
+# The index file is placed in a dedicated directory under the tree root,
+# so that saving the index would not change the mtime of the root.
+STORAGE_TREE_INDEX_DIR = '.mlcomp-index'
+STORAGE_TREE_INDEX_FILE = STORAGE_TREE_INDEX_DIR + '/tree.json'
+
+
+def get_tree_index_file(index_dir, root_dir):
+    """Get the path of the index file for a tree, in a shared directory.
+
+    Parameters
+    ----------
+    index_dir : str
+        The directory to keep the index files of storage trees.
+
+    root_dir : str
+        The root directory of the storage tree.
+
+    Returns
+    -------
+    str
+        The path of the index file, named after the hash of the absolute
+        path of `root_dir`.
+    """
+    root_dir = os.path.abspath(root_dir)
+    name = hashlib.md5(root_dir.encode('utf-8')).hexdigest()
+    return os.path.join(index_dir, name + '.json')
+
+
+def list_storage_dir(path):
+    """Inspect the directory at `path` without any index.
+
+    Parameters
+    ----------
+    path : str
+        Path of the directory.
+
+    Returns
+    -------
+    (bool, list[str] | None)
+        Whether or not the directory is a storage, and the sorted names
+        of its sub-directories (None if the directory is a storage).
+    """
+    if os.path.isfile(os.path.join(path, STORAGE_META_FILE)):
+        return True, None
+    subdirs = []
+    for f in sorted(os.listdir(path)):
+        if f != STORAGE_TREE_INDEX_DIR and \
+                os.path.isdir(os.path.join(path, f)):
+            subdirs.append(f)
+    return False, subdirs
+
+
+class StorageTreeIndex(object):
+    """Persistent index of the directories in a storage tree.
+
+    The index records, for every directory in the tree, whether or not
+    it is a storage, as well as the names of its sub-directories.
+    Each record is keyed by the relative path of the directory, and
+    is bound to the mtime of the directory.  Since creating, removing
+    or renaming an entry always changes the mtime of its parent,
+    a record is reused as long as the mtime stays the same, so that
+    a tree can be built with only one `stat` call per directory.
+
+    Parameters
+    ----------
+    root_dir : str
+        The root directory of the storage tree.
+
+    index_file : str
+        Path of the index file.  If not specified, will use
+        `STORAGE_TREE_INDEX_FILE` under `root_dir`.
+    """
+
+    #: Version of the index file format.
+    VERSION = 1
+
+    def __init__(self, root_dir, index_file=None):
+        self.root_dir = os.path.abspath(root_dir)
+        if index_file is None:
+            index_file = os.path.join(self.root_dir, STORAGE_TREE_INDEX_FILE)
+        self.index_file = os.path.abspath(index_file)
+        self._entries = {}  # type: dict[str, (float, bool, list[str])]
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'StorageTreeIndex(%r)' % (self.index_file,)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def dirty(self):
+        """Whether or not the index has been changed since last save?"""
+        return self._dirty
+
+    def _key(self, path):
+        rel_path = os.path.relpath(os.path.abspath(path), self.root_dir)
+        return '/'.join(v for v in rel_path.split(os.sep) if v not in ('.',))
+
+    def load(self):
+        """Load the index from `index_file`.
+
+        A missing, corrupted or outdated index file will be silently
+        ignored, resulting in an empty index.
+        """
+        try:
+            with codecs.open(self.index_file, 'rb', 'utf-8') as f:
+                cnt = json.load(f)
+            if cnt.get('version') != self.VERSION or \
+                    cnt.get('root_dir') != self.root_dir:
+                raise ValueError('Index file does not match the tree.')
+            entries = {
+                k: (v[0], bool(v[1]), v[2])
+                for k, v in six.iteritems(cnt['entries'])
+            }
+        except Exception:
+            getLogger(__name__).debug(
+                'Failed to load storage tree index %r.', self.index_file,
+                exc_info=True
+            )
+            entries = {}
+        with self._lock:
+            self._entries = entries
+            self._dirty = False
+
+    def save(self):
+        """Save the index to `index_file`, if it has been changed.
+
+        Only the records reachable from the root directory will be saved,
+        so that records of removed directories are purged.
+
+        Returns
+        -------
+        bool
+            Whether or not the index file has been written.
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            entries = {}
+            stack = ['']
+            while stack:
+                key = stack.pop()
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entries[key] = entry
+                    if entry[2]:
+                        pfx = key + '/' if key else ''
+                        stack.extend(pfx + name for name in entry[2])
+            self._entries = entries
+            self._dirty = False
+
+        cnt = json.dumps({
+            'version': self.VERSION,
+            'root_dir': self.root_dir,
+            'entries': entries,
+        })
+        try:
+            makedirs(os.path.split(self.index_file)[0], exist_ok=True)
+            write_file_atomically(self.index_file, cnt)
+        except Exception:
+            with self._lock:
+                self._dirty = True
+            raise
+        return True
+
+    def invalidate(self, path):
+        """Invalidate the record of directory `path`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the directory.
+        """
+        with self._lock:
+            key = self._key(path)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None:
+                self._entries[key] = (None,) + entry[1:]
+                self._dirty = True
+
+    def inspect_dir(self, path):
+        """Inspect the directory at `path`, using the index if possible.
+
+        Parameters
+        ----------
+        path : str
+            Path of the directory.
+
+        Returns
+        -------
+        (bool, list[str] | None) | None
+            Whether or not the directory is a storage, and the sorted
+            names of its sub-directories (None if the directory is a
+            storage).  None will be returned if `path` is not a directory.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISDIR(st.st_mode):
+            return None
+
+        key = self._key(path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None and \
+                entry[0] == st.st_mtime:
+            return entry[1], entry[2]
+
+        # directories modified too recently are not cached, since their
+        # mtime might not be updated by later changes on a file system
+        # with coarse timestamp granularity.
+        is_storage, subdirs = list_storage_dir(path)
+        mtime = st.st_mtime
+        if mtime > time.time() - RACY_SECONDS:
+            mtime = None
+        with self._lock:
+            self._entries[key] = (mtime, is_storage, subdirs)
+            self._dirty = True
+        return is_storage, subdirs
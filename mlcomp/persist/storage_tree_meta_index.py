@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+import threading
+from logging import getLogger
+
+import six
+from sortedcontainers import SortedDict, SortedList
+
+__all__ = ['StorageTreeMetaIndex']
+
+
+class StorageTreeMetaIndex(object):
+    """Secondary indexes over the meta information of a storage tree.
+
+    The storage in the tree are indexed by their tags, by the hostnames
+    of their running status, as well as by their create time, so that
+    lookups by these fields only touch the matching storage.
+
+    The indexes listen to the changes of the tree.  A change only marks
+    the changed path as dirty, and the storage at or under dirty paths
+    are re-indexed before the next lookup, so that a storage changed many
+    times between two lookups is indexed only once.
+
+    Other indexes over the tree may subscribe to the re-indexed storage
+    via `add_listener`, instead of listening to the tree and loading the
+    changed storage on their own.
+
+    Parameters
+    ----------
+    tree : mlcomp.persist.storage_tree.StorageTree
+        The storage tree.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._lock = threading.Lock()
+        # path -> (storage, tags, hostname, create_time, info)
+        self._entries = SortedDict()
+        self._tags = {}         # type: dict[str, set[str]]
+        self._hostnames = {}    # type: dict[str, set[str]]
+        self._create_time = SortedList()
+        self._listeners = []
+        # the dirty paths are guarded by a separated lock, so that the
+        # tree is never blocked by a refresh in progress.
+        self._dirty_lock = threading.Lock()
+        self._dirty = {''}
+        tree.add_listener(self._on_change)
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def _on_change(self, path):
+        with self._dirty_lock:
+            self._dirty.add(path)
+
+    def add_listener(self, callback):
+        """Add a listener to be notified with the re-indexed storage.
+
+        The listener is called at once with all the storage indexed so far
+        (as if the root path has been re-indexed), and then after each
+        dirty path has been re-indexed.
+
+        Parameters
+        ----------
+        callback : (str, list[(str, Storage, dict)]) -> None
+            The callback, which receives a path relative to the tree root,
+            and the path, the storage object and the dict (as returned by
+            `Storage.to_dict()`) of each storage at or under this path.
+            These storage replace all the storage previously reported at
+            or under this path.  The callback is called with the index
+            locked, thus it should only record the arguments, and must not
+            access this index.
+        """
+        with self._lock:
+            callback('', [(p, e[0], e[4])
+                          for p, e in six.iteritems(self._entries)])
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Remove a listener added by `add_listener`."""
+        with self._lock:
+            self._listeners.remove(callback)
+
+    def refresh(self):
+        """Re-index the storage at or under the dirty paths."""
+        with self._lock:
+            self._refresh()
+
+    def _add_to_group(self, groups, key, path):
+        if key is not None:
+            groups.setdefault(key, set()).add(path)
+
+    def _remove_from_group(self, groups, key, path):
+        if key is not None:
+            paths = groups[key]
+            paths.discard(path)
+            if not paths:
+                del groups[key]
+
+    def _remove(self, path):
+        storage, tags, hostname, create_time, _ = self._entries.pop(path)
+        for tag in tags:
+            self._remove_from_group(self._tags, tag, path)
+        self._remove_from_group(self._hostnames, hostname, path)
+        self._create_time.remove((create_time, path))
+
+    def _add(self, path, storage):
+        if path in self._entries:
+            self._remove(path)
+        tags = tuple(storage.tags or ())
+        running_status = storage.running_status
+        hostname = running_status.hostname if running_status else None
+        create_time = storage.create_time or 0.
+        info = storage.to_dict()
+        self._entries[path] = (storage, tags, hostname, create_time, info)
+        for tag in tags:
+            self._add_to_group(self._tags, tag, path)
+        self._add_to_group(self._hostnames, hostname, path)
+        self._create_time.add((create_time, path))
+        return info
+
+    def _refresh(self):
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        for path in sorted(dirty):
+            # the paths under another dirty path need not to be re-indexed
+            names = path.split('/')
+            if path and ('' in dirty or any(
+                    '/'.join(names[:i]) in dirty
+                    for i in range(1, len(names)))):
+                continue
+            if path:
+                keys = [path] if path in self._entries else []
+                keys.extend(self._entries.irange(
+                    path + '/', path + '0', inclusive=(True, False)))
+            else:
+                keys = list(self._entries)
+            for k in keys:
+                self._remove(k)
+            items = []
+            for p, storage in self.tree.iter_storage(path):
+                items.append((p, storage, self._add(p, storage)))
+            for callback in list(self._listeners):
+                try:
+                    callback(path, items)
+                except Exception:
+                    getLogger(__name__).warning(
+                        'Storage tree meta index listener %r failed.',
+                        callback, exc_info=True
+                    )
+
+    def _lookup(self, groups, key):
+        with self._lock:
+            self._refresh()
+            return [(p, self._entries[p][0])
+                    for p in sorted(groups.get(key, ()))]
+
+    def find_by_tag(self, tag):
+        """Find the storage with specified tag.
+
+        Parameters
+        ----------
+        tag : str
+            The tag of the storage.
+
+        Returns
+        -------
+        list[(str, Storage)]
+            The paths and the storage objects, sorted by paths.
+        """
+        return self._lookup(self._tags, tag)
+
+    def find_by_hostname(self, hostname):
+        """Find the storage with specified hostname in running status.
+
+        Parameters
+        ----------
+        hostname : str
+            The hostname of the running status.
+
+        Returns
+        -------
+        list[(str, Storage)]
+            The paths and the storage objects, sorted by paths.
+        """
+        return self._lookup(self._hostnames, hostname)
+
+    def find_by_create_time(self, start=None, stop=None, reverse=False):
+        """Find the storage created within specified time range.
+
+        Parameters
+        ----------
+        start, stop : float
+            The time range ``[start, stop)``.  Either side can be None,
+            indicating no bound.
+
+        reverse : bool
+            Whether or not to sort the storage from the latest to the
+            earliest? (default False)
+
+        Returns
+        -------
+        list[(str, Storage)]
+            The paths and the storage objects, sorted by create time.
+        """
+        lo = (start,) if start is not None else None
+        hi = (stop,) if stop is not None else None
+        with self._lock:
+            self._refresh()
+            return [
+                (p, self._entries[p][0])
+                for _, p in self._create_time.irange(
+                    lo, hi, inclusive=(True, False), reverse=reverse)
+            ]
+
+    def tags(self):
+        """Get the sorted list of all the tags, with their frequencies.
+
+        Returns
+        -------
+        list[(str, int)]
+            The tags and the number of storage with each tag.
+        """
+        with self._lock:
+            self._refresh()
+            return sorted((t, len(p)) for t, p in six.iteritems(self._tags))
@@ -1,11 +1,106 @@
 # -*- coding: utf-8 -*-
+import codecs
 import os
 import subprocess
 import sys
+import time
+import uuid
 from contextlib import contextmanager
 from logging import getLogger
 
-__all__ = ['duplicate_console_output']
+__all__ = [
+    'duplicate_console_output', 'write_file_atomically', 'file_signature',
+    'is_signature_racy',
+]
+
+#: Files modified within this number of seconds are regarded as racy,
+#: since further changes might not alter their mtime on a file system
+#: with coarse timestamp granularity.
+RACY_SECONDS = 2
+
+
+def write_file_atomically(path, cnt, encoding='utf-8', fsync=False):
+    """Write `cnt` to `path`, such that readers never see a partial file.
+
+    The content is first written to a temporary file in the same
+    directory, and then renamed to `path`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the target file.
+
+    cnt : str | bytes
+        The content to be written.
+
+    encoding : str
+        The encoding of `cnt`, if it is a text.  If specified None,
+        `cnt` must be bytes. (default 'utf-8')
+
+    fsync : bool
+        Whether or not to flush the content to disk before renaming,
+        so that the file would not be empty after a system crash?
+        (default False)
+    """
+    path = os.path.abspath(path)
+    parent, name = os.path.split(path)
+    # we do not use `tempfile.mkstemp` here, since it would create the
+    # file with mode 0600 regardless of the umask.
+    tmp_path = os.path.join(parent, '.%s.%s.tmp' % (name, uuid.uuid4().hex))
+    try:
+        if encoding:
+            cnt = codecs.encode(cnt, encoding)
+        with open(tmp_path, 'wb') as f:
+            f.write(cnt)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.rename(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def file_signature(path):
+    """Get the signature of a file, for detecting changes of the file.
+
+    The signature consists of the inode number, the size and the mtime
+    of the file.  A file replaced by `write_file_atomically` is always
+    regarded as changed, since it gets a new inode.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+
+    Returns
+    -------
+    (int, int, float) | None
+        The signature, or None if the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime
+
+
+def is_signature_racy(signature):
+    """Check whether or not the file signature should not be trusted.
+
+    A file modified recently might be modified again without changing
+    its signature, thus a signature taken shortly after the file was
+    modified should not be used to skip reading the file later.
+
+    Parameters
+    ----------
+    signature : (int, int, float)
+        The signature returned by `file_signature`.
+    """
+    return signature[2] > time.time() - RACY_SECONDS
 
 
 @contextmanager
@@ -3,6 +3,7 @@
 from .bundle import *
 from .components import *
 from .base import *
+from .compression import *
 from .container import *
 from .elements import *
 from .persist import *
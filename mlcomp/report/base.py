@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 from collections import OrderedDict
 
+import numpy as np
 import six
-from slugify import UniqueSlugify
+from slugify import Slugify
 
 from mlcomp.utils import camel_to_underscore, jsonutils
 from .types import get_default_report_types
@@ -11,6 +12,13 @@ __all__ = [
     'ReportObject', 'ReportJsonEncoder', 'ReportJsonDecoder',
 ]
 
+_SLUGIFY_KWARGS = {
+    'to_lower': True,
+    'max_length': 64,
+    'separator': '_',
+    'stop_words': ('a', 'an', 'the'),
+}
+
 
 class ReportObject(object):
     """Base class for all report objects.
@@ -112,44 +120,82 @@ class ReportObject(object):
         list[ReportObject]
             List of children, not guaranteed to be deduplicated.
         """
-        ret = []
-        for c in six.itervalues(self.to_config(sort_keys=True)):
-            if isinstance(c, ReportObject):
-                ret.append(c)
-        return ret
+        config = self.to_config()
+        return [config[k] for k in sorted(config)
+                if isinstance(config[k], ReportObject)]
 
     def assign_name_scopes(self):
-        """Assign scope names to this object as well as all its descendants."""
-        def get_slugify():
-            def inner(report):
-                candidate = report.name
-                if candidate is None:
-                    candidate = camel_to_underscore(report.__class__.__name__)
-                return slugify(candidate)
-            slugify = UniqueSlugify(to_lower=True, max_length=64, separator='_',
-                                    stop_words=('a', 'an', 'the'))
-            return inner
-
-        # first, clear the existing scope names
-        stack = [self]
-        while stack:
-            c = stack.pop()
-            c.name_scope = None
-            stack.extend(reversed(c.gather_children()))
+        """Assign scope names to this object as well as all its descendants.
 
-        # next, generate the scope names of this report and its descendants
-        stack = [(self, '', get_slugify())]
+        The descendants are visited in depth-first order, each only once.
+        A report object added as children of more than one report object
+        is named after the parent through which it is first visited.
+        """
+        slugify = Slugify(**_SLUGIFY_KWARGS)
+        slug_cache = {}
+
+        def unique_slug(report, siblings):
+            # equivalent to calling a `UniqueSlugify` shared by siblings,
+            # with the slugs of identical candidates computed only once.
+            # Since the used slugs only grow, the numbering of a slug can
+            # continue from its last number instead of from 1.
+            candidate = report.name
+            if candidate is None:
+                candidate = report.__class__
+            text = slug_cache.get(candidate)
+            if text is None:
+                if isinstance(candidate, six.class_types):
+                    text = slugify(camel_to_underscore(candidate.__name__))
+                else:
+                    text = slugify(candidate)
+                slug_cache[candidate] = text
+            uids, counts = siblings
+            ret = text
+            count = counts.get(text, 0)
+            while ret in uids:
+                count += 1
+                ret = '%s%s%d' % (text, _SLUGIFY_KWARGS['separator'], count)
+            uids.add(ret)
+            counts[text] = count
+            return ret
+
+        visited = set()
+        stack = [(self, '', (set(), {}))]
         while stack:
-            r, path, r_slugify = stack.pop()
-            if r.name_scope is None:
-                # A report object may be added as children of more than one
-                # report object.  Thus if a report object already has its
-                # scope name at this point, it must be assigned by other
-                # parent of this report object earlier.
-                r.name_scope = path + r_slugify(r)
-            c_slugify = get_slugify()
+            r, path, siblings = stack.pop()
+            if id(r) in visited:
+                continue
+            visited.add(id(r))
+            r.name_scope = path + unique_slug(r, siblings)
+            c_path = r.name_scope + '/'
+            c_siblings = (set(), {})
             for c in reversed(r.gather_children()):
-                stack.append((c, r.name_scope + '/', c_slugify))
+                stack.append((c, c_path, c_siblings))
+
+    def find_name_scope(self, name_scope):
+        """Find the report object with specified `name_scope`.
+
+        Only this object and the descendants along the path of
+        `name_scope` are visited.
+
+        Parameters
+        ----------
+        name_scope : str
+            The name scope of the report object.
+
+        Returns
+        -------
+        ReportObject | None
+            The report object, or None if not found.
+        """
+        stack = [self]
+        while stack:
+            c = stack.pop()
+            if c.name_scope == name_scope:
+                return c
+            if c.name_scope is None or \
+                    name_scope.startswith(c.name_scope + '/'):
+                stack.extend(reversed(c.gather_children()))
 
     def save_resources(self, rm):
         """Save the resources of this object as well as its descendants.
@@ -200,7 +246,55 @@ class ReportObject(object):
 
 
 class ReportJsonEncoder(jsonutils.JsonEncoder):
-    """Json encoder with support of report objects."""
+    """Json encoder with support of report objects.
+
+    If `resource_manager` and `ndarray_spill_size` are both specified,
+    numpy arrays with at least `ndarray_spill_size` bytes will be saved
+    as ".npy" files via the resource manager, and referenced as:
+
+        {'__type__': 'ndarray', 'path': save path,
+         'dtype': o.dtype.str, 'shape': o.shape}
+
+    Parameters
+    ----------
+    resource_manager : mlcomp.report.ResourceManager
+        The resource manager for saving large numpy arrays.
+
+    ndarray_spill_size : int
+        The minimum number of bytes of numpy arrays to be saved as
+        separated files.  If not specified, no array will be saved.
+
+    **kwargs
+        Other arguments passed to `JsonEncoder`.
+    """
+
+    #: The name scope of spilled numpy arrays
+    NDARRAY_NAME_SCOPE = '_ndarray'
+
+    def __init__(self, resource_manager=None, ndarray_spill_size=None,
+                 **kwargs):
+        super(ReportJsonEncoder, self).__init__(**kwargs)
+        self.resource_manager = resource_manager
+        self.ndarray_spill_size = ndarray_spill_size
+        self._spilled_count = 0
+
+    def _spilled_ndarray_handler(self, o):
+        if isinstance(o, np.ndarray) and \
+                self.resource_manager is not None and \
+                self.ndarray_spill_size is not None and \
+                not o.dtype.hasobject and \
+                0 < o.nbytes and self.ndarray_spill_size <= o.nbytes:
+            self._spilled_count += 1
+            path = self.resource_manager.save_ndarray(
+                o,
+                '%s/%d' % (self.NDARRAY_NAME_SCOPE, self._spilled_count)
+            )
+            yield {
+                '__type__': 'ndarray',
+                'path': path,
+                'dtype': o.dtype.str,
+                'shape': list(o.shape),
+            }
 
     def _report_object_handler(self, o):
         if isinstance(o, ReportObject):
@@ -216,12 +310,37 @@ class ReportJsonEncoder(jsonutils.JsonEncoder):
             yield config_dict
 
     OBJECT_HANDLERS = (
-        jsonutils.JsonEncoder.OBJECT_HANDLERS + [_report_object_handler]
+        [_spilled_ndarray_handler] +
+        jsonutils.JsonEncoder.OBJECT_HANDLERS +
+        [_report_object_handler]
     )
 
 
 class ReportJsonDecoder(jsonutils.JsonDecoder):
-    """Json decoder with support of report objects."""
+    """Json decoder with support of report objects.
+
+    Parameters
+    ----------
+    resource_manager : mlcomp.report.ResourceManager
+        The resource manager for loading numpy arrays saved as separated
+        files.  Such arrays will be memory-mapped in read-only mode.
+
+    **kwargs
+        Other arguments passed to `JsonDecoder`.
+    """
+
+    def __init__(self, resource_manager=None, **kwargs):
+        super(ReportJsonDecoder, self).__init__(**kwargs)
+        self.resource_manager = resource_manager
+
+    def _spilled_ndarray_handler(self, v):
+        if v['__type__'] == 'ndarray' and 'path' in v:
+            if self.resource_manager is None:
+                raise ValueError(
+                    'Resource manager is required to load the numpy array '
+                    'at %r.' % (v['path'],)
+                )
+            yield self.resource_manager.load_ndarray(v['path'])
 
     def _report_object_handler(self, v):
         v_type = v['__type__']
@@ -236,5 +355,7 @@ class ReportJsonDecoder(jsonutils.JsonDecoder):
             yield report_type.from_config(v)
 
     OBJECT_HANDLERS = (
-        jsonutils.JsonDecoder.OBJECT_HANDLERS + [_report_object_handler]
+        [_spilled_ndarray_handler] +
+        jsonutils.JsonDecoder.OBJECT_HANDLERS +
+        [_report_object_handler]
     )
@@ -33,8 +33,9 @@ def classification_report(y_true, y_pred, y_prob=None, title=None):
     """
     if y_prob is None:
         y_prob = np.ones(shape=np.shape(y_pred))
+    metrics = ClassificationMetrics(y_true, y_pred, y_prob)
     children = [
-        classification_summary(y_true=y_true, y_pred=y_pred),
+        classification_summary(y_true=y_true, y_pred=y_pred, metrics=metrics),
         classification_result_attachment(
             y_true=y_true, y_pred=y_pred, y_prob=y_prob,
             title='Classification Result'
@@ -43,7 +44,8 @@ def classification_report(y_true, y_pred, y_prob=None, title=None):
     if (len(y_prob.shape) == 2 and y_prob.shape[1] in (1, 2)) or \
             len(y_prob.shape) == 1:
         children.append(binary_classification_auc_curve(
-            y_true=y_true, y_prob=y_prob, title='Precision-Recall Curve'
+            y_true=y_true, y_prob=y_prob, title='Precision-Recall Curve',
+            metrics=metrics
         ))
     if title:
         return Section(title, children)
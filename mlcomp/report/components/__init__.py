@@ -3,6 +3,7 @@
 """Report components based on basic elements."""
 
 from .classification import *
+from .classification_metrics import *
 from .regression import *
 from .table_factory import *
 from .training_metrics import *
@@ -4,24 +4,69 @@ from collections import OrderedDict
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import (average_precision_score,
-                             precision_recall_curve,
-                             precision_recall_fscore_support,
-                             auc)
-from sklearn.utils.multiclass import unique_labels
+from sklearn.metrics import precision_recall_curve, auc
 
-from mlcomp.utils import JsonEncoder
+from mlcomp.utils import JsonEncoder, downsample_curve
+from .classification_metrics import ClassificationMetrics
 from .table_factory import *
 from ..elements import *
 
 __all__ = [
     'binary_classification_auc_curve',
     'binary_classification_segment_auc_curve',
+    'precision_recall_at_thresholds',
     'classification_summary',
     'classification_result_attachment',
 ]
 
 
+def precision_recall_at_thresholds(precision, recall, thresholds,
+                                   selected_threshold):
+    """Look up the precision and recall at selected thresholds.
+
+    For each selected threshold, the precision and recall at the smallest
+    curve threshold which is strictly greater than the selected one are
+    taken.  If there are multiple such curve thresholds with the same
+    value, the first one is taken.  If there is no such curve threshold,
+    the precision and recall will be 0.
+
+    Parameters
+    ----------
+    precision, recall, thresholds : numpy.ndarray
+        The precision-recall curve, e.g., as returned by
+        `sklearn.metrics.precision_recall_curve`.  The thresholds need
+        not to be sorted.
+
+    selected_threshold : float | collections.Iterable
+        The selected threshold(s).
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        The precision and recall at each selected threshold.
+    """
+    thresholds = np.asarray(thresholds)
+    selected_threshold = np.atleast_1d(
+        np.asarray(selected_threshold, dtype=np.float64))
+    precision = np.asarray(precision)
+    recall = np.asarray(recall)
+
+    # NaN and infinite thresholds are never selected
+    valid = np.where(thresholds < np.inf)[0]
+    # stable sorting keeps the first one of the tied thresholds in front
+    order = valid[np.argsort(thresholds[valid], kind='mergesort')]
+    pos = np.searchsorted(thresholds[order], selected_threshold,
+                          side='right')
+    found = pos < len(order)
+
+    selected_p = np.zeros(selected_threshold.shape, dtype=np.float64)
+    selected_r = np.zeros(selected_threshold.shape, dtype=np.float64)
+    index = order[pos[found]]
+    selected_p[found] = precision[index]
+    selected_r[found] = recall[index]
+    return selected_p, selected_r
+
+
 def binary_classification_segment_auc_curve(
         y_true, y_prob, title=None,
         precision_recall_curve_func=None,
@@ -58,6 +103,15 @@ def binary_classification_segment_auc_curve(
     T: int
         The window should be used with window_precision_recall_curve.
 
+    max_points: int
+        If specified, the curve will be downsampled to at most this number
+        of points before plotting.  The area and the selected precision and
+        recall are still computed on the full curve.
+
+    data_points_format : {'dicts', 'columns', 'binary'}
+        The format of the data points in the chart resource, see
+        `CanvasJS.data_points`. (default 'dicts')
+
     Returns
     -------
     convasjs : ConvasJS
@@ -70,6 +124,8 @@ def binary_classification_segment_auc_curve(
      are generated by `selected_threshold`.
     """
 
+    max_points = dict_arg.pop('max_points', None)
+    data_points_format = dict_arg.pop('data_points_format', 'dicts')
     if precision_recall_curve_func is None:
         precision_recall_curve_func = precision_recall_curve
         p1, r1, t1 = precision_recall_curve_func(
@@ -83,21 +139,14 @@ def binary_classification_segment_auc_curve(
     selected_p = []
     selected_r = []
     if selected_threshold is not None:
-        if isinstance(selected_threshold, (float, int)):
-            selected_threshold = [selected_threshold]
-        for sel_th in selected_threshold:
-            tur_th = float("inf")
-            tur_p = 0
-            tur_r = 0
-            for index in range(len(t1)):
-                if sel_th < t1[index] < tur_th:
-                    tur_th = t1[index]
-                    tur_p = p1[index]
-                    tur_r = r1[index]
-            selected_p.append(tur_p)
-            selected_r.append(tur_r)
+        selected_p, selected_r = precision_recall_at_thresholds(
+            p1, r1, t1, selected_threshold)
+        selected_p = selected_p.tolist()
+        selected_r = selected_r.tolist()
 
     area1 = auc(r1, p1)
+    if max_points is not None:
+        r1, p1 = downsample_curve(r1, p1, max_points)
     chart = {
         'legend': {
             'horizontalAlign': 'center',
@@ -123,12 +172,10 @@ def binary_classification_segment_auc_curve(
                 'name': 'AUC curve of class 1 (area=%.4f)' % area1,
                 'showInLegend': True,
                 'type': 'line',
-                'dataPoints': [
-                    {'x': x, 'y': y} for x, y in zip(r1, p1)
-                ]
             }
         ]
     }
+    chart['data'][0].update(CanvasJS.data_points(r1, p1, data_points_format))
     if title:
         chart['title'] = {'text': title, 'fontSize': 24}
     if selected_threshold is not None:
@@ -136,7 +183,10 @@ def binary_classification_segment_auc_curve(
     return CanvasJS(data=chart)
 
 
-def binary_classification_auc_curve(y_true, y_prob, title=None):
+def binary_classification_auc_curve(y_true, y_prob, title=None,
+                                    max_points=None,
+                                    data_points_format='dicts',
+                                    metrics=None):
     """Binary classification AUC curve.
 
     Parameters
@@ -149,13 +199,29 @@ def binary_classification_auc_curve(y_true, y_prob, title=None):
 
     title : str
         Optional title of this AUC curve figure.
+
+    max_points : int
+        If specified, each curve will be downsampled to at most this
+        number of points before plotting.  The areas are still computed
+        on the full curves.
+
+    data_points_format : {'dicts', 'columns', 'binary'}
+        The format of the data points in the chart resource, see
+        `CanvasJS.data_points`. (default 'dicts')
+
+    metrics : ClassificationMetrics
+        Optional metrics engine of `y_true` and `y_prob`, which may be
+        shared with other components to avoid computing twice.
     """
-    p1, r1, th = precision_recall_curve(y_true, y_prob)
-    area1 = average_precision_score(y_true, y_prob)
-    y_true = 1 - y_true
-    y_prob = 1. - y_prob
-    p0, r0, th = precision_recall_curve(y_true, y_prob)
-    area0 = average_precision_score(y_true, y_prob)
+    if metrics is None:
+        metrics = ClassificationMetrics(y_true, y_prob=y_prob)
+    p1, r1, _ = metrics.precision_recall_curve(1)
+    area1 = metrics.average_precision(1)
+    p0, r0, _ = metrics.precision_recall_curve(0)
+    area0 = metrics.average_precision(0)
+    if max_points is not None:
+        r0, p0 = downsample_curve(r0, p0, max_points)
+        r1, p1 = downsample_curve(r1, p1, max_points)
 
     chart = {
         'legend': {
@@ -182,20 +248,16 @@ def binary_classification_auc_curve(y_true, y_prob, title=None):
                 'name': 'AUC curve of class 0 (area=%.4f)' % area0,
                 'showInLegend': True,
                 'type': 'line',
-                'dataPoints': [
-                    {'x': x, 'y': y} for x, y in zip(r0, p0)
-                ]
             },
             {
                 'name': 'AUC curve of class 1 (area=%.4f)' % area1,
                 'showInLegend': True,
                 'type': 'line',
-                'dataPoints': [
-                    {'x': x, 'y': y} for x, y in zip(r1, p1)
-                ]
             }
         ]
     }
+    chart['data'][0].update(CanvasJS.data_points(r0, p0, data_points_format))
+    chart['data'][1].update(CanvasJS.data_points(r1, p1, data_points_format))
     if title:
         chart['title'] = {'text': title, 'fontSize': 24}
 
@@ -203,7 +265,7 @@ def binary_classification_auc_curve(y_true, y_prob, title=None):
 
 
 def classification_summary(y_true, y_pred, labels=None, target_names=None,
-                           title=None):
+                           title=None, metrics=None):
     """Classification result summary table.
 
     Parameters
@@ -224,18 +286,19 @@ def classification_summary(y_true, y_pred, labels=None, target_names=None,
 
     title : str
         Optional title of this summary table.
+
+    metrics : ClassificationMetrics
+        Optional metrics engine of `y_true`, `y_pred` and `labels`, which
+        may be shared with other components to avoid computing twice.
     """
 
-    if labels is None:
-        labels = unique_labels(y_true, y_pred)
+    if metrics is None:
+        metrics = ClassificationMetrics(y_true, y_pred, labels=labels)
+    labels = metrics.labels
     if target_names is None:
         target_names = [str(i) for i in labels]
 
-    p, r, f1, s = precision_recall_fscore_support(
-        y_true,
-        y_pred,
-        labels=labels
-    )
+    p, r, f1, s = metrics.precision_recall_fscore_support()
 
     # compute the average of these scores.
     p_avg = np.average(p, weights=s)
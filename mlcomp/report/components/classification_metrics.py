@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+import re
+
+import numpy as np
+import sklearn
+
+__all__ = ['ClassificationMetrics']
+
+_SKLEARN_VERSION = tuple(
+    int(v) for v in re.findall(r'\d+', sklearn.__version__)[:2])
+
+# `precision_recall_curve` stops at full recall before scikit-learn 1.1
+_TRUNCATE_AT_FULL_RECALL = _SKLEARN_VERSION < (1, 1)
+
+# `average_precision_score` is the trapezoidal area before scikit-learn 0.19
+_TRAPEZOIDAL_AVERAGE_PRECISION = _SKLEARN_VERSION < (0, 19)
+
+
+class ClassificationMetrics(object):
+    """Shared engine of classification metrics.
+
+    The metrics are computed lazily and cached, so that the classification
+    report components built upon the same `ClassificationMetrics` object
+    make only one pass over the data:
+
+    *   The confusion matrix is computed by a single `np.bincount` on the
+        label indices, from which the precision, recall, F1-score and
+        support of each label are derived.
+    *   The probabilities are sorted only once, from which the
+        precision-recall curves of both classes of a binary classification
+        result are derived.
+
+    The results are identical to those of the installed `sklearn.metrics`,
+    whose curve and average precision semantics vary between versions.
+
+    Parameters
+    ----------
+    y_true : numpy.ndarray
+        Ground truth (correct) target values.
+
+    y_pred : numpy.ndarray
+        Predicted target values.  Required by the confusion matrix.
+
+    y_prob : numpy.ndarray
+        Estimated probabilities of class 1, for binary classification.
+        Probabilities of shape ``(n, 1)`` or ``(n, 2)`` are also accepted.
+        Required by the precision-recall curves.
+
+    labels : np.ndarray | list
+        Array of all labels.  If not specified, will be the sorted union
+        of the labels in `y_true` and `y_pred`.
+    """
+
+    def __init__(self, y_true, y_pred=None, y_prob=None, labels=None):
+        self.y_true = np.asarray(y_true)
+        self.y_pred = np.asarray(y_pred) if y_pred is not None else None
+        if y_prob is not None:
+            y_prob = np.asarray(y_prob)
+            if len(y_prob.shape) == 2 and y_prob.shape[1] in (1, 2):
+                y_prob = y_prob[:, -1]
+        self.y_prob = y_prob
+        self._labels = labels
+        self._confusion_matrix = None
+        self._prob_order = None
+        self._curves = {}
+
+    def _require(self, name):
+        if getattr(self, name) is None:
+            raise ValueError('`%s` is not specified.' % (name,))
+
+    def _ensure_confusion_matrix(self):
+        if self._confusion_matrix is not None:
+            return
+        self._require('y_pred')
+        y_true, y_pred = self.y_true, self.y_pred
+        if self._labels is None:
+            labels, indices = np.unique(
+                np.concatenate([y_true, y_pred]), return_inverse=True)
+            true_idx, pred_idx = indices[:len(y_true)], indices[len(y_true):]
+            n = len(labels)
+        else:
+            # the values not in `labels` are counted at an extra index,
+            # so that they still count for the support and false negatives
+            labels = np.asarray(self._labels)
+            if len(labels) == 0:
+                raise ValueError('`labels` must not be empty.')
+            sorter = np.argsort(labels, kind='mergesort')
+            sorted_labels = labels[sorter]
+
+            def to_index(y):
+                pos = np.searchsorted(sorted_labels, y)
+                idx = sorter[np.minimum(pos, len(labels) - 1)]
+                idx[labels[idx] != y] = len(labels)
+                return idx
+
+            true_idx, pred_idx = to_index(y_true), to_index(y_pred)
+            n = len(labels) + 1
+
+        cm = np.bincount(true_idx * n + pred_idx, minlength=n * n)
+        self._labels = labels
+        self._confusion_matrix = cm.reshape([n, n])
+
+    @property
+    def labels(self):
+        """Get the array of all labels."""
+        self._ensure_confusion_matrix()
+        return self._labels
+
+    @property
+    def confusion_matrix(self):
+        """Get the confusion matrix.
+
+        Returns
+        -------
+        np.ndarray
+            The confusion matrix, whose rows are the true labels and whose
+            columns are the predicted labels, ordered as `labels`.
+        """
+        self._ensure_confusion_matrix()
+        k = len(self._labels)
+        return self._confusion_matrix[:k, :k]
+
+    def precision_recall_fscore_support(self):
+        """Compute the precision, recall, F1-score and support of each label.
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+            The precision, recall, F1-score and support, ordered as `labels`.
+            Ill-defined scores are set to 0.
+        """
+        self._ensure_confusion_matrix()
+        cm = self._confusion_matrix
+        k = len(self._labels)
+        tp_sum = np.diag(cm)[:k]
+        pred_sum = cm[:, :k].sum(axis=0)
+        true_sum = cm[:k, :].sum(axis=1)
+
+        def divide(a, b):
+            ret = np.zeros(a.shape, dtype=np.float64)
+            np.divide(a, b, out=ret, where=(b != 0))
+            return ret
+
+        precision = divide(tp_sum, pred_sum)
+        recall = divide(tp_sum, true_sum)
+        denom = precision + recall
+        denom[denom == 0.] = 1
+        f_score = 2 * precision * recall / denom
+        return precision, recall, f_score, true_sum
+
+    def precision_recall_curve(self, pos_class=1):
+        """Compute the precision-recall curve of a binary classification.
+
+        Parameters
+        ----------
+        pos_class : {0, 1}
+            The class to be regarded as positive.  The probabilities of
+            class 0 are taken as ``1 - y_prob``. (default 1)
+
+        Returns
+        -------
+        (np.ndarray, np.ndarray, np.ndarray)
+            The precision, recall and thresholds, the same as
+            `sklearn.metrics.precision_recall_curve`.
+        """
+        if pos_class not in (0, 1):
+            raise ValueError('`pos_class` must be 0 or 1.')
+        if pos_class in self._curves:
+            return self._curves[pos_class]
+        self._require('y_prob')
+        if self._prob_order is None:
+            self._prob_order = np.argsort(self.y_prob, kind='mergesort')
+
+        # sort the scores in descending order: the probabilities of class 1
+        # in reversed order, and those of class 0 in the original order.
+        if pos_class == 1:
+            order = self._prob_order[::-1]
+            y_score = self.y_prob[order]
+            y_true = self.y_true[order] == 1
+        else:
+            order = self._prob_order
+            y_score = 1 - self.y_prob[order]
+            y_true = self.y_true[order] == 0
+
+        # the curve is evaluated at the last one of each tied scores
+        distinct_value_indices = np.where(np.diff(y_score))[0]
+        threshold_idxs = np.r_[distinct_value_indices, y_true.size - 1]
+        tps = np.cumsum(y_true, dtype=np.float64)[threshold_idxs]
+        fps = 1 + threshold_idxs - tps
+
+        ps = tps + fps
+        precision = np.zeros_like(tps)
+        np.divide(tps, ps, out=precision, where=(ps != 0))
+        if tps[-1] == 0:
+            recall = np.ones_like(tps)
+        else:
+            recall = tps / tps[-1]
+        thresholds = y_score[threshold_idxs]
+        if _TRUNCATE_AT_FULL_RECALL:
+            stop = tps.searchsorted(tps[-1]) + 1
+            precision, recall, thresholds = \
+                precision[:stop], recall[:stop], thresholds[:stop]
+        ret = (np.hstack((precision[::-1], 1)), np.hstack((recall[::-1], 0)),
+               thresholds[::-1])
+        self._curves[pos_class] = ret
+        return ret
+
+    def average_precision(self, pos_class=1):
+        """Compute the average precision of a binary classification.
+
+        Parameters
+        ----------
+        pos_class : {0, 1}
+            The class to be regarded as positive. (default 1)
+
+        Returns
+        -------
+        float
+            The average precision, the same as
+            `sklearn.metrics.average_precision_score`.
+        """
+        precision, recall, _ = self.precision_recall_curve(pos_class)
+        if _TRAPEZOIDAL_AVERAGE_PRECISION:
+            return -np.trapz(precision, recall)
+        return -np.sum(np.diff(recall) * precision[:-1])
@@ -7,7 +7,7 @@ import pandas as pd
 from ..elements import *
 
 __all__ = [
-    'data_frame_to_table',
+    'data_frame_to_table', 'data_frame_to_data_table',
 ]
 
 
@@ -94,3 +94,50 @@ def data_frame_to_table(df, title=None, name=None, name_scope=None):
 
     return Table(rows=body, header=headers, title=title, name=name,
                  name_scope=name_scope)
+
+
+def data_frame_to_data_table(df, title=None, name=None, name_scope=None):
+    """Create a report DataTable from pandas DataFrame.
+
+    Unlike `data_frame_to_table`, the values of the dataframe are stored
+    column by column in a single resource, which is much more compact and
+    faster to render for large dataframes.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe object.
+
+    title : str
+        Optional title of the table.
+
+    name, name_scope : str
+        Name and name scope of the table.
+
+    Returns
+    -------
+    DataTable
+        DataTable report object.
+
+    Notes
+    -----
+    The prebuilt frontend bundle of the board cannot render `DataTable`
+    yet, see the notes of `DataTable`.
+    """
+    if isinstance(df.index, pd.MultiIndex):
+        index = [df.index.get_level_values(i).values
+                 for i in range(df.index.nlevels)]
+    else:
+        index = [df.index.values]
+    index_names = list(df.index.names)
+    if all(n is None for n in index_names):
+        index_names = None
+    return DataTable(
+        columns=list(df.columns),
+        values=[df.iloc[:, i].values for i in range(df.shape[1])],
+        index=index,
+        index_names=index_names,
+        title=title,
+        name=name,
+        name_scope=name_scope
+    )
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import copy
 
+from mlcomp.utils import downsample_curve
 from ..elements import *
 
 __all__ = [
@@ -10,7 +11,8 @@ __all__ = [
 
 def loss_accuracy_curve(metrics, metric_name='loss', secondary_metrics=None,
                         secondary_metric_name='accuracy', step_name='step',
-                        title=None):
+                        title=None, max_points=None,
+                        data_points_format='dicts'):
     """Training loss and accuracy curve.
 
     This method generates a CanvasJS report object, which plots
@@ -48,18 +50,28 @@ def loss_accuracy_curve(metrics, metric_name='loss', secondary_metrics=None,
 
     title : str
         Title of the figure.
+
+    max_points : int
+        If specified, each metric curve will be downsampled to at most this
+        number of points, using the min-max method so that spikes in the
+        curve are preserved.
+
+    data_points_format : {'dicts', 'columns', 'binary'}
+        The format of the data points in the chart resource, see
+        `CanvasJS.data_points`. (default 'dicts')
     """
     def add_metric(m, **kwargs):
+        steps, values = m['steps'], m['values']
+        if max_points is not None:
+            steps, values = downsample_curve(
+                steps, values, max_points, method='minmax')
         itm = copy.copy(kwargs)
         itm.update({
             'name': m['name'],
             'showInLegend': True,
             'type': 'line',
-            'dataPoints': [
-                {'x': x, 'y': y}
-                for x, y in zip(m['steps'], m['values'])
-            ]
         })
+        itm.update(CanvasJS.data_points(steps, values, data_points_format))
         if 'color' in m:
             itm['color'] = m['color']
         data.append(itm)
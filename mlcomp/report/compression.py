@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import gzip
+import io
+import zlib
+from collections import OrderedDict
+
+import six
+
+__all__ = [
+    'ResourceCodec', 'register_codec', 'get_codec', 'iter_codecs',
+]
+
+
+class ResourceCodec(object):
+    """Compression codec for resource files.
+
+    Parameters
+    ----------
+    name : str
+        Name of this codec, which is recorded in the resource config.
+
+    suffix : str
+        Suffix appended to the path of compressed resource files.
+
+    compress : (bytes, int | None) -> bytes
+        Function to compress data at specified level.  If the level is
+        None, the default level of this codec should be used.
+
+    decompress : (bytes) -> bytes
+        Function to decompress data.
+
+    content_encoding : str
+        The HTTP "Content-Encoding" for serving the compressed files
+        directly to browsers.  If None, the files will be decompressed
+        before being served.
+    """
+
+    def __init__(self, name, suffix, compress, decompress,
+                 content_encoding=None):
+        self.name = name
+        self.suffix = suffix
+        self.content_encoding = content_encoding
+        self._compress = compress
+        self._decompress = decompress
+
+    def __repr__(self):
+        return 'ResourceCodec(%r)' % (self.name,)
+
+    def compress(self, data, level=None):
+        """Compress `data` at specified `level`."""
+        return self._compress(data, level)
+
+    def decompress(self, data):
+        """Decompress `data`."""
+        return self._decompress(data)
+
+
+_codecs = OrderedDict()  # type: dict[str, ResourceCodec]
+
+
+def register_codec(codec):
+    """Register a resource codec, replacing any codec with the same name.
+
+    Parameters
+    ----------
+    codec : ResourceCodec
+        The codec to be registered.
+    """
+    _codecs[codec.name] = codec
+
+
+def get_codec(name):
+    """Get the resource codec with specified `name`.
+
+    Raises
+    ------
+    KeyError
+        If the codec is not registered, e.g., the library it depends on
+        is not installed.
+    """
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise KeyError('Compression codec %r is not available.' % (name,))
+
+
+def iter_codecs():
+    """Iterate through all the registered resource codecs."""
+    return six.itervalues(_codecs)
+
+
+def _gzip_compress(data, level):
+    # the mtime in the gzip header is fixed, so that the compressed data
+    # is determined by the content.
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', mtime=0,
+                       compresslevel=9 if level is None else level) as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+def _gzip_decompress(data):
+    with gzip.GzipFile(fileobj=io.BytesIO(data), mode='rb') as f:
+        return f.read()
+
+
+register_codec(ResourceCodec(
+    'gzip', '.gz', _gzip_compress, _gzip_decompress,
+    content_encoding='gzip'
+))
+register_codec(ResourceCodec(
+    'zlib', '.zz',
+    lambda data, level: zlib.compress(data, 6 if level is None else level),
+    zlib.decompress,
+    content_encoding='deflate'
+))
+
+try:
+    import lzma
+except ImportError:  # pragma: no cover
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+if lzma is not None:
+    register_codec(ResourceCodec(
+        'lzma', '.xz',
+        lambda data, level: lzma.compress(data, preset=level),
+        lzma.decompress
+    ))
+
+try:
+    import zstandard
+except ImportError:
+    pass
+else:  # pragma: no cover
+    register_codec(ResourceCodec(
+        'zstd', '.zst',
+        lambda data, level: zstandard.ZstdCompressor(
+            level=3 if level is None else level).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompressobj().
+        decompress(data),
+        content_encoding='zstd'
+    ))
+
+try:
+    import lz4.frame
+except ImportError:
+    pass
+else:  # pragma: no cover
+    register_codec(ResourceCodec(
+        'lz4', '.lz4',
+        lambda data, level: lz4.frame.compress(
+            data, compression_level=level or 0),
+        lz4.frame.decompress
+    ))
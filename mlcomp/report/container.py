@@ -118,6 +118,16 @@ class Report(Group):
         ReportSaver(save_dir, overwrite=overwrite).save(self)
 
     @staticmethod
-    def load(save_dir):
-        """Load report from `save_dir`."""
-        return ReportSaver(save_dir).load()
+    def load(save_dir, lazy=False):
+        """Load report from `save_dir`.
+
+        Parameters
+        ----------
+        save_dir : str
+            The directory where the report has been saved.
+
+        lazy : bool
+            If True, the data of resources will not be loaded until they
+            are accessed for the first time. (default False)
+        """
+        return ReportSaver(save_dir).load(lazy=lazy)
@@ -2,8 +2,10 @@
 """Various types of basic report elements."""
 import json
 import uuid
+from base64 import b64encode
 from io import BytesIO
 
+import numpy as np
 import six
 
 from mlcomp.utils import flatten_list, JsonEncoder
@@ -20,7 +22,7 @@ __all__ = [
     'is_report_element',
     'HTML', 'Text', 'ParagraphText', 'LineBreak', 'InlineMath', 'BlockMath',
     'Image', 'Attachment',
-    'TableCell', 'TableRow', 'Table',
+    'TableCell', 'TableRow', 'Table', 'DataTable',
     'Block', 'Section',
     'DynamicContent', 'CanvasJS',
 ]
@@ -332,6 +334,137 @@ class Table(ReportObject, _Element):
         return ret
 
 
+def _format_table_value(v):
+    if v is None:
+        return ''
+    if isinstance(v, (float, np.floating)):
+        return '%.7g' % v
+    return str(v)
+
+
+class DataTable(ReportObject, _Element):
+    """Columnar table element, for large tables.
+
+    Unlike `Table`, which composes every cell of a table as report objects,
+    `DataTable` stores the whole table column by column in a single JSON
+    resource, which is rendered on the client side with only the visible
+    rows.  The table may have one or more index columns on the left side,
+    where consecutive rows with identical index value are merged.
+
+    The JSON resource is composed as follows:
+
+        {'num_rows': ...,
+         'columns': [column label, ...],
+         'kinds': [numpy dtype kind of each column, 's' for strings],
+         'values': [[value of each row], ...],
+         'index_names': [name of each index level, or None],
+         'index': [{'values': [...], 'spans': [...]}, ...]}
+
+    where the values of each index level are merged into runs, with the
+    formatted value and the number of rows of each run.
+
+    Parameters
+    ----------
+    columns : list
+        The column labels.
+
+    values : list[list | numpy.ndarray]
+        The values of each column.  Numeric and boolean columns are kept
+        as they are, while other columns are formatted as strings.
+
+    index : list[list | numpy.ndarray]
+        Optional values of each index level.
+
+    index_names : list[str]
+        Optional names of each index level.
+
+    title : str
+        Optional title of the table.
+
+    data : Resource
+        The JSON resource of the table.  If specified, `columns`, `values`,
+        `index` and `index_names` will be ignored.
+
+    **kwargs
+        Other arguments passed to `ReportObject`.
+
+    Notes
+    -----
+    The prebuilt frontend bundle in "mlcomp/board/static/prod" cannot
+    render `DataTable` yet.  Rebuild it by ``npm run deploy`` under
+    "mlcomp/board/frontend" before saving reports with this element,
+    or use `Table` instead.
+    """
+
+    def __init__(self, columns=None, values=None, index=None,
+                 index_names=None, title=None, data=None, **kwargs):
+        if data is None:
+            data = self._make_data(columns, values, index, index_names)
+            data = json.dumps(data, cls=JsonEncoder).encode('utf-8')
+            data = Resource(data, extension='.json', name='Data',
+                            gzip_compress=True)
+        self.data = data
+        self.title = title
+        super(DataTable, self).__init__(**kwargs)
+
+    @staticmethod
+    def _make_data(columns, values, index, index_names):
+        columns = list(columns or ())
+        values = list(values or ())
+        index = list(index or ())
+        if len(values) != len(columns):
+            raise ValueError('The number of columns does not match the '
+                             'number of column labels.')
+        if index_names is None:
+            index_names = [None] * len(index)
+        elif len(index_names) != len(index):
+            raise ValueError('The number of index levels does not match the '
+                             'number of index names.')
+
+        num_rows = None
+        for v in values + index:
+            if num_rows is None:
+                num_rows = len(v)
+            elif len(v) != num_rows:
+                raise ValueError('Columns must have the same length.')
+
+        ret_kinds = []
+        ret_values = []
+        for v in values:
+            v = np.asarray(v)
+            if v.dtype.kind in 'biuf':
+                ret_kinds.append(v.dtype.kind)
+                ret_values.append(v.tolist())
+            else:
+                ret_kinds.append('s')
+                ret_values.append([_format_table_value(i) for i in v])
+
+        ret_index = []
+        for v in index:
+            v = np.asarray(v, dtype=object)
+            if len(v):
+                # consecutive identical values are merged into runs
+                starts = np.concatenate(
+                    [[0], np.where(v[1:] != v[:-1])[0] + 1])
+                spans = np.diff(np.concatenate([starts, [len(v)]]))
+                ret_index.append({
+                    'values': [_format_table_value(i) for i in v[starts]],
+                    'spans': spans.tolist(),
+                })
+            else:
+                ret_index.append({'values': [], 'spans': []})
+
+        return {
+            'num_rows': num_rows or 0,
+            'columns': [_format_table_value(c) for c in columns],
+            'kinds': ret_kinds,
+            'values': ret_values,
+            'index_names': [None if n is None else _format_table_value(n)
+                            for n in index_names],
+            'index': ret_index,
+        }
+
+
 class Block(Group, _Element):
     """Block element.
 
@@ -436,6 +569,19 @@ class DynamicContent(ReportObject, _Element):
 class CanvasJS(ReportObject, _Element):
     """CanvasJS figure element.
 
+    Besides the standard "dataPoints" of CanvasJS, each data series of the
+    chart may alternatively carry its points as columns, which is much more
+    compact for large series, and is expanded into "dataPoints" by the
+    board before rendering:
+
+        {'dataColumns': {'x': [...], 'y': [...]}}
+
+    or, with the columns as base64 encoded little-endian float64 buffers:
+
+        {'dataColumns': {'x': '...', 'y': '...', 'encoding': 'base64'}}
+
+    See `CanvasJS.data_points` for composing such series.
+
     Parameters
     ----------
     data : dict
@@ -462,3 +608,50 @@ class CanvasJS(ReportObject, _Element):
         self.title = title
         self.container_id = container_id
         super(CanvasJS, self).__init__(**kwargs)
+
+    #: The supported formats of data points.
+    DATA_POINTS_FORMATS = ('dicts', 'columns', 'binary')
+
+    @staticmethod
+    def data_points(x, y, format='dicts'):
+        """Compose the data points of a chart data series.
+
+        Parameters
+        ----------
+        x, y : numpy.ndarray
+            The x and y coordinates of the data points.
+
+        format : {'dicts', 'columns', 'binary'}
+            The format of the data points. (default 'dicts')
+
+            *   'dicts': standard CanvasJS "dataPoints", a list of
+                ``{'x': x, 'y': y}`` dicts.
+            *   'columns': "dataColumns" with `x` and `y` as lists.
+            *   'binary': "dataColumns" with `x` and `y` as base64 encoded
+                float64 buffers.
+
+            The prebuilt frontend bundle in "mlcomp/board/static/prod"
+            can only render 'dicts'.  Rebuild it by ``npm run deploy``
+            under "mlcomp/board/frontend" before using the other formats.
+
+        Returns
+        -------
+        dict
+            The dict to be merged into the data series.
+        """
+        if format not in CanvasJS.DATA_POINTS_FORMATS:
+            raise ValueError('Unknown data points format %r.' % (format,))
+        if len(x) != len(y):
+            raise ValueError('The length of `x` and `y` are not equal.')
+        if format == 'dicts':
+            return {'dataPoints': [{'x': a, 'y': b} for a, b in zip(x, y)]}
+        x = np.asarray(x)
+        y = np.asarray(y)
+        if format == 'columns':
+            return {'dataColumns': {'x': x.tolist(), 'y': y.tolist()}}
+
+        def encode(a):
+            a = np.ascontiguousarray(a, dtype='<f8')
+            return b64encode(a.tobytes()).decode('utf-8')
+        return {'dataColumns': {'x': encode(x), 'y': encode(y),
+                                'encoding': 'base64'}}
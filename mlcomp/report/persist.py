@@ -52,11 +52,52 @@ class ReportSaver(object):
     overwrite : bool
         Whether or not to overwrite existing files at `save_dir`?
         (default is False)
+
+    ndarray_format : {'list', 'binary'}
+        The format of numpy arrays in the JSON serialized file.
+        See `mlcomp.utils.JsonEncoder` for more details. (default 'list')
+
+    ndarray_compress : bool
+        Whether or not to compress the numpy arrays in 'binary' format?
+        (default False)
+
+    ndarray_spill_size : int
+        If specified, numpy arrays with at least this number of bytes
+        will be saved as ".npy" files under the resource directory,
+        instead of being put into the JSON serialized file.  These arrays
+        will be memory-mapped in read-only mode when loaded.
+        (default None)
+
+    save_workers : int
+        If specified, compress and write the resources with this number
+        of threads.  See `ResourceManager` for more details.
+        (default None)
+
+    blob_dir : str
+        If specified, store the resources as content-addressed blobs
+        under this directory, so that identical resources are stored
+        only once.  See `ResourceManager` for more details.
+        (default None)
+
+    compression, compression_level
+        If specified, override the compression codec and level of all
+        the resources to be compressed.  See `mlcomp.report.compression`
+        for the available codecs. (default None)
     """
 
-    def __init__(self, save_dir, overwrite=False):
+    def __init__(self, save_dir, overwrite=False, ndarray_format='list',
+                 ndarray_compress=False, ndarray_spill_size=None,
+                 save_workers=None, blob_dir=None, compression=None,
+                 compression_level=None):
         self.save_dir = os.path.abspath(save_dir)
         self.overwrite = overwrite
+        self.ndarray_format = ndarray_format
+        self.ndarray_compress = ndarray_compress
+        self.ndarray_spill_size = ndarray_spill_size
+        self.save_workers = save_workers
+        self.blob_dir = blob_dir
+        self.compression = compression
+        self.compression_level = compression_level
 
     def save_dir_exists(self):
         """Check whether `save_dir` exists and is not an empty directory."""
@@ -88,28 +129,69 @@ class ReportSaver(object):
             raise IOError('%r already exists.' % (self.save_dir,))
         makedirs(self.save_dir, exist_ok=True)
         report.assign_name_scopes()
+        json_file = os.path.join(self.save_dir, REPORT_JSON_FILE)
         rm = ResourceManager(
             os.path.join(self.save_dir, REPORT_RESOURCE_DIR),
-            rel_path=REPORT_RESOURCE_DIR
+            rel_path=REPORT_RESOURCE_DIR,
+            workers=self.save_workers,
+            blob_dir=self.blob_dir,
+            compression=self.compression,
+            compression_level=self.compression_level
         )
+        with rm:
+            report.save_resources(rm)
+            rm.wait()
+            with codecs.open(json_file, 'wb', 'utf-8') as f:
+                cnt = {
+                    'generator': 'mlcomp %s' % __version__,
+                    'report': report,
+                }
+                encoder = ReportJsonEncoder(
+                    sort_keys=True,
+                    ndarray_format=self.ndarray_format,
+                    ndarray_compress=self.ndarray_compress,
+                    resource_manager=rm,
+                    ndarray_spill_size=self.ndarray_spill_size,
+                )
+                encoder.dump(cnt, f)
+
+    def load(self, name_scope=None, lazy=False):
+        """Load the report object from `save_dir`.
+
+        Parameters
+        ----------
+        name_scope : str
+            If specified, load only the report object with this name scope,
+            as well as its descendants.  The resources of other report
+            objects will not be loaded.
+
+        lazy : bool
+            If True, the data of resources will not be loaded until they
+            are accessed for the first time. (default False)
+
+        Raises
+        ------
+        KeyError
+            If the report object at `name_scope` cannot be found.
+
+        Returns
+        -------
+        ReportObject
+            The loaded report object.
+        """
         json_file = os.path.join(self.save_dir, REPORT_JSON_FILE)
-        report.save_resources(rm)
-        with codecs.open(json_file, 'wb', 'utf-8') as f:
-            cnt = {
-                'generator': 'mlcomp %s' % __version__,
-                'report': report,
-            }
-            json.dump(cnt, f, cls=ReportJsonEncoder, sort_keys=True)
-
-    def load(self):
-        """Load the report object from `save_dir`."""
-        json_file = os.path.join(self.save_dir, REPORT_JSON_FILE)
-        with codecs.open(json_file, 'rb', 'utf-8') as f:
-            cnt = json.load(f, cls=ReportJsonDecoder)
-            report = cnt['report']
         rm = ResourceManager(
             os.path.join(self.save_dir, REPORT_RESOURCE_DIR),
-            rel_path=REPORT_RESOURCE_DIR
+            rel_path=REPORT_RESOURCE_DIR,
+            lazy=lazy
         )
+        with codecs.open(json_file, 'rb', 'utf-8') as f:
+            cnt = json.load(f, cls=ReportJsonDecoder, resource_manager=rm)
+            report = cnt['report']
+        if name_scope is not None:
+            report = report.find_name_scope(name_scope)
+            if report is None:
+                raise KeyError(
+                    'Report object %r cannot be found.' % (name_scope,))
         report.load_resources(rm)
         return report
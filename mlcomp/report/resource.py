@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
-import gzip
+import hashlib
 import mimetypes
 import os
+import shutil
+from multiprocessing.pool import ThreadPool
 
+import numpy as np
 import six
 
+from mlcomp.persist.utils import write_file_atomically
 from mlcomp.utils import makedirs
 from .base import ReportObject
+from .compression import get_codec
 
 __all__ = [
-    'Resource', 'ResourceManager',
+    'Resource', 'ResourceManager', 'collect_blobs',
 ]
 
 
@@ -41,23 +46,47 @@ class Resource(ReportObject):
         Meanwhile, the stored path will still be `name_scope + extension`.
         (default is False)
 
+    compression : str
+        Name of the compression codec, e.g., 'gzip', 'zlib' or 'lzma'.
+        See `mlcomp.report.compression` for all the codecs.  Specifying
+        'gzip' is equivalent to setting `gzip_compress` to True.
+        (default None)
+
+    compression_level : int
+        The compression level.  If not specified, use the default level
+        of the codec. (default None)
+
     **kwargs
         Other arguments passed to `ReportObject`.
     """
 
     def __init__(self, data=None, path=None, extension=None, content_type=None,
-                 gzip_compress=False, name=None, name_scope=None):
+                 gzip_compress=False, compression=None, compression_level=None,
+                 name=None, name_scope=None):
         super(Resource, self).__init__(name=name, name_scope=name_scope)
         if data is None and path is None:
             raise ValueError(
                 'At least one of `data`, `path` should be specified.')
         if data and not isinstance(data, six.binary_type):
             raise TypeError('`data` must be binary type.')
+        if gzip_compress and compression not in (None, 'gzip'):
+            raise ValueError(
+                '`gzip_compress` conflicts with `compression` %r.' %
+                (compression,)
+            )
         self._data = data
+        self._lazy_rm = None
         self._extension = extension
         self._content_type = content_type
         self.path = path
-        self.gzip_compress = gzip_compress
+        self._set_codec('gzip' if gzip_compress else compression)
+        self.compression_level = compression_level
+
+    def _set_codec(self, codec):
+        # gzip is stored as `gzip_compress`, for compatibility with the
+        # reports saved before other codecs were supported.
+        self.gzip_compress = codec == 'gzip'
+        self.compression = codec if codec != 'gzip' else None
 
     def _repr_dict(self):
         ret = super(Resource, self)._repr_dict()
@@ -72,8 +101,19 @@ class Resource(ReportObject):
     def has_saved(self):
         return self.path is not None
 
+    @property
+    def codec(self):
+        """Name of the compression codec, or None if not compressed."""
+        return 'gzip' if self.gzip_compress else self.compression
+
     @property
     def data(self):
+        if self._data is None and self._lazy_rm is not None:
+            self._data = self._lazy_rm.load(
+                path=self.path,
+                compression=self.codec
+            )
+            self._lazy_rm = None
         return self._data
 
     @property
@@ -112,21 +152,29 @@ class Resource(ReportObject):
         return super(Resource, self).to_json(**kwargs)
 
     def save_resources(self, rm):
-        if not self.has_loaded:
+        data = self.data
+        if data is None:
             raise RuntimeError('`data` has not been loaded.')
         if not rm.has_saved(self.name_scope):
+            codec, level = rm.resolve_compression(
+                self.codec, self.compression_level)
             self.path = rm.save(
-                data=self._data,
+                data=data,
                 name_scope=self.name_scope,
                 extension=self.extension,
-                gzip_compress=self.gzip_compress,
+                compression=codec,
+                compression_level=level,
             )
+            self._set_codec(codec)
 
     def load_resources(self, rm):
         if not self.has_loaded and self.has_saved:
+            if rm.lazy:
+                self._lazy_rm = rm
+                return
             self._data = rm.load(
                 path=self.path,
-                gzip_compress=self.gzip_compress
+                compression=self.codec
             )
 
 
@@ -142,23 +190,125 @@ class ResourceManager(object):
         The relative path of `save_dir`, when the resources are included
         in a report file.  Default is '', which suggests the file should
         be placed just at the root of `save_dir`.
+
+    lazy : bool
+        If True, the resources will not be loaded in `load_resources`,
+        but on the first access to their data. (default False)
+
+    workers : int
+        If specified, the resources will be compressed and written by a
+        pool of this number of threads, while the save paths are still
+        determined on the calling thread.  `wait` or `close` must be
+        called to ensure all the resources have been written.
+        (default None, write the resources on the calling thread)
+
+    blob_dir : str
+        If specified, the resources will be stored as blobs named by the
+        SHA-256 hashes of their data under this directory, and the save
+        paths will be hard links to these blobs (or copies, if hard links
+        are not supported).  Identical resources saved via any resource
+        manager with the same `blob_dir` thus take the disk space only
+        once.  The saved reports remain self-contained.
+        (default None)
+
+    compression : str
+        If specified, override the compression codec of all the resources
+        to be compressed. (default None)
+
+    compression_level : int
+        If specified, override the compression level of all the resources
+        to be compressed. (default None)
     """
 
-    def __init__(self, save_dir, rel_path=''):
+    def __init__(self, save_dir, rel_path='', lazy=False, workers=None,
+                 blob_dir=None, compression=None, compression_level=None):
         rel_path = rel_path.rstrip('/')
         if rel_path:
             rel_path += '/'
         self.save_dir = os.path.abspath(save_dir)
         self.rel_path = rel_path
+        self.lazy = lazy
+        self.workers = workers
+        self.blob_dir = os.path.abspath(blob_dir) if blob_dir else None
+        if compression is not None:
+            get_codec(compression)  # check whether the codec is available
+        self.compression = compression
+        self.compression_level = compression_level
         self._saved = {}
+        self._pool = None
+        self._pending = []
 
     def __repr__(self):
         return 'ResourceManager(%r)' % (self.save_dir,)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _submit(self, method, *args):
+        if self.workers:
+            if self._pool is None:
+                self._pool = ThreadPool(self.workers)
+            self._pending.append(self._pool.apply_async(method, args))
+        else:
+            method(*args)
+
+    def wait(self):
+        """Wait for all the resources to be written.
+
+        Raises
+        ------
+        Exception
+            The first error raised in writing the resources, after
+            all the resources have been processed.
+        """
+        pending, self._pending = self._pending, []
+        for r in pending:
+            r.wait()
+        for r in pending:
+            r.get()
+
+    def close(self):
+        """Wait for all the resources to be written, and stop the workers."""
+        try:
+            self.wait()
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
     def clear_saved(self):
         """Clear the dict of saved resources."""
         self._saved.clear()
 
+    def resolve_compression(self, codec, level):
+        """Get the compression codec and level to save a resource.
+
+        Parameters
+        ----------
+        codec : str | None
+            The compression codec requested by the resource.
+            If None, the resource will not be compressed.
+
+        level : int | None
+            The compression level requested by the resource.
+
+        Returns
+        -------
+        (str | None, int | None)
+            The codec and level, overridden by those of this manager.
+        """
+        if codec is None:
+            return None, None
+        if self.compression is not None:
+            codec = self.compression
+        if self.compression_level is not None:
+            level = self.compression_level
+        return codec, level
+
     def has_saved(self, name_scope):
         """Check whether or not the resource at `name_scope` has been saved.
 
@@ -169,7 +319,8 @@ class ResourceManager(object):
         """
         return name_scope in self._saved
 
-    def save(self, data, name_scope, extension, gzip_compress=False):
+    def save(self, data, name_scope, extension, gzip_compress=False,
+             compression=None, compression_level=None):
         """Save `data` at specified `name_scope`.
 
         Parameters
@@ -185,8 +336,17 @@ class ResourceManager(object):
 
         gzip_compress : bool
             Whether or not to store the data in gzip compressed file?
+            Equivalent to specifying `compression` as 'gzip'.
             (default is False)
 
+        compression : str
+            Name of the compression codec.  If specified, the data will
+            be compressed and stored in `path + codec.suffix`, while the
+            returned save path will still be `path`. (default None)
+
+        compression_level : int
+            The compression level. (default None)
+
         Returns
         -------
         str
@@ -197,27 +357,117 @@ class ResourceManager(object):
                 'at %r: `data` must be binary object.' %
                 (name_scope,)
             )
+        codec = self._get_codec(gzip_compress, compression)
+        file_path, path = self._resolve_save_path(name_scope, extension)
+        if self.blob_dir:
+            self._submit(self._write_blob, file_path, data, codec,
+                         compression_level)
+        else:
+            self._submit(self._write_file, file_path, data, codec,
+                         compression_level)
+        self._saved[name_scope] = self.rel_path + path
+        return self._saved[name_scope]
+
+    def save_ndarray(self, array, name_scope):
+        """Save numpy `array` at specified `name_scope` as a ".npy" file.
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+            The numpy array to be saved.  Arrays of object dtype are
+            not supported.
+
+        name_scope : str
+            The name scope of the resource.
+
+        Returns
+        -------
+        str
+            The save path.
+        """
+        if array.dtype.hasobject:
+            raise TypeError(
+                'at %r: numpy arrays of object dtype cannot be saved.' %
+                (name_scope,)
+            )
+        file_path, path = self._resolve_save_path(name_scope, '.npy')
+        self._submit(self._write_ndarray, file_path, array)
+        self._saved[name_scope] = self.rel_path + path
+        return self._saved[name_scope]
+
+    @staticmethod
+    def _remove_existing(file_path):
+        # existing files might be hard links to blobs, which should not
+        # be overwritten in place.
+        if os.path.lexists(file_path):
+            os.remove(file_path)
+
+    @staticmethod
+    def _get_codec(gzip_compress, compression):
+        if gzip_compress:
+            compression = 'gzip'
+        return get_codec(compression) if compression else None
+
+    def _write_file(self, file_path, data, codec, level):
+        if codec is not None:
+            file_path += codec.suffix
+            data = codec.compress(data, level)
+        self._remove_existing(file_path)
+        with open(file_path, 'wb') as f:
+            f.write(data)
+
+    def _write_blob(self, file_path, data, codec, level):
+        name = hashlib.sha256(data).hexdigest()
+        blob_path = os.path.join(self.blob_dir, name[:2], name)
+        if codec is not None:
+            file_path += codec.suffix
+            blob_path += codec.suffix
+        if not os.path.exists(blob_path):
+            if codec is not None:
+                data = codec.compress(data, level)
+            makedirs(os.path.split(blob_path)[0], exist_ok=True)
+            write_file_atomically(blob_path, data, encoding=None)
+
+        self._remove_existing(file_path)
+        try:
+            os.link(blob_path, file_path)
+        except (OSError, AttributeError):
+            try:
+                shutil.copyfile(blob_path, file_path)
+            except (IOError, OSError):
+                # the blob might have just been removed by `collect_blobs`
+                # in another process, in which case it should be written
+                # again.
+                if os.path.exists(blob_path):
+                    raise
+                if codec is not None:
+                    file_path = file_path[: -len(codec.suffix)]
+                self._write_blob(file_path, data, codec, level)
+
+    def _write_ndarray(self, file_path, array):
+        self._remove_existing(file_path)
+        with open(file_path, 'wb') as f:
+            np.save(f, array, allow_pickle=False)
+
+    def _resolve_save_path(self, name_scope, extension):
         path = name_scope.strip('/')
         if not path:
             raise ValueError('`name_scope` must not be empty.')
         if extension:
             path += extension
-
         file_path = os.path.join(self.save_dir, path)
         parent_dir = os.path.split(file_path)[0]
         makedirs(parent_dir, exist_ok=True)
+        return file_path, path
 
-        if gzip_compress:
-            with gzip.open(file_path + '.gz', 'wb') as f:
-                f.write(data)
-        else:
-            with open(file_path, 'wb') as f:
-                f.write(data)
-
-        self._saved[name_scope] = self.rel_path + path
-        return self._saved[name_scope]
+    def _resolve_load_path(self, path):
+        if self.rel_path and not path.startswith(self.rel_path):
+            raise ValueError(
+                '%r does not start with %r.' % (path, self.rel_path))
+        path = path[len(self.rel_path):].strip('/')
+        return os.path.join(self.save_dir, path)
 
-    def load(self, path, gzip_compress=False):
+    def load(self, path, gzip_compress=False, compression=None):
         """Load data at specified save `path`.
 
         Parameters
@@ -227,8 +477,13 @@ class ResourceManager(object):
 
         gzip_compress : bool
             Whether or not to load data from gzip compressed file?
+            Equivalent to specifying `compression` as 'gzip'.
             (default is False)
 
+        compression : str
+            Name of the compression codec of the stored file.
+            (default None)
+
         Raises
         ------
         IOError
@@ -242,15 +497,83 @@ class ResourceManager(object):
         bytes
             The loaded binary data.
         """
-        if self.rel_path and not path.startswith(self.rel_path):
-            raise ValueError(
-                '%r does not start with %r.' % (path, self.rel_path))
-        path = path[len(self.rel_path):].strip('/')
-        path = os.path.join(self.save_dir, path)
-
-        if gzip_compress:
-            with gzip.open(path + '.gz', 'rb') as f:
-                return f.read()
+        codec = self._get_codec(gzip_compress, compression)
+        path = self._resolve_load_path(path)
+        if codec is not None:
+            with open(path + codec.suffix, 'rb') as f:
+                return codec.decompress(f.read())
         else:
             with open(path, 'rb') as f:
                 return f.read()
+
+    def load_ndarray(self, path, mmap_mode='r'):
+        """Load numpy array at specified save `path`.
+
+        Parameters
+        ----------
+        path : str
+            The save path, which is expected to start with `rel_path`.
+
+        mmap_mode : {None, 'r', 'r+', 'c'}
+            If not None, memory-map the file instead of reading it into
+            memory.  See `numpy.load` for more details. (default 'r')
+
+        Raises
+        ------
+        IOError
+            If the path cannot be found, or cannot be loaded.
+
+        ValueError
+            If `path` does not start with `rel_path`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The loaded numpy array.
+        """
+        path = self._resolve_load_path(path)
+        return np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+
+
+def collect_blobs(blob_dir):
+    """Remove the blobs which are no longer used by any resource.
+
+    The resources saved with `blob_dir` are hard links to the blobs,
+    thus a blob whose link count has dropped to one is not referenced
+    by any report.  If hard links are not supported, the resources are
+    copies of the blobs, and all the blobs will be removed, which only
+    costs the deduplication of future resources.
+
+    Parameters
+    ----------
+    blob_dir : str
+        The directory of the blobs.
+
+    Returns
+    -------
+    int
+        The number of removed blobs.
+    """
+    count = 0
+    if not os.path.isdir(blob_dir):
+        return count
+    for sub_name in os.listdir(blob_dir):
+        sub_dir = os.path.join(blob_dir, sub_name)
+        if not os.path.isdir(sub_dir):
+            continue
+        for name in os.listdir(sub_dir):
+            if name.startswith('.'):
+                continue  # temporary file of a blob being written
+            path = os.path.join(sub_dir, name)
+            try:
+                st = os.lstat(path)
+                if st.st_nlink == 1:
+                    os.remove(path)
+                    count += 1
+            except OSError:
+                pass
+        try:
+            os.rmdir(sub_dir)
+        except OSError:
+            pass  # the directory is not empty
+    return count
@@ -12,6 +12,37 @@ __all__ = [
 ]
 
 
+class _Mappings(dict):
+    """Dict which reports its modifications to `on_change`."""
+
+    def __init__(self, mappings, on_change):
+        super(_Mappings, self).__init__(mappings)
+        self._on_change = on_change
+
+    def _wrap(method):
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._on_change()
+        wrapper.__name__ = method.__name__
+        return wrapper
+
+    __setitem__ = _wrap(dict.__setitem__)
+    __delitem__ = _wrap(dict.__delitem__)
+    clear = _wrap(dict.clear)
+    pop = _wrap(dict.pop)
+    popitem = _wrap(dict.popitem)
+    setdefault = _wrap(dict.setdefault)
+    update = _wrap(dict.update)
+    if hasattr(dict, '__ior__'):
+        __ior__ = _wrap(dict.__ior__)
+    del _wrap
+
+    def __copy__(self):
+        return dict(self)
+
+
 class ReportTypes(object):
     """Context to hold report object type configs.
 
@@ -32,12 +63,46 @@ class ReportTypes(object):
 
     safe_mode : bool
         Whether or not the enable the safe mode? (Default True)
+
+    Notes
+    -----
+    The successful results of `name_to_type` and `type_to_name` are
+    cached, while the failures are not, since the types might be
+    configured or become importable later.  The caches are cleared
+    whenever `mappings` or `safe_mode` is changed.
     """
 
     def __init__(self, mappings=None, safe_mode=True):
-        self.mappings = dict(mappings or ())
-        self.reverse_map = {v: k for k, v in six.iteritems(self.mappings)}
-        self.safe_mode = safe_mode
+        self._name_cache = {}  # type: dict[str, class]
+        self._type_cache = {}  # type: dict[class, str]
+        self._mappings = _Mappings(mappings or (), self._on_change)
+        self._safe_mode = safe_mode
+        self._on_change()
+
+    def _on_change(self):
+        self.reverse_map = {v: k for k, v in six.iteritems(self._mappings)}
+        self._name_cache.clear()
+        self._type_cache.clear()
+
+    @property
+    def mappings(self):
+        """Get the mapping from type name to type object."""
+        return self._mappings
+
+    @mappings.setter
+    def mappings(self, mappings):
+        self._mappings = _Mappings(mappings, self._on_change)
+        self._on_change()
+
+    @property
+    def safe_mode(self):
+        """Whether or not the safe mode is enabled?"""
+        return self._safe_mode
+
+    @safe_mode.setter
+    def safe_mode(self, safe_mode):
+        self._safe_mode = safe_mode
+        self._on_change()
 
     @contextmanager
     def as_default(self):
@@ -76,6 +141,14 @@ class ReportTypes(object):
         TypeError
             If the loaded type is not a report object type.
         """
+        try:
+            return self._name_cache[name]
+        except KeyError:
+            rtype = self._resolve_name(name)
+            self._name_cache[name] = rtype
+            return rtype
+
+    def _resolve_name(self, name):
         from .base import ReportObject
         rtype = None
         if name in self.mappings:
@@ -113,6 +186,16 @@ class ReportTypes(object):
         KeyError
             If the report object type is not configured.
         """
+        try:
+            return self._type_cache[rtype]
+        except (KeyError, TypeError):
+            # `rtype` might not be hashable, but then it would not be
+            # resolved successfully, thus would never be cached.
+            name = self._resolve_type(rtype)
+            self._type_cache[rtype] = name
+            return name
+
+    def _resolve_type(self, rtype):
         from .base import ReportObject
         if not isinstance(rtype, six.class_types) or \
                 not issubclass(rtype, ReportObject):
@@ -3,7 +3,7 @@ import numpy as np
 
 __all__ = [
     'minibatch_slices_iterator', 'minibatch_iterator', 'split_numpy_arrays',
-    'split_numpy_array',
+    'split_numpy_array', 'downsample_curve',
 ]
 
 
@@ -155,3 +155,96 @@ def split_numpy_array(array, portion=None, size=None, shuffle=True):
     (a,), (b,) = split_numpy_arrays((array,), portion=portion, size=size,
                                     shuffle=shuffle)
     return a, b
+
+
+def _lttb_indices(x, y, max_points):
+    # Largest-Triangle-Three-Buckets: the first and the last points are
+    # always kept, and the points in between are divided into buckets, from
+    # each of which the point forming the largest triangle with the chosen
+    # point of the previous bucket and the mean of the next bucket is chosen.
+    n = len(x)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    ret = np.empty(max_points, dtype=np.int64)
+    ret[0] = 0
+    ret[-1] = n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        if next_stop > stop:
+            cx = np.mean(x[stop: next_stop])
+            cy = np.mean(y[stop: next_stop])
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        area = np.abs(
+            (x[a] - cx) * (y[start: stop] - y[a]) -
+            (x[a] - x[start: stop]) * (cy - y[a])
+        )
+        area[np.isnan(area)] = -1.
+        a = start + int(np.argmax(area))
+        ret[i + 1] = a
+    return ret
+
+
+def _minmax_indices(x, y, max_points):
+    # the first and the last points are always kept, and the points in
+    # between are divided into buckets, from each of which the points
+    # with the minimum and maximum `y` are chosen.
+    n = len(x)
+    edges = np.linspace(1, n - 1, (max_points - 2) // 2 + 1).astype(np.int64)
+    ret = [[0]]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        bucket = y[start: stop]
+        if np.all(np.isnan(bucket)):
+            ret.append([start])
+        else:
+            ret.append(sorted(set([start + int(np.nanargmin(bucket)),
+                                   start + int(np.nanargmax(bucket))])))
+    ret.append([n - 1])
+    return np.concatenate(ret).astype(np.int64)
+
+
+def downsample_curve(x, y, max_points, method='lttb'):
+    """Downsample a curve to at most `max_points` points, preserving its shape.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        The x and y coordinates of the points on the curve.
+
+    max_points : int
+        The maximum number of points to keep, at least 3.  If the curve
+        has no more than `max_points` points, it will be returned as-is.
+
+    method : {'lttb', 'minmax'}
+        The downsampling method. (default 'lttb')
+
+        *   'lttb': The Largest-Triangle-Three-Buckets algorithm, which
+            keeps the visually significant points of the curve.
+        *   'minmax': The points with the minimum and maximum `y` in each
+            bucket are kept, which preserves the extremes (e.g., spikes
+            in a loss curve).
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        The x and y coordinates of the kept points, in original order.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) != len(y):
+        raise ValueError('The length of `x` and `y` are not equal.')
+    if max_points < 3:
+        raise ValueError('`max_points` must be at least 3.')
+    if method not in ('lttb', 'minmax'):
+        raise ValueError('Unknown downsampling method %r.' % (method,))
+    if len(x) <= max_points:
+        return x, y
+
+    xf = x.astype(np.float64)
+    yf = y.astype(np.float64)
+    if method == 'lttb':
+        indices = _lttb_indices(xf, yf, max_points)
+    else:
+        indices = _minmax_indices(xf, yf, max_points)
+    return x[indices], y[indices]
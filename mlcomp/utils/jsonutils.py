@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import json
+import zlib
 from base64 import b64encode, b64decode
 from datetime import datetime
 
@@ -63,6 +64,15 @@ class JsonEncoder(json.JSONEncoder):
     *   numpy.ndarray ->
             {'__type__': 'ndarray', 'data': o.tolist(), 'dtype': o.dtype}
 
+    If `ndarray_format` is set to 'binary', numpy arrays will instead be
+    encoded as their raw little-endian buffers, which is much faster and
+    more compact for large arrays than converting them into lists:
+
+    *   numpy.ndarray ->
+            {'__type__': 'ndarray', 'data': base64 encoded buffer,
+             'dtype': o.dtype.str, 'shape': o.shape,
+             'encoding': 'base64' | 'zlib'}
+
     Besides, if the same (customized) object is referenced for multiple
     times, and if `object_ref` is set to True, it will only be serialized
     only at its first occurrence.  All later occurrences will be saved as:
@@ -74,15 +84,47 @@ class JsonEncoder(json.JSONEncoder):
     object_ref : bool
         Whether or not to allow serializing same object as references?
         (default True)
+
+    ndarray_format : {'list', 'binary'}
+        The format of numpy arrays. (default 'list')
+        Arrays of object dtype are always encoded as lists.
+
+    ndarray_compress : bool
+        Whether or not to compress the buffers of numpy arrays via zlib,
+        if `ndarray_format` is 'binary'? (default False)
     """
 
     NO_REF_TYPES = six.integer_types + (float, bool, datetime,)
 
-    def __init__(self, object_ref=True, **kwargs):
+    def __init__(self, object_ref=True, ndarray_format='list',
+                 ndarray_compress=False, **kwargs):
+        if ndarray_format not in ('list', 'binary'):
+            raise ValueError('Unknown ndarray format %r.' % (ndarray_format,))
         super(JsonEncoder, self).__init__(**kwargs)
         self.object_ref = object_ref
+        self.ndarray_format = ndarray_format
+        self.ndarray_compress = ndarray_compress
         self._ref_dict = {}
 
+    def _encode_ndarray(self, o):
+        if self.ndarray_format == 'list' or o.dtype.hasobject:
+            return {
+                '__type__': 'ndarray',
+                'data': o.tolist(),
+                'dtype': str(o.dtype)
+            }
+        o = o.astype(o.dtype.newbyteorder('<'), order='C', copy=False)
+        buf = o if six.PY3 else o.tobytes()
+        if self.ndarray_compress:
+            buf = zlib.compress(buf)
+        return {
+            '__type__': 'ndarray',
+            'data': b64encode(buf).decode('utf-8'),
+            'dtype': o.dtype.str,
+            'shape': list(o.shape),
+            'encoding': 'zlib' if self.ndarray_compress else 'base64',
+        }
+
     def _default_object_handler(self, o):
         if isinstance(o, JsonBinary):
             cnt = b64encode(o.value).decode('utf-8')
@@ -94,11 +136,7 @@ class JsonEncoder(json.JSONEncoder):
         elif isinstance(o, (np.float, np.float16, np.float32, np.float64)):
             yield float(o)
         elif isinstance(o, np.ndarray):
-            yield {
-                '__type__': 'ndarray',
-                'data': o.tolist(),
-                'dtype': str(o.dtype)
-            }
+            yield self._encode_ndarray(o)
 
     #: List of object serialization handlers
     OBJECT_HANDLERS = [_default_object_handler]
@@ -125,6 +163,40 @@ class JsonEncoder(json.JSONEncoder):
         self.clear_object_ref()
         return super(JsonEncoder, self).encode(o)
 
+    def dump(self, o, fp, buffer_size=65536):
+        """Serialize `o` and write the JSON to `fp` incrementally.
+
+        Like `json.dump`, the JSON is generated piece by piece, but the
+        pieces are buffered and written to `fp` once they sum up to
+        `buffer_size` characters, so as to reduce the number of writes.
+        Note the object references are still tracked in memory, unless
+        `object_ref` is disabled.
+
+        Parameters
+        ----------
+        o
+            The object to be serialized.
+
+        fp
+            The file-like object with a `write` method.
+
+        buffer_size : int
+            The number of characters to buffer before writing to `fp`.
+            (default 65536)
+        """
+        self.clear_object_ref()
+        buf = []
+        size = 0
+        for chunk in self.iterencode(o):
+            buf.append(chunk)
+            size += len(chunk)
+            if size >= buffer_size:
+                fp.write(''.join(buf))
+                buf = []
+                size = 0
+        if buf:
+            fp.write(''.join(buf))
+
 
 class JsonDecoder(json.JSONDecoder):
     """Extended JSON decoder coupled with `mlcomp.utils.JsonEncoder`.
@@ -144,7 +216,20 @@ class JsonDecoder(json.JSONDecoder):
         if v_type == 'binary':
             yield JsonBinary(b64decode(v['data']))
         elif v_type == 'ndarray':
-            yield np.asarray(v['data'], dtype=v['dtype'])
+            encoding = v.get('encoding')
+            if encoding is None:
+                yield np.asarray(v['data'], dtype=v['dtype'])
+            else:
+                # the array is created on the decoded buffer without copying,
+                # thus it would be read-only.
+                buf = b64decode(v['data'])
+                if encoding == 'zlib':
+                    buf = zlib.decompress(buf)
+                elif encoding != 'base64':
+                    raise ValueError(
+                        'Unknown ndarray encoding %r.' % (encoding,))
+                arr = np.frombuffer(buf, dtype=np.dtype(v['dtype']))
+                yield arr.reshape(v['shape'])
 
     #: List of object deserialization handlers
     OBJECT_HANDLERS = [_default_object_handler]
@@ -157,9 +242,10 @@ class JsonDecoder(json.JSONDecoder):
                 raise KeyError('Object reference %r is not defined.' % (v_id,))
             return self._ref_dict[v_id]
         elif v_type is not None:
+            # the handlers may pop '__id__' from `v`
+            v_id = v.get('__id__', None)
             for handler in self.OBJECT_HANDLERS:
                 for o in handler(self, v):
-                    v_id = v.get('__id__', None)
                     if v_id is not None:
                         self._ref_dict[v_id] = o
                     return o
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of computing the metrics of a binary classification report.
+
+The legacy computation via `sklearn.metrics` is also measured, and the
+results of both are checked to be identical.
+
+Usage:
+
+    python scripts/benchmark-classification-report.py [samples]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics import (average_precision_score,
+                             precision_recall_curve,
+                             precision_recall_fscore_support)
+from sklearn.utils.multiclass import unique_labels
+
+sys.path.insert(0, os.path.join(os.path.split(__file__)[0], '..'))
+
+from mlcomp.report import ClassificationMetrics
+
+
+def legacy_metrics(y_true, y_pred, y_prob):
+    labels = unique_labels(y_true, y_pred)
+    summary = precision_recall_fscore_support(y_true, y_pred, labels=labels)
+    curve1 = precision_recall_curve(y_true, y_prob)
+    area1 = average_precision_score(y_true, y_prob)
+    curve0 = precision_recall_curve(1 - y_true, 1. - y_prob)
+    area0 = average_precision_score(1 - y_true, 1. - y_prob)
+    return summary, curve1, area1, curve0, area0
+
+
+def current_metrics(y_true, y_pred, y_prob):
+    m = ClassificationMetrics(y_true, y_pred, y_prob)
+    summary = m.precision_recall_fscore_support()
+    curve1 = m.precision_recall_curve(1)
+    area1 = m.average_precision(1)
+    curve0 = m.precision_recall_curve(0)
+    area0 = m.average_precision(0)
+    return summary, curve1, area1, curve0, area0
+
+
+def measure(method, *args):
+    start_time = time.time()
+    ret = method(*args)
+    return time.time() - start_time, ret
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rs = np.random.RandomState(1234)
+    y_true = rs.randint(0, 2, size=samples)
+    y_prob = np.clip(y_true * .3 + rs.rand(samples) * .7, 0., 1.)
+    y_pred = (y_prob >= .5).astype(np.int32)
+    print('%d samples' % samples)
+
+    legacy, expected = measure(legacy_metrics, y_true, y_pred, y_prob)
+    current, actual = measure(current_metrics, y_true, y_pred, y_prob)
+    for a, b in zip(expected[0] + expected[1] + expected[3],
+                    actual[0] + actual[1] + actual[3]):
+        if not np.array_equal(a, b):
+            raise RuntimeError('The metrics are not identical.')
+    if expected[2] != actual[2] or expected[4] != actual[4]:
+        raise RuntimeError('The average precisions are not identical.')
+    print('legacy     %.3f sec' % legacy)
+    print('current    %.3f sec' % current)
+    print('speedup    %.2fx' % (legacy / current))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Scaling benchmark of `ReportObject.assign_name_scopes` on tables.
+
+The legacy two-pass implementation is also measured, and the assigned
+name scopes of both implementations are checked to be identical.
+
+Usage:
+
+    python scripts/benchmark-name-scopes.py [max_rows] [columns]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.split(__file__)[0], '..'))
+
+from slugify import UniqueSlugify
+
+from mlcomp.report import Report, Table, TableCell, TableRow, Text
+from mlcomp.utils import camel_to_underscore
+
+
+def legacy_assign_name_scopes(report):
+    def get_slugify():
+        def inner(r):
+            candidate = r.name
+            if candidate is None:
+                candidate = camel_to_underscore(r.__class__.__name__)
+            return slugify(candidate)
+        slugify = UniqueSlugify(to_lower=True, max_length=64, separator='_',
+                                stop_words=('a', 'an', 'the'))
+        return inner
+
+    stack = [report]
+    while stack:
+        c = stack.pop()
+        c.name_scope = None
+        stack.extend(reversed(c.gather_children()))
+
+    stack = [(report, '', get_slugify())]
+    while stack:
+        r, path, r_slugify = stack.pop()
+        if r.name_scope is None:
+            r.name_scope = path + r_slugify(r)
+        c_slugify = get_slugify()
+        for c in reversed(r.gather_children()):
+            stack.append((c, r.name_scope + '/', c_slugify))
+
+
+def make_report(rows, columns):
+    return Report(children=[
+        Table([
+            TableRow([
+                TableCell(Text('%d,%d' % (i, j))) for j in range(columns)
+            ])
+            for i in range(rows)
+        ])
+    ])
+
+
+def collect_name_scopes(report):
+    ret = []
+    stack = [report]
+    while stack:
+        c = stack.pop()
+        ret.append(c.name_scope)
+        stack.extend(reversed(c.gather_children()))
+    return ret
+
+
+def measure(method, report):
+    start_time = time.time()
+    method(report)
+    return time.time() - start_time
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print('%10s %10s %12s %12s %8s' %
+          ('rows', 'cells', 'legacy (s)', 'current (s)', 'speedup'))
+    rows = 100
+    while rows <= max_rows:
+        report = make_report(rows, columns)
+        legacy = measure(legacy_assign_name_scopes, report)
+        expected = collect_name_scopes(report)
+        current = measure(lambda r: r.assign_name_scopes(), report)
+        if collect_name_scopes(report) != expected:
+            raise RuntimeError('The name scopes are not identical.')
+        print('%10d %10d %12.3f %12.3f %7.2fx' %
+              (rows, rows * columns, legacy, current, legacy / current))
+        rows *= 10
+
+
+if __name__ == '__main__':
+    main()
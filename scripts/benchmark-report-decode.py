@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of decoding a large report, with and without the caches of
+`ReportTypes`.
+
+Usage:
+
+    python scripts/benchmark-report-decode.py [rows] [columns]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.split(__file__)[0], '..'))
+
+from mlcomp.report import (Report, ReportObject, ReportTypes, Table,
+                           TableCell, TableRow, Text)
+
+
+class UncachedReportTypes(ReportTypes):
+    """`ReportTypes` which resolves the types on every call."""
+
+    def name_to_type(self, name):
+        return self._resolve_name(name)
+
+    def type_to_name(self, rtype):
+        return self._resolve_type(rtype)
+
+
+def make_report(rows, columns):
+    return Report(children=[
+        Table([
+            TableRow([
+                TableCell(Text('%d,%d' % (i, j))) for j in range(columns)
+            ])
+            for i in range(rows)
+        ])
+    ])
+
+
+def benchmark(name, report_types, cnt, repeats=3):
+    best = None
+    for _ in range(repeats):
+        with report_types.as_default():
+            start_time = time.time()
+            ReportObject.from_json(cnt)
+            elapsed = time.time() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    print('%-10s %.3f sec' % (name, best))
+    return best
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    report = make_report(rows, columns)
+    report.assign_name_scopes()
+    cnt = report.to_json()
+    print('%d rows x %d columns, %d bytes of JSON' %
+          (rows, columns, len(cnt)))
+
+    uncached = benchmark('uncached', UncachedReportTypes(), cnt)
+    cached = benchmark('cached', ReportTypes(), cnt)
+    print('speedup    %.2fx' % (uncached / cached))
+
+
+if __name__ == '__main__':
+    main()
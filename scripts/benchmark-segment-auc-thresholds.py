@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of selecting the precision and recall at thresholds in
+`binary_classification_segment_auc_curve`.
+
+The legacy implementation, which scans all the curve thresholds for each
+selected threshold, is also measured, and the results of both
+implementations are checked to be identical.
+
+Usage:
+
+    python scripts/benchmark-segment-auc-thresholds.py [samples] [thresholds]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics import precision_recall_curve
+
+sys.path.insert(0, os.path.join(os.path.split(__file__)[0], '..'))
+
+from mlcomp.report import precision_recall_at_thresholds
+
+
+def legacy_precision_recall_at_thresholds(p1, r1, t1, selected_threshold):
+    selected_p = []
+    selected_r = []
+    for sel_th in selected_threshold:
+        tur_th = float("inf")
+        tur_p = 0
+        tur_r = 0
+        for index in range(len(t1)):
+            if sel_th < t1[index] < tur_th:
+                tur_th = t1[index]
+                tur_p = p1[index]
+                tur_r = r1[index]
+        selected_p.append(tur_p)
+        selected_r.append(tur_r)
+    return selected_p, selected_r
+
+
+def measure(method, *args):
+    start_time = time.time()
+    ret = method(*args)
+    return time.time() - start_time, ret
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    thresholds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rs = np.random.RandomState(1234)
+    y_true = rs.randint(0, 2, size=samples)
+    y_prob = np.clip(y_true * .3 + rs.rand(samples) * .7, 0., 1.)
+    p, r, t = precision_recall_curve(y_true, y_prob)
+    selected = np.linspace(0., 1., thresholds)
+    print('%d samples, %d curve thresholds, %d selected thresholds' %
+          (samples, len(t), thresholds))
+
+    legacy, expected = measure(
+        legacy_precision_recall_at_thresholds, p, r, t, selected)
+    current, actual = measure(precision_recall_at_thresholds,
+                              p, r, t, selected)
+    if not (np.array_equal(expected[0], actual[0]) and
+            np.array_equal(expected[1], actual[1])):
+        raise RuntimeError('The selected precision and recall are not '
+                           'identical.')
+    print('legacy     %.4f sec' % legacy)
+    print('current    %.4f sec' % current)
+    print('speedup    %.2fx' % (legacy / current))
+
+
+if __name__ == '__main__':
+    main()
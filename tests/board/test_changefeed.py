@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+import unittest
+
+from mlcomp.board.application import BoardApp
+from mlcomp.board.changefeed import StorageChangeFeed
+from mlcomp.persist import Storage
+from mlcomp.persist.storage_tree import StorageTree
+from mlcomp.utils import TemporaryDirectory, is_windows
+
+
+class _ManualClockFeed(StorageChangeFeed):
+
+    now = 1000000
+
+    def _clock(self):
+        return self.now
+
+
+class StorageChangeFeedTestCase(unittest.TestCase):
+    """Test cases for StorageChangeFeed."""
+
+    def test_feed(self):
+        with TemporaryDirectory() as tempdir:
+            tree = StorageTree(tempdir)
+            feed = _ManualClockFeed({'/x': tree}, capacity=4, skew=1.)
+            self.assertEqual(feed.seq, 1000000)
+            self.assertEqual(feed.since(1000000), (1000000, []))
+
+            # the changes of the tree should be pushed into the feed
+            feed.now = 1005000
+            Storage(os.path.join(tempdir, 'a/1'), 'create')
+            tree.update_path('a')
+            self.assertEqual(feed.since(1000000), (1005000, ['x/a']))
+
+            # the changes within `skew` seconds should be reported again
+            feed.now = 1010000
+            self.assertEqual(feed.since(1005000), (1010000, ['x/a']))
+            self.assertEqual(feed.since(1006000), (1010000, []))
+
+            # the stamps should be strictly increasing, and the paths
+            # under other changed paths should be omitted
+            self.assertEqual(feed.push('x/b/1'), 1010000)
+            self.assertEqual(feed.push('x/a/1'), 1010001)
+            self.assertEqual(feed.push('x/a-b'), 1010002)
+            self.assertEqual(feed.since(1000000),
+                             (1010002, ['x/a', 'x/a-b', 'x/b/1']))
+            self.assertEqual(feed.since(1011000),
+                             (1011000, ['x/a-b', 'x/a/1']))
+
+            # the discarded changes, as well as the changes before the
+            # feed is created, should result in None
+            feed.push('x/c')
+            self.assertEqual(feed.since(1005000), (1010003, None))
+            self.assertEqual(feed.since(1006000), (1010003, [
+                'x/a-b', 'x/a/1', 'x/b/1', 'x/c']))
+            self.assertEqual(feed.since(999999), (1010003, None))
+
+            # test waiting for new changes
+            def push_later():
+                time.sleep(0.1)
+                feed.now = 1020001
+                feed.push('')
+
+            thread = threading.Thread(target=push_later)
+            thread.start()
+            try:
+                self.assertEqual(feed.since(1020000, timeout=10),
+                                 (1020001, ['']))
+            finally:
+                thread.join()
+            start_time = time.time()
+            self.assertEqual(feed.since(1030000, timeout=0.1), (1030000, []))
+            self.assertGreaterEqual(time.time() - start_time, 0.09)
+
+    def test_feed_id(self):
+        with TemporaryDirectory() as tempdir:
+            os.makedirs(os.path.join(tempdir, 'a'))
+            os.makedirs(os.path.join(tempdir, 'b'))
+            trees = {'/a': StorageTree(os.path.join(tempdir, 'a')),
+                     '/b': StorageTree(os.path.join(tempdir, 'b'))}
+
+            # feeds of the same trees (e.g., in different worker processes)
+            # should have the same ID
+            feed = StorageChangeFeed(trees)
+            self.assertEqual(StorageChangeFeed(trees).feed_id, feed.feed_id)
+            self.assertEqual(
+                StorageChangeFeed({
+                    '/b': StorageTree(os.path.join(tempdir, 'b')),
+                    '/a': StorageTree(os.path.join(tempdir, 'a'))
+                }).feed_id,
+                feed.feed_id
+            )
+            self.assertNotEqual(
+                StorageChangeFeed({'/a': trees['/a']}).feed_id, feed.feed_id)
+            self.assertNotEqual(
+                StorageChangeFeed({'/a': trees['/b'], '/b': trees['/a']})
+                .feed_id,
+                feed.feed_id
+            )
+
+    @unittest.skipIf(is_windows(), 'MLComp Board does not support Windows yet.')
+    def test_api(self):
+        with TemporaryDirectory() as tempdir:
+            Storage(os.path.join(tempdir, 'a/1'), 'create')
+            app = BoardApp({'/': tempdir}, disable_watcher=True)
+            with app.test_client() as c:
+                def get(**kwargs):
+                    rv = c.get('/_api/changes', query_string=kwargs)
+                    self.assertEqual(rv.status_code, 200)
+                    return json.loads(rv.data.decode('utf-8'))
+
+                cnt = get()
+                self.assertTrue(cnt['reset'])
+                self.assertEqual(cnt['changes'], [])
+                feed, seq = cnt['feed'], cnt['seq']
+
+                cnt = get(feed=feed, since=seq)
+                self.assertFalse(cnt['reset'])
+                self.assertEqual(cnt['changes'], [])
+
+                Storage(os.path.join(tempdir, 'a/2'), 'create')
+                app.trees[''].update_path('a/2')
+                app.trees[''].remove_path('a/1')
+                cnt = get(feed=feed, since=seq)
+                self.assertFalse(cnt['reset'])
+                self.assertEqual(
+                    [(i['path'], [s['path'] for s in i['storage']])
+                     for i in cnt['changes']],
+                    [('a/1', []), ('a/2', ['a/2'])]
+                )
+                self.assertGreater(cnt['seq'], seq)
+
+                # a feed ID of another process should result in reset
+                cnt = get(feed='another', since=seq)
+                self.assertTrue(cnt['reset'])
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import unittest
+
+from mlcomp.board.application import BoardApp
+from mlcomp.board.listing import StorageListing, encode_cursor
+from mlcomp.persist import Storage
+from mlcomp.persist.storage import STORAGE_RUNNING_STATUS
+from mlcomp.persist.storage_status import StorageRunningStatus
+from mlcomp.persist.storage_tree import StorageTree
+from mlcomp.utils import TemporaryDirectory, is_windows
+
+
+class StorageListingTestCase(unittest.TestCase):
+    """Test cases for StorageListing."""
+
+    def populate(self, tempdir):
+        names = ['a/1', 'a/2', 'a/10', 'a-b', 'b/1', 'b/2', 'c']
+        for i, name in enumerate(names):
+            s = Storage(os.path.join(tempdir, name), 'create')
+            with s._meta.modify_context():
+                s._meta.values['create_time'] = 1000. + i
+            if name.startswith('a/'):
+                s.tags.add('a')
+            if name in ('a/2', 'b/2'):
+                s.tags.add('x')
+                s.has_error = True
+        StorageRunningStatus.generate().save_file(
+            os.path.join(tempdir, 'c', STORAGE_RUNNING_STATUS))
+        return names
+
+    def query_all(self, listing, limit=2, **kwargs):
+        ret = []
+        cursor = None
+        while True:
+            items, cursor = listing.query(limit=limit, cursor=cursor, **kwargs)
+            self.assertLessEqual(len(items), limit)
+            ret.extend(i['path'] for i in items)
+            if cursor is None:
+                break
+        return ret
+
+    def test_query(self):
+        with TemporaryDirectory() as tempdir:
+            names = self.populate(tempdir)
+            tree = StorageTree(tempdir, lazy=True)
+            listing = StorageListing({'/': tree})
+            self.assertEqual(len(listing), 7)
+
+            # test sorting and pagination
+            self.assertEqual(self.query_all(listing), sorted(names))
+            self.assertEqual(self.query_all(listing, reverse=True),
+                             sorted(names, reverse=True))
+            self.assertEqual(self.query_all(listing, sort_by='create_time'),
+                             names)
+            self.assertEqual(
+                self.query_all(listing, sort_by='create_time', reverse=True),
+                list(reversed(names))
+            )
+            items, cursor = listing.query(limit=7)
+            self.assertEqual(len(items), 7)
+            self.assertIsNone(cursor)
+            self.assertEqual(items[-1]['path'], 'c')
+            self.assertTrue(items[-1]['is_active'])
+            self.assertFalse(items[0]['is_active'])
+
+            # test the filters
+            self.assertEqual(self.query_all(listing, prefix='a'),
+                             ['a/1', 'a/10', 'a/2'])
+            self.assertEqual(self.query_all(listing, prefix='/a/1/'), ['a/1'])
+            self.assertEqual(
+                self.query_all(listing, prefix='a', sort_by='create_time',
+                               reverse=True),
+                ['a/10', 'a/2', 'a/1']
+            )
+            self.assertEqual(self.query_all(listing, tags=['a']),
+                             ['a/1', 'a/10', 'a/2'])
+            self.assertEqual(self.query_all(listing, tags=['a', 'x']),
+                             ['a/2'])
+            self.assertEqual(self.query_all(listing, tags=['y']), [])
+            self.assertEqual(self.query_all(listing, has_error=True),
+                             ['a/2', 'b/2'])
+            self.assertEqual(
+                self.query_all(listing, has_error=False, tags=['a']),
+                ['a/1', 'a/10']
+            )
+            self.assertEqual(self.query_all(listing, is_active=True), ['c'])
+            self.assertEqual(
+                self.query_all(listing, create_time=(1002., 1005.)),
+                ['a-b', 'a/10', 'b/1']
+            )
+            self.assertEqual(
+                self.query_all(listing, create_time=(None, 1002.),
+                               sort_by='create_time', reverse=True),
+                ['a/2', 'a/1']
+            )
+
+            # test invalid arguments
+            with self.assertRaises(ValueError):
+                listing.query(sort_by='name')
+            with self.assertRaises(ValueError):
+                listing.query(cursor='not a cursor')
+            cursor = listing.query(limit=1)[1]
+            with self.assertRaises(ValueError):
+                listing.query(sort_by='create_time', cursor=cursor)
+            for key in ([None, 'a/1'], [[1], 'a/1'], [True, 'a/1']):
+                with self.assertRaises(ValueError):
+                    listing.query(sort_by='create_time',
+                                  cursor=encode_cursor(key))
+
+            # test the changes of the tree
+            Storage(os.path.join(tempdir, 'a/3'), 'create').tags.add('a')
+            tree.update_path('a/3')
+            s = Storage(os.path.join(tempdir, 'a/1'), 'write')
+            s.tags.remove('a')
+            tree.reload_storage('a/1')
+            tree.remove_path('b')
+            self.assertEqual(self.query_all(listing, tags=['a']),
+                             ['a/10', 'a/2', 'a/3'])
+            self.assertEqual(self.query_all(listing),
+                             ['a-b', 'a/1', 'a/10', 'a/2', 'a/3', 'c'])
+
+            # reloading the whole tree should keep the unchanged records
+            records = dict(listing._records)
+            s = Storage(os.path.join(tempdir, 'a/2'), 'write')
+            s.description = 'changed'
+            tree.update_path('')
+            self.assertEqual(len(listing), 8)
+            for k in ('a-b', 'a/1', 'a/10', 'a/3'):
+                self.assertIs(listing._records[k], records[k])
+            self.assertIsNot(listing._records['a/2'], records['a/2'])
+            self.assertEqual(
+                listing.list_prefix('a/2')[0]['description'], 'changed')
+
+    @unittest.skipIf(is_windows(), 'MLComp Board does not support Windows yet.')
+    def test_api(self):
+        with TemporaryDirectory() as tempdir:
+            self.populate(tempdir)
+            app = BoardApp({'/': os.path.join(tempdir, 'a'),
+                            '/b': os.path.join(tempdir, 'b')},
+                           disable_watcher=True)
+            with app.test_client() as c:
+                def get(**kwargs):
+                    rv = c.get('/_api/list', query_string=kwargs)
+                    self.assertEqual(rv.status_code, 200)
+                    return json.loads(rv.data.decode('utf-8'))
+
+                cnt = get(limit=3)
+                self.assertEqual([i['path'] for i in cnt['items']],
+                                 ['1', '10', '2'])
+                cnt = get(limit=3, cursor=cnt['next_cursor'])
+                self.assertEqual([i['path'] for i in cnt['items']],
+                                 ['b/1', 'b/2'])
+                self.assertIsNone(cnt['next_cursor'])
+
+                cnt = get(sort='-create_time', has_error='true')
+                self.assertEqual([i['path'] for i in cnt['items']],
+                                 ['b/2', '2'])
+                cnt = get(tag='x', prefix='b')
+                self.assertEqual([i['path'] for i in cnt['items']], ['b/2'])
+
+                rv = c.get('/_api/list', query_string={'sort': 'name'})
+                self.assertEqual(rv.status_code, 400)
+                rv = c.get('/_api/list', query_string={'is_active': 'maybe'})
+                self.assertEqual(rv.status_code, 400)
+                rv = c.get('/_api/list', query_string={
+                    'sort': 'create_time',
+                    'cursor': encode_cursor([None, '1'])
+                })
+                self.assertEqual(rv.status_code, 400)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import time
+import unittest
+
+from mlcomp.board.application import BoardApp
+from mlcomp.board.snapshot import StorageSnapshot
+from mlcomp.persist import Storage
+from mlcomp.persist.storage import (STORAGE_RUNNING_STATUS,
+                                   STORAGE_RUNNING_STATUS_INTERVAL)
+from mlcomp.persist.storage_status import StorageRunningStatus
+from mlcomp.persist.storage_tree import StorageTree
+from mlcomp.utils import TemporaryDirectory, is_windows
+
+
+class StorageSnapshotTestCase(unittest.TestCase):
+    """Test cases for StorageSnapshot."""
+
+    def test_snapshot(self):
+        with TemporaryDirectory() as tempdir:
+            for name in ['a/1', 'a/2', 'b']:
+                Storage(os.path.join(tempdir, name), 'create')
+            tree = StorageTree(tempdir, lazy=True)
+            snapshot = StorageSnapshot({'': tree})
+
+            # test the content of the snapshot
+            etag, cnt = snapshot.get()
+            data = json.loads(cnt.decode('utf-8'))
+            self.assertEqual([k for k, v in data], ['a', 'b'])
+            self.assertEqual([k for k, v in data[0][1]], ['1', '2'])
+            self.assertEqual(data[0][1][0][1]['name'], '1')
+
+            # unchanged snapshot should not be rebuilt
+            self.assertIs(snapshot.get()[1], cnt)
+
+            # the cached fragments should be invalidated by changes of the
+            # tree, while the fragments of other subtrees are kept
+            fragments = {k: snapshot._get_node(k).fragment
+                         for k in ('a', 'a/2', 'b')}
+            s = Storage(os.path.join(tempdir, 'a/1'), 'write')
+            s.description = 'hello'
+            self.assertIs(snapshot.get()[1], cnt)
+            tree.reload_storage('a/1')
+            etag2, cnt2 = snapshot.get()
+            self.assertNotEqual(etag2, etag)
+            data = json.loads(cnt2.decode('utf-8'))
+            self.assertEqual(data[0][1][0][1]['description'], 'hello')
+            self.assertIsNot(snapshot._get_node('a').fragment, fragments['a'])
+            for k in ('a/2', 'b'):
+                self.assertIs(snapshot._get_node(k).fragment, fragments[k])
+
+            # removed storage should be removed from the snapshot
+            tree.remove_path('a/2')
+            data = json.loads(snapshot.get()[1].decode('utf-8'))
+            self.assertEqual([k for k, v in data[0][1]], ['1'])
+            self.assertIsNone(snapshot._get_node('a/2'))
+            tree.update_path('a/2')
+
+            Storage(os.path.join(tempdir, 'c'), 'create')
+            tree.update_path('c')
+            data = json.loads(snapshot.get()[1].decode('utf-8'))
+            self.assertEqual([k for k, v in data], ['a', 'b', 'c'])
+
+            # unchanged content should result in the same etag
+            tree.set_reload('a')
+            etag3, cnt3 = snapshot.get()
+            tree.set_reload('a')
+            self.assertEqual(snapshot.get()[0], etag3)
+
+            # the snapshot should expire when a storage becomes inactive
+            StorageRunningStatus.generate().save_file(
+                s.resolve_path(STORAGE_RUNNING_STATUS))
+            tree.reload_storage('a/1')
+            self.assertTrue(json.loads(
+                snapshot.get()[1].decode('utf-8'))[0][1][0][1]['is_active'])
+            t = time.time() + STORAGE_RUNNING_STATUS_INTERVAL * 3
+            self.assertEqual(snapshot._expiry[0][1], '/a/1')
+            self.assertLess(snapshot._expiry[0][0], t)
+
+    @unittest.skipIf(is_windows(), 'MLComp Board does not support Windows yet.')
+    def test_etag(self):
+        with TemporaryDirectory() as tempdir:
+            Storage(os.path.join(tempdir, '1'), 'create')
+            app = BoardApp({'/': tempdir}, disable_watcher=True)
+            with app.test_client() as c:
+                rv = c.get('/_api/all')
+                self.assertEqual(rv.status_code, 200)
+                etag = rv.headers['ETag']
+                self.assertTrue(etag)
+                rv = c.get('/_api/all', headers={'If-None-Match': etag})
+                self.assertEqual(rv.status_code, 304)
+
+                # changes of the tree should result in a new etag
+                Storage(os.path.join(tempdir, '2'), 'create')
+                app.trees[''].update_path('2')
+                rv = c.get('/_api/all', headers={'If-None-Match': etag})
+                self.assertEqual(rv.status_code, 200)
+                self.assertNotEqual(rv.headers['ETag'], etag)
+                self.assertEqual(
+                    [k for k, v in json.loads(rv.data.decode('utf-8'))],
+                    ['1', '2']
+                )
@@ -3,11 +3,13 @@ import codecs
 import json
 import os
 import unittest
+import zlib
 
 import six
 
 from mlcomp.board.application import BoardApp
 from mlcomp.persist import Storage
+from mlcomp.report import Group, Resource
 from mlcomp.utils import TemporaryDirectory, is_windows
 
 
@@ -146,3 +148,94 @@ class ViewsTestCase(unittest.TestCase):
                 self.assertIsInstance(cnt, dict)
                 self.assertIn('create_time', cnt)
                 self.assertIn('update_time', cnt)
+
+    @unittest.skipIf(is_windows(), 'MLComp Board does not support Windows yet.')
+    def test_compressed_resources(self):
+        with TemporaryDirectory() as tempdir:
+            s = Storage(os.path.join(tempdir, 's'), mode='create')
+            s.save_report(Group([
+                Resource(b'123', extension='.txt', name='gzip',
+                         gzip_compress=True),
+                Resource(b'456', extension='.txt', name='zlib',
+                         compression='zlib', compression_level=1),
+                Resource(b'789', extension='.txt', name='lzma',
+                         compression='lzma'),
+            ]))
+            self.assertTrue(os.path.isfile(
+                s.resolve_path('report/default/res/group/zlib.txt.zz')))
+            app = BoardApp({'/': tempdir})
+
+            with app.test_client() as c:
+                def get(name, accept_encoding=None):
+                    headers = {}
+                    if accept_encoding:
+                        headers['Accept-Encoding'] = accept_encoding
+                    rv = c.get('/s/s/report/default/res/group/%s.txt' % name,
+                               headers=headers)
+                    self.assertEqual(rv.status_code, 200)
+                    self.assertEqual(rv.mimetype, 'text/plain')
+                    return rv.headers.get('Content-Encoding'), rv.data
+
+                self.assertEqual(get('gzip')[0], 'gzip')
+                self.assertEqual(
+                    get('zlib', 'gzip, deflate'),
+                    ('deflate', zlib.compress(b'456', 1))
+                )
+                self.assertEqual(get('zlib', 'gzip'), (None, b'456'))
+                self.assertEqual(get('lzma', 'gzip, deflate'), (None, b'789'))
+                rv = c.get('/s/s/report/default/res/group/none.txt')
+                self.assertEqual(rv.status_code, 404)
+
+    @unittest.skipIf(is_windows(), 'MLComp Board does not support Windows yet.')
+    def test_metrics_log(self):
+        with TemporaryDirectory() as tempdir:
+            s = Storage(os.path.join(tempdir, 's'), mode='create')
+            with s.open_metrics_log() as w:
+                w.write(1, loss=2.)
+                w.write(2, loss=1.)
+            app = BoardApp({'/': tempdir})
+
+            with app.test_client() as c:
+                rv = c.get('/s/s/metrics/default.jsonl?offset=0')
+                self.assertEqual(rv.status_code, 200)
+                payload = json.loads(rv.data.decode('utf-8'))
+                self.assertEqual(
+                    payload['records'],
+                    [{'step': 1, 'loss': 2.}, {'step': 2, 'loss': 1.}]
+                )
+
+                with s.open_metrics_log() as w:
+                    w.write(3, loss=.5)
+                rv = c.get('/s/s/metrics/default.jsonl?offset=%d' %
+                           payload['offset'])
+                self.assertEqual(
+                    json.loads(rv.data.decode('utf-8'))['records'],
+                    [{'step': 3, 'loss': .5}]
+                )
+
+                rv = c.get('/s/s/metrics/default.jsonl')
+                self.assertEqual(rv.status_code, 200)
+                self.assertEqual(len(rv.data.splitlines()), 3)
+                rv = c.get('/s/s/metrics/default.jsonl?offset=x')
+                self.assertEqual(rv.status_code, 400)
+                rv = c.get('/s/s/metrics/none.jsonl?offset=0')
+                self.assertEqual(rv.status_code, 404)
+
+    @unittest.skipIf(is_windows(), 'MLComp Board does not support Windows yet.')
+    def test_watcher_stats(self):
+        with TemporaryDirectory() as tempdir:
+            app = BoardApp({'/': tempdir}, disable_watcher=True)
+            with app.test_client() as c:
+                rv = c.get('/_api/watcher')
+                self.assertEqual(rv.status_code, 200)
+                self.assertIsNone(json.loads(rv.data.decode('utf-8')))
+
+            app = BoardApp({'/': tempdir}, coalesce_window=2.5)
+            with app.test_client() as c:
+                rv = c.get('/_api/watcher')
+                self.assertEqual(rv.status_code, 200)
+                stats = json.loads(rv.data.decode('utf-8'))
+                self.assertEqual(stats['coalesce_window'], 2.5)
+                self.assertEqual(stats['pending'], 0)
+                for k in ('received', 'dropped', 'coalesced', 'applied'):
+                    self.assertIn(k, stats)
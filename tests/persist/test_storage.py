@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 import codecs
+import json
 import os
+import shutil
 import time
 import unittest
 
 from mlcomp.persist import Storage, StorageReadOnlyError
-from mlcomp.persist.storage import STORAGE_META_FILE, STORAGE_RUNNING_STATUS
-from mlcomp.report import Text
+from mlcomp.persist.storage import (STORAGE_META_FILE, STORAGE_RUNNING_STATUS,
+                                   STORAGE_REPORT_BLOB_DIR)
+from mlcomp.persist.storage_status import StorageRunningStatus
+from mlcomp.report import Attachment, Group, Report, Text
 from mlcomp.utils import TemporaryDirectory
 
 
@@ -104,6 +108,93 @@ class StorageTestCase(unittest.TestCase):
             s1.reload()
             self.assertIsNone(s1.running_status)
 
+    def test_batch_update(self):
+        with TemporaryDirectory() as tempdir:
+            s_path = os.path.join(tempdir, 'a')
+            s1 = Storage(s_path, mode='create')
+            s_meta_file = os.path.join(s_path, STORAGE_META_FILE)
+            old_meta = readfile(s_meta_file)
+
+            # the modifications should be written once after the context
+            with s1.batch_update():
+                s1.description = 'description'
+                s1.tags.add('tag1')
+                s1.tags.add('tag2')
+                with s1.batch_update():
+                    s1.tags.remove('tag1')
+                self.assertEqual(readfile(s_meta_file), old_meta)
+            self.assertEqual(os.listdir(s_path), [STORAGE_META_FILE])
+            s2 = Storage(s_path, mode='read')
+            self.assertEqual(s2.description, 'description')
+            self.assertEqual(s2.tags, ['tag2'])
+
+            # the modifications should be discarded on error
+            old_meta = readfile(s_meta_file)
+            tags = s1.tags
+            with self.assertRaises(ValueError):
+                with s1.batch_update():
+                    s1.description = 'description2'
+                    s1.tags.add('tag3')
+                    raise ValueError()
+            self.assertEqual(readfile(s_meta_file), old_meta)
+            self.assertEqual(s1.description, 'description')
+            self.assertEqual(s1.tags, ['tag2'])
+            self.assertIs(s1.tags, tags)
+            tags.add('tag4')
+            self.assertEqual(Storage(s_path, mode='read').tags,
+                             ['tag2', 'tag4'])
+
+            with self.assertRaises(StorageReadOnlyError):
+                with s2.batch_update():
+                    pass
+
+    def test_conditional_reload(self):
+        with TemporaryDirectory() as tempdir:
+            s_path = os.path.join(tempdir, 'a')
+            s1 = Storage(s_path, mode='create')
+            s1.description = 'desc1'
+            s_meta_file = os.path.join(s_path, STORAGE_META_FILE)
+            status_file = os.path.join(s_path, STORAGE_RUNNING_STATUS)
+
+            def backdate(path):
+                st = os.stat(path)
+                os.utime(path, (st.st_atime, st.st_mtime - 60))
+
+            # recently modified files should always be parsed
+            s2 = Storage(s_path, mode='read')
+            self.assertFalse(s2.reload())
+            writefile(s_meta_file, readfile(s_meta_file).replace(
+                'desc1', 'desc2'))
+            self.assertTrue(s2.reload())
+            self.assertEqual(s2.description, 'desc2')
+
+            # the files should not be parsed if the signatures are unchanged
+            backdate(s_meta_file)
+            self.assertTrue(s1.reload())
+            self.assertEqual(s1.description, 'desc2')
+            st = os.stat(s_meta_file)
+            writefile(s_meta_file, readfile(s_meta_file).replace(
+                'desc2', 'desc3'))
+            os.utime(s_meta_file, (st.st_atime, st.st_mtime))
+            self.assertFalse(s1.reload())
+            self.assertEqual(s1.description, 'desc2')
+            os.utime(s_meta_file, (st.st_atime, st.st_mtime + 1))
+            self.assertTrue(s1.reload())
+            self.assertEqual(s1.description, 'desc3')
+
+            # test the running status
+            status = StorageRunningStatus.generate()
+            status.save_file(status_file)
+            backdate(status_file)
+            self.assertTrue(s1.reload())
+            self.assertEqual(s1.running_status, status)
+            self.assertFalse(s1.running_status != status)
+            self.assertFalse(s1.reload())
+            os.remove(status_file)
+            self.assertTrue(s1.reload())
+            self.assertIsNone(s1.running_status)
+            self.assertFalse(s1.reload())
+
     def test_save_script(self):
         with TemporaryDirectory() as tempdir:
             s = Storage(os.path.join(tempdir, 's'), mode='create')
@@ -252,5 +343,132 @@ class StorageTestCase(unittest.TestCase):
             )
             self.assertEqual(s.list_reports(), ['default', 'test'])
 
+    def test_save_report_deduplicate(self):
+        with TemporaryDirectory() as tempdir:
+            s = Storage(os.path.join(tempdir, 's'), mode='create')
+            for name in ('a', 'b'):
+                s.save_report(Attachment(b'123', extension='.txt'),
+                              dir_name=name, deduplicate=True)
+            st_a = os.stat(s.resolve_path('report/a/res/attachment.txt'))
+            st_b = os.stat(s.resolve_path('report/b/res/attachment.txt'))
+            self.assertEqual(st_a.st_ino, st_b.st_ino)
+            self.assertEqual(st_a.st_nlink, 3)
+            self.assertEqual(s.list_reports(), ['a', 'b'])
+            self.assertEqual(
+                Report.load(s.resolve_path('report/b')).data, b'123')
+            with self.assertRaises(ValueError):
+                s.save_report(Text('hello'), dir_name=STORAGE_REPORT_BLOB_DIR)
+
+    def test_collect_report_blobs(self):
+        with TemporaryDirectory() as tempdir:
+            s = Storage(os.path.join(tempdir, 's'), mode='create')
+            blob_dir = s.resolve_path('report', STORAGE_REPORT_BLOB_DIR)
+
+            def list_blobs():
+                return sorted(
+                    name
+                    for sub_name in os.listdir(blob_dir)
+                    for name in os.listdir(os.path.join(blob_dir, sub_name))
+                )
+
+            for name in ('a', 'b'):
+                s.save_report(Attachment(b'123', extension='.txt'),
+                              dir_name=name, deduplicate=True)
+            self.assertEqual(len(list_blobs()), 1)
+
+            # overwriting a report should remove its unused blobs,
+            # including those of its stale resources
+            s.save_report(Attachment(b'456', extension='.txt'),
+                          dir_name='a', overwrite=True, deduplicate=True)
+            self.assertEqual(len(list_blobs()), 2)
+            s.save_report(Group([Attachment(b'789', extension='.txt')]),
+                          dir_name='a', overwrite=True, deduplicate=True)
+            blobs = list_blobs()
+            self.assertEqual(len(blobs), 2)
+            self.assertEqual(
+                Report.load(s.resolve_path('report/a')).children[0].data,
+                b'789'
+            )
+            self.assertEqual(
+                Report.load(s.resolve_path('report/b')).data, b'123')
+
+            # removing a report should leave its blobs to be collected
+            shutil.rmtree(s.resolve_path('report/b'))
+            self.assertEqual(s.collect_report_blobs(), 1)
+            self.assertEqual(len(list_blobs()), 1)
+            self.assertEqual(s.collect_report_blobs(), 0)
+
+            # the collected blobs should be written again when needed
+            shutil.rmtree(s.resolve_path('report/a'))
+            self.assertEqual(s.collect_report_blobs(), 1)
+            self.assertEqual(os.listdir(blob_dir), [])
+            s.save_report(Attachment(b'123', extension='.txt'),
+                          dir_name='c', deduplicate=True)
+            self.assertEqual(len(list_blobs()), 1)
+
+    def test_metrics_log(self):
+        with TemporaryDirectory() as tempdir:
+            s = Storage(os.path.join(tempdir, 's'), mode='create')
+            self.assertEqual(s.list_metrics_logs(), [])
+            reader = s.metrics_log_reader('train')
+            self.assertEqual(reader.update(), 0)
+
+            with s.open_metrics_log('train') as w:
+                w.write(1, loss=3., acc=.1)
+                w.write(2, loss=2.)
+                self.assertEqual(reader.update(), 0)
+                w.flush()
+                self.assertEqual(reader.update(), 2)
+                w.write(3, loss=1., acc=.5)
+            self.assertEqual(s.list_metrics_logs(), ['train'])
+            self.assertEqual(reader.update(), 1)
+            self.assertEqual(reader.names, ['acc', 'loss'])
+            steps, values = reader.get('loss')
+            self.assertEqual(steps.tolist(), [1, 2, 3])
+            self.assertEqual(values.tolist(), [3., 2., 1.])
+            steps, values = reader.get('acc')
+            self.assertEqual(steps.tolist(), [1, 3])
+            self.assertEqual(values.tolist(), [.1, .5])
+
+            # test the incomplete record is not consumed
+            with open(s.resolve_path('metrics/train.jsonl'), 'ab') as f:
+                f.write(b'{"step": 4, "lo')
+            self.assertEqual(reader.update(), 0)
+            with open(s.resolve_path('metrics/train.jsonl'), 'ab') as f:
+                f.write(b'ss": 0.5}\n')
+            self.assertEqual(reader.update(), 1)
+            self.assertEqual(reader.get('loss')[1].tolist(), [3., 2., 1., .5])
+
+            # test the log left by a crashed writer
+            with open(s.resolve_path('metrics/train.jsonl'), 'ab') as f:
+                f.write(b'not a record\n{"step": 5, "lo')
+            with s.open_metrics_log('train') as w:
+                w.write(6, loss=.25)
+            self.assertEqual(reader.update(), 1)
+            self.assertEqual(reader.get('loss')[0].tolist(), [1, 2, 3, 4, 6])
+            reader2 = s.metrics_log_reader('train')
+            self.assertEqual(reader2.update(), 5)
+            self.assertEqual(reader2.get('loss')[1].tolist(),
+                             [3., 2., 1., .5, .25])
+
+            # test building the chart
+            r = reader.loss_accuracy_curve(['loss'], ['acc'])
+            data = json.loads(r.data.data.decode('utf-8'))['data']
+            self.assertEqual([d['name'] for d in data], ['loss', 'acc'])
+            self.assertEqual(len(data[0]['dataPoints']), 5)
+
+            # test errors
+            with self.assertRaises(KeyError):
+                reader.get('none')
+            with self.assertRaises(ValueError):
+                s.open_metrics_log('a/b')
+            with s.open_metrics_log('train') as w:
+                pass
+            self.assertTrue(w.closed)
+            with self.assertRaises(IOError):
+                w.write(5, loss=1.)
+            with self.assertRaises(StorageReadOnlyError):
+                Storage(s.path, mode='read').open_metrics_log('train')
+
 if __name__ == '__main__':
     unittest.main()
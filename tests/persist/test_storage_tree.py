@@ -86,3 +86,322 @@ class StorageTreeTestCase(unittest.TestCase):
                 [k for k, v in tree.iter_storage()],
                 ['0/1', '1/0', '1/1']
             )
+
+    def test_lazy_tree(self):
+        """Test the tree with lazily constructed storage objects."""
+        with TemporaryDirectory() as tempdir:
+            self.populate_tree(tempdir, 2, width=2)
+            tree = StorageTree(tempdir, lazy=True)
+            nodes = [
+                tree.root.children[a].children[b]
+                for a in ('0', '1') for b in ('0', '1')
+            ]
+            for node in nodes:
+                self.assertTrue(node.is_storage)
+                self.assertIsNone(node._storage)
+            self.assertFalse(tree.root.is_storage)
+
+            # only the storage being found should be constructed
+            s, path = tree.find_storage('0/1/files/a.txt')
+            self.assertEqual(path, '0/1')
+            self.assertTrue(os.path.samefile(
+                s.path, os.path.join(tempdir, '0/1')))
+            self.assertEqual(
+                [n._storage is not None for n in nodes],
+                [False, True, False, False]
+            )
+            self.assertIs(tree.find_storage('0/1')[0], s)
+
+            # reloading should drop the constructed storage object
+            s2 = Storage(os.path.join(tempdir, '0/1'), 'write')
+            s2.description = '0/1 description'
+            tree.set_reload('0/1')
+            self.assertTrue(nodes[1].is_storage)
+            self.assertIsNone(nodes[1]._storage)
+            self.assertEqual(tree.find_storage('0/1')[0].description,
+                             '0/1 description')
+
+            # iterating through the storage should construct them all
+            self.assertEqual(
+                [k for k, v in tree.iter_storage()],
+                ['0/0', '0/1', '1/0', '1/1']
+            )
+            for node in nodes:
+                self.assertIsNotNone(node._storage)
+
+            # a storage removed before being constructed should be
+            # left unloaded
+            tree = StorageTree(tempdir, lazy=True)
+            os.remove(os.path.join(tempdir, '1/1/storage.json'))
+            self.assertIsNone(tree.find_storage('1/1'))
+            self.assertTrue(tree.root.children['1'].children['1'].is_storage)
+
+    def test_incremental_update(self):
+        """Test the incremental updates of a tree."""
+        with TemporaryDirectory() as tempdir:
+            self.populate_tree(tempdir, 2, width=2)
+            tree = StorageTree(tempdir)
+            storage_list = lambda: [k for k, v in tree.iter_storage()]
+            old_children = tree.root.children
+            old_storage = tree.find_storage('0/1')[0]
+
+            # test to add a storage, as well as the intermediate nodes
+            Storage(os.path.join(tempdir, '2/0/0'), 'create')
+            self.assertTrue(tree.update_path('2/0/0'))
+            self.assertEqual(storage_list(),
+                             ['0/0', '0/1', '1/0', '1/1', '2/0/0'])
+            # the old children dict should not be changed in place
+            self.assertEqual(list(old_children), ['0', '1'])
+            # the other nodes should not be reloaded
+            self.assertIs(tree.find_storage('0/1')[0], old_storage)
+
+            # test to add a directory with storage inside
+            Storage(os.path.join(tempdir, '2/1/0'), 'create')
+            Storage(os.path.join(tempdir, '2/1/1'), 'create')
+            self.assertTrue(tree.update_path('2/1'))
+            self.assertEqual(
+                storage_list(),
+                ['0/0', '0/1', '1/0', '1/1', '2/0/0', '2/1/0', '2/1/1']
+            )
+
+            # test to add a directory without storage
+            os.makedirs(os.path.join(tempdir, '3/0'))
+            self.assertFalse(tree.update_path('3/0'))
+            self.assertNotIn('3', tree.root.children)
+
+            # paths inside a storage should be ignored
+            os.makedirs(os.path.join(tempdir, '0/0/report/0'))
+            Storage(os.path.join(tempdir, '0/0/report/1'), 'create')
+            self.assertFalse(tree.update_path('0/0/report'))
+            self.assertFalse(tree.update_path('0/0/report/1'))
+            self.assertFalse(tree.remove_path('0/0/report/1'))
+            self.assertFalse(tree.reload_storage('0/0/report/1'))
+            self.assertEqual(
+                storage_list(),
+                ['0/0', '0/1', '1/0', '1/1', '2/0/0', '2/1/0', '2/1/1']
+            )
+
+            # test to reload a storage
+            s = Storage(os.path.join(tempdir, '0/1'), 'write')
+            s.description = '0/1 description'
+            self.assertFalse(tree.reload_storage('0/1'))
+            self.assertIs(tree.find_storage('0/1')[0], old_storage)
+            self.assertEqual(old_storage.description, '0/1 description')
+
+            # test to remove storage, and the empty intermediate nodes
+            shutil.rmtree(os.path.join(tempdir, '2/0'))
+            self.assertTrue(tree.remove_path('2/0/0'))
+            self.assertFalse(tree.remove_path('2/0'))
+            self.assertEqual(
+                storage_list(),
+                ['0/0', '0/1', '1/0', '1/1', '2/1/0', '2/1/1']
+            )
+            shutil.rmtree(os.path.join(tempdir, '2'))
+            self.assertTrue(tree.remove_path('2'))
+            self.assertEqual(storage_list(), ['0/0', '0/1', '1/0', '1/1'])
+            self.assertNotIn('2', tree.root.children)
+
+            # test a directory which ceases to be a storage
+            os.remove(os.path.join(tempdir, '1/1/storage.json'))
+            self.assertTrue(tree.update_path('1/1'))
+            self.assertEqual(storage_list(), ['0/0', '0/1', '1/0'])
+
+    def test_file_event_handler(self):
+        """Test the file system event handler."""
+        from watchdog.events import (DirCreatedEvent, DirDeletedEvent,
+                                     DirMovedEvent, FileCreatedEvent,
+                                     FileDeletedEvent, FileModifiedEvent,
+                                     FileMovedEvent)
+        from mlcomp.persist.storage_tree import StorageTreeFileEventHandler
+
+        with TemporaryDirectory() as tempdir:
+            self.populate_tree(tempdir, 2, width=2)
+            tree = StorageTree(tempdir)
+            handler = StorageTreeFileEventHandler(tree)
+            storage_list = lambda: [k for k, v in tree.iter_storage()]
+            p = lambda s: os.path.join(tempdir, s)
+
+            # test created storage
+            Storage(p('2/0'), 'create')
+            handler.dispatch(DirCreatedEvent(p('2')))
+            self.assertEqual(storage_list(),
+                             ['0/0', '0/1', '1/0', '1/1', '2/0'])
+
+            # test storage.json created after the directory
+            os.makedirs(p('2/1'))
+            handler.dispatch(DirCreatedEvent(p('2/1')))
+            self.assertNotIn('1', tree.root.children['2'].children)
+            Storage(p('2/1/a'), 'create')
+            os.rename(p('2/1/a/storage.json'), p('2/1/storage.json'))
+            os.rmdir(p('2/1/a'))
+            handler.dispatch(FileCreatedEvent(p('2/1/storage.json')))
+            self.assertEqual(storage_list(),
+                             ['0/0', '0/1', '1/0', '1/1', '2/0', '2/1'])
+
+            # test modified storage.json, as well as irrelevant files
+            old_storage = tree.find_storage('0/0')[0]
+            s = Storage(p('0/0'), 'write')
+            s.description = '0/0 description'
+            handler.dispatch(FileModifiedEvent(p('0/0/console.log')))
+            self.assertIsNone(old_storage.description)
+            handler.dispatch(FileModifiedEvent(p('0/0/storage.json')))
+            self.assertIs(tree.find_storage('0/0')[0], old_storage)
+            self.assertEqual(old_storage.description, '0/0 description')
+
+            # test renamed storage
+            os.rename(p('0/0'), p('1/2'))
+            handler.dispatch(DirMovedEvent(p('0/0'), p('1/2')))
+            self.assertEqual(storage_list(),
+                             ['0/1', '1/0', '1/1', '1/2', '2/0', '2/1'])
+
+            # test atomic replacement of storage.json
+            old_storage = tree.find_storage('0/1')[0]
+            handler.dispatch(FileMovedEvent(
+                p('0/1/.storage.json.tmp'), p('0/1/storage.json')))
+            self.assertIs(tree.find_storage('0/1')[0], old_storage)
+
+            # test deleted storage
+            shutil.rmtree(p('2'))
+            handler.dispatch(FileDeletedEvent(p('2/0/storage.json')))
+            handler.dispatch(DirDeletedEvent(p('2/0')))
+            handler.dispatch(DirDeletedEvent(p('2/1')))
+            handler.dispatch(DirDeletedEvent(p('2')))
+            self.assertEqual(storage_list(), ['0/1', '1/0', '1/1', '1/2'])
+            self.assertNotIn('2', tree.root.children)
+
+    def test_event_queue(self):
+        """Test coalescing the file system events."""
+        from watchdog.events import (DirCreatedEvent, DirModifiedEvent,
+                                     FileCreatedEvent, FileModifiedEvent)
+        from mlcomp.persist.storage_tree import (StorageTreeFileEventHandler,
+                                                 StorageTreeEventQueue)
+
+        with TemporaryDirectory() as tempdir:
+            self.populate_tree(tempdir, 1, width=2)
+            tree = StorageTree(tempdir)
+            queue = StorageTreeEventQueue(window=60)
+            handler = StorageTreeFileEventHandler(tree, queue)
+            storage_list = lambda: [k for k, v in tree.iter_storage()]
+            p = lambda s: os.path.join(tempdir, s)
+
+            # irrelevant events should be dropped
+            handler.dispatch(FileModifiedEvent(p('0/console.log')))
+            handler.dispatch(DirCreatedEvent(p('0/files/a')))
+            handler.dispatch(FileCreatedEvent(p('0/files/a/storage.json')))
+            handler.dispatch(DirModifiedEvent(p('0')))
+            self.assertEqual(len(queue), 0)
+
+            # duplicated events should be coalesced
+            for i in range(3):
+                handler.dispatch(FileModifiedEvent(p('0/running.json')))
+            Storage(p('2/0'), 'create')
+            handler.dispatch(DirCreatedEvent(p('2')))
+            handler.dispatch(DirCreatedEvent(p('2/0')))
+            handler.dispatch(FileCreatedEvent(p('2/0/storage.json')))
+            self.assertEqual(len(queue), 3)
+            self.assertEqual(storage_list(), ['0', '1'])
+
+            # the changes should be applied by flushing the queue
+            self.assertEqual(queue.flush(), 2)
+            self.assertEqual(storage_list(), ['0', '1', '2/0'])
+            self.assertEqual(queue.stats, {
+                'received': 10,
+                'dropped': 4,
+                'coalesced': 4,
+                'applied': 2,
+            })
+            self.assertEqual(queue.flush(), 0)
+
+    def test_meta_index(self):
+        """Test the secondary indexes over meta information."""
+        from mlcomp.persist.storage import STORAGE_RUNNING_STATUS
+        from mlcomp.persist.storage_status import StorageRunningStatus
+
+        with TemporaryDirectory() as tempdir:
+            self.populate_tree(tempdir, 2, width=2)
+            for i, name in enumerate(['0/0', '0/1', '1/0', '1/1']):
+                s = Storage(os.path.join(tempdir, name), 'write')
+                with s._meta.modify_context():
+                    s._meta.values['create_time'] = 1000. + (3 - i)
+                if name.startswith('0/'):
+                    s.tags.add('zero')
+                if name.endswith('/1'):
+                    s.tags.add('one')
+            status = StorageRunningStatus(
+                pid=1, hostname='host1', start_time=1., active_time=1.)
+            status.save_file(os.path.join(tempdir, '0/1',
+                                          STORAGE_RUNNING_STATUS))
+            tree = StorageTree(tempdir, lazy=True)
+            paths = lambda r: [p for p, s in r]
+
+            self.assertEqual(paths(tree.find_by_tag('zero')), ['0/0', '0/1'])
+            self.assertEqual(paths(tree.find_by_tag('one')), ['0/1', '1/1'])
+            self.assertEqual(tree.find_by_tag('two'), [])
+            self.assertEqual(paths(tree.find_by_hostname('host1')), ['0/1'])
+            self.assertEqual(paths(tree.find_by_create_time()),
+                             ['1/1', '1/0', '0/1', '0/0'])
+            self.assertEqual(
+                paths(tree.find_by_create_time(1001., 1003., reverse=True)),
+                ['0/1', '1/0']
+            )
+            self.assertEqual(tree.meta_index.tags(), [('one', 2), ('zero', 2)])
+            s = tree.find_by_tag('zero')[0][1]
+            self.assertIs(s, tree.find_storage('0/0')[0])
+
+            # the indexes should follow the changes of the tree
+            Storage(os.path.join(tempdir, '2/0'), 'create').tags.add('zero')
+            tree.update_path('2')
+            s = Storage(os.path.join(tempdir, '0/0'), 'write')
+            s.tags.remove('zero')
+            tree.reload_storage('0/0')
+            tree.remove_path('1')
+            self.assertEqual(paths(tree.find_by_tag('zero')), ['0/1', '2/0'])
+            self.assertEqual(paths(tree.find_by_tag('one')), ['0/1'])
+            self.assertEqual(len(tree.meta_index), 3)
+
+    def test_meta_index_listener(self):
+        with TemporaryDirectory() as tempdir:
+            self.populate_tree(tempdir, 2, width=2)
+            tree = StorageTree(tempdir)
+            index = tree.meta_index
+            events = []
+
+            def listener(path, items):
+                events.append((path, [(p, s.path, d['name'])
+                                      for p, s, d in items]))
+
+            # the listener should receive the storage indexed so far
+            index.add_listener(listener)
+            self.assertEqual(events, [('', [])])
+            del events[:]
+            index.refresh()
+            self.assertEqual(
+                [(path, [p for p, _, _ in items]) for path, items in events],
+                [('', ['0/0', '0/1', '1/0', '1/1'])]
+            )
+            self.assertEqual(events[0][1][0],
+                             ('0/0', os.path.join(tempdir, '0/0'), '0'))
+
+            # the dirty paths under another dirty path should be skipped
+            del events[:]
+            Storage(os.path.join(tempdir, '0/2'), 'create')
+            tree.update_path('0/2')
+            tree.set_reload('0')
+            tree.remove_path('1/1')
+            index.refresh()
+            self.assertEqual(
+                [(path, [p for p, _, _ in items]) for path, items in events],
+                [('0', ['0/0', '0/1', '0/2']), ('1/1', [])]
+            )
+
+            # a listener added later should receive all the storage
+            events2 = []
+            index.add_listener(lambda path, items: events2.append(
+                (path, [p for p, _, _ in items])))
+            self.assertEqual(events2, [('', ['0/0', '0/1', '0/2', '1/0'])])
+            index.remove_listener(listener)
+            del events[:]
+            tree.set_reload('1')
+            index.refresh()
+            self.assertEqual(events, [])
+            self.assertEqual(events2[1:], [('1', ['1/0', '1/1'])])
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import codecs
+import json
+import os
+import shutil
+import unittest
+
+from mlcomp.persist import Storage
+from mlcomp.persist.storage_tree import StorageTree
+from mlcomp.persist.storage_tree_index import (StorageTreeIndex,
+                                               STORAGE_TREE_INDEX_FILE,
+                                               get_tree_index_file)
+from mlcomp.utils import TemporaryDirectory
+
+
+class StorageTreeIndexTestCase(unittest.TestCase):
+    """Test cases for StorageTreeIndex."""
+
+    def backdate(self, path, seconds=60):
+        """Set the mtime of `path` and all its descendants to the past."""
+        for parent, dirs, files in os.walk(path):
+            for f in dirs + files:
+                p = os.path.join(parent, f)
+                st = os.stat(p)
+                os.utime(p, (st.st_atime, st.st_mtime - seconds))
+        st = os.stat(path)
+        os.utime(path, (st.st_atime, st.st_mtime - seconds))
+
+    def test_index(self):
+        with TemporaryDirectory() as tempdir:
+            index_file = os.path.join(tempdir, STORAGE_TREE_INDEX_FILE)
+            for name in ['a/1', 'a/2', 'b/1']:
+                Storage(os.path.join(tempdir, name), 'create')
+            os.makedirs(os.path.join(tempdir, 'c/d'))
+            os.makedirs(os.path.split(index_file)[0])
+            self.backdate(tempdir)
+
+            # build the tree, and the index should be saved
+            tree = StorageTree(tempdir, index_file=index_file)
+            self.assertEqual([k for k, v in tree.iter_storage()],
+                             ['a/1', 'a/2', 'b/1'])
+            self.assertTrue(tree.index.dirty)
+            self.assertTrue(tree.save_index())
+            self.assertFalse(tree.save_index())
+            with codecs.open(index_file, 'rb', 'utf-8') as f:
+                cnt = json.load(f)
+            self.assertEqual(cnt['root_dir'], os.path.abspath(tempdir))
+            self.assertEqual(
+                sorted(cnt['entries']),
+                ['', 'a', 'a/1', 'a/2', 'b', 'b/1', 'c', 'c/d']
+            )
+            self.assertEqual(cnt['entries'][''][1:], [False, ['a', 'b', 'c']])
+            self.assertEqual(cnt['entries']['a/1'][1:], [True, None])
+
+            # the index file should not be regarded as a part of the tree
+            tree = StorageTree(tempdir, index_file=index_file)
+            self.assertEqual([k for k, v in tree.iter_storage()],
+                             ['a/1', 'a/2', 'b/1'])
+            self.assertFalse(tree.index.dirty)
+
+            # the records should be trusted if mtime is not changed
+            b_stat = os.stat(os.path.join(tempdir, 'b'))
+            Storage(os.path.join(tempdir, 'b/2'), 'create')
+            os.utime(os.path.join(tempdir, 'b'),
+                     (b_stat.st_atime, b_stat.st_mtime))
+            tree = StorageTree(tempdir, index_file=index_file)
+            self.assertEqual([k for k, v in tree.iter_storage()],
+                             ['a/1', 'a/2', 'b/1'])
+            shutil.rmtree(os.path.join(tempdir, 'b/2'))
+            os.utime(os.path.join(tempdir, 'b'),
+                     (b_stat.st_atime, b_stat.st_mtime))
+
+            # changes of the directories should be discovered
+            Storage(os.path.join(tempdir, 'c/d/1'), 'create')
+            shutil.rmtree(os.path.join(tempdir, 'a/2'))
+            tree = StorageTree(tempdir, index_file=index_file)
+            self.assertEqual([k for k, v in tree.iter_storage()],
+                             ['a/1', 'b/1', 'c/d/1'])
+            self.assertTrue(tree.index.dirty)
+
+            # reloading the tree nodes should also update the index
+            Storage(os.path.join(tempdir, 'b/2'), 'create')
+            tree.set_reload('b')
+            self.assertEqual([k for k, v in tree.iter_storage()],
+                             ['a/1', 'b/1', 'b/2', 'c/d/1'])
+            tree.save_index()
+            index = StorageTreeIndex(tempdir, index_file)
+            index.load()
+            self.assertEqual(index._entries['b'][1:], (False, ['1', '2']))
+            self.assertNotIn('a/2', index._entries)
+
+            # corrupted index file should be ignored
+            with codecs.open(index_file, 'wb', 'utf-8') as f:
+                f.write('not a json')
+            tree = StorageTree(tempdir, index_file=index_file)
+            self.assertEqual([k for k, v in tree.iter_storage()],
+                             ['a/1', 'b/1', 'b/2', 'c/d/1'])
+
+    def test_index_file_in_shared_dir(self):
+        with TemporaryDirectory() as tempdir:
+            root = os.path.join(tempdir, 'root')
+            index_dir = os.path.join(tempdir, 'index')
+            Storage(os.path.join(root, 'a'), 'create')
+            index_file = get_tree_index_file(index_dir, root)
+            self.assertEqual(os.path.split(index_file)[0], index_dir)
+            self.assertNotEqual(
+                index_file, get_tree_index_file(index_dir, tempdir))
+
+            tree = StorageTree(root, index_file=index_file)
+            self.assertTrue(tree.save_index())
+            self.assertTrue(os.path.isfile(index_file))
+            self.assertEqual(os.listdir(root), ['a'])
+
+            # the index should remain dirty if failed to save
+            Storage(os.path.join(root, 'b'), 'create')
+            tree.set_reload('')
+            self.assertEqual([k for k, v in tree.iter_storage()], ['a', 'b'])
+            self.assertTrue(tree.index.dirty)
+            with open(os.path.join(tempdir, 'file'), 'wb'):
+                pass
+            tree.index.index_file = os.path.join(tempdir, 'file/index.json')
+            with self.assertRaises(Exception):
+                tree.save_index()
+            self.assertTrue(tree.index.dirty)
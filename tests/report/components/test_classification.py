@@ -5,6 +5,7 @@ import json
 from io import BytesIO
 
 import numpy as np
+from sklearn.metrics import average_precision_score, precision_recall_curve
 
 from mlcomp.report import *
 
@@ -48,69 +49,19 @@ class ClassificationTestCase(unittest.TestCase):
              'axisY': {'title': 'Precision', 'minimum': 0, 'maximum': 1.05,
                        'gridColor': '#ccc', 'gridThickness': 1}}
         )
-        self.assertEqual(
-            r_data[0]['name'],
-            'AUC curve of class 0 (area=0.9307)'
-        )
-        self.assertEqual(
-            r_data[1]['name'],
-            'AUC curve of class 1 (area=0.8041)'
-        )
-        class_0_x = np.asarray([r['x'] for r in r_data[0]['dataPoints']])
-        np.testing.assert_almost_equal(
-            class_0_x,
-            [1.0, 0.9705882352941176, 0.9411764705882353, 0.9117647058823529,
-             0.8823529411764706, 0.8823529411764706, 0.8823529411764706,
-             0.8529411764705882, 0.8529411764705882, 0.8235294117647058,
-             0.8235294117647058, 0.7941176470588235, 0.7647058823529411,
-             0.7352941176470589, 0.7352941176470589, 0.7058823529411765,
-             0.7058823529411765, 0.7058823529411765, 0.6764705882352942,
-             0.6470588235294118, 0.6176470588235294, 0.5882352941176471,
-             0.5588235294117647, 0.5294117647058824, 0.5, 0.47058823529411764,
-             0.4411764705882353, 0.4117647058823529, 0.38235294117647056,
-             0.35294117647058826, 0.3235294117647059, 0.3235294117647059,
-             0.29411764705882354, 0.2647058823529412, 0.23529411764705882,
-             0.20588235294117646, 0.17647058823529413, 0.14705882352941177,
-             0.11764705882352941, 0.08823529411764706, 0.058823529411764705,
-             0.029411764705882353, 0.0]
-        )
-        class_0_y = np.asarray([r['y'] for r in r_data[0]['dataPoints']])
-        np.testing.assert_almost_equal(
-            class_0_y,
-            [0.8095238095238095, 0.8048780487804879, 0.8, 0.7948717948717948,
-             0.7894736842105263, 0.8108108108108109, 0.8333333333333334,
-             0.8285714285714286, 0.8529411764705882, 0.8484848484848485, 0.875,
-             0.8709677419354839, 0.8666666666666667, 0.8620689655172413,
-             0.8928571428571429, 0.8888888888888888, 0.9230769230769231, 0.96,
-             0.9583333333333334, 0.9565217391304348, 0.9545454545454546,
-             0.9523809523809523, 0.95, 0.9473684210526315, 0.9444444444444444,
-             0.9411764705882353, 0.9375, 0.9333333333333333, 0.9285714285714286,
-             0.9230769230769231, 0.9166666666666666, 1.0, 1.0, 1.0, 1.0, 1.0,
-             1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
-        )
-        class_1_x = np.asarray([r['x'] for r in r_data[1]['dataPoints']])
-        np.testing.assert_almost_equal(
-            class_1_x,
-            [1.0, 0.9375, 0.9375, 0.9375, 0.9375, 0.9375, 0.9375, 0.9375,
-             0.9375, 0.9375, 0.9375, 0.9375, 0.9375, 0.9375, 0.9375, 0.875,
-             0.8125, 0.8125, 0.75, 0.75, 0.75, 0.75, 0.6875, 0.6875, 0.625,
-             0.625, 0.5625, 0.5, 0.5, 0.5, 0.5, 0.5, 0.4375, 0.375, 0.3125,
-             0.25, 0.1875, 0.125, 0.0625, 0.0]
-        )
-        class_1_y = np.asarray([r['y'] for r in r_data[1]['dataPoints']])
-        np.testing.assert_almost_equal(
-            class_1_y,
-            [0.41025641025641024, 0.39473684210526316, 0.40540540540540543,
-             0.4166666666666667, 0.42857142857142855, 0.4411764705882353,
-             0.45454545454545453, 0.46875, 0.4838709677419355, 0.5,
-             0.5172413793103449, 0.5357142857142857, 0.5555555555555556,
-             0.5769230769230769, 0.6, 0.5833333333333334, 0.5652173913043478,
-             0.5909090909090909, 0.5714285714285714, 0.6, 0.631578947368421,
-             0.6666666666666666, 0.6470588235294118, 0.6875, 0.6666666666666666,
-             0.7142857142857143, 0.6923076923076923, 0.6666666666666666,
-             0.7272727272727273, 0.8, 0.8888888888888888, 1.0, 1.0, 1.0, 1.0,
-             1.0, 1.0, 1.0, 1.0, 1.0]
-        )
+        # the expected curves follow the semantics of the installed sklearn
+        for i, y_score in enumerate((1. - self.Y_PROB, self.Y_PROB)):
+            precision, recall, _ = precision_recall_curve(
+                self.Y_TRUE, y_score, pos_label=i)
+            area = average_precision_score(self.Y_TRUE == i, y_score)
+            self.assertEqual(
+                r_data[i]['name'],
+                'AUC curve of class %d (area=%.4f)' % (i, area)
+            )
+            np.testing.assert_almost_equal(
+                [r['x'] for r in r_data[i]['dataPoints']], recall)
+            np.testing.assert_almost_equal(
+                [r['y'] for r in r_data[i]['dataPoints']], precision)
 
     def test_classification_summary(self):
         r = classification_summary(
@@ -250,5 +201,42 @@ class ClassificationTestCase(unittest.TestCase):
         np.testing.assert_almost_equal(y_pred, self.Y_PRED)
         np.testing.assert_almost_equal(y_prob, self.Y_PROB)
 
+    def test_precision_recall_at_thresholds(self):
+        p = np.asarray([.1, .2, .3, .4, .5, 1.])
+        r = np.asarray([1., .8, .6, .4, .2, 0.])
+        t = np.asarray([.3, .1, .2, .2, np.nan])
+        selected_p, selected_r = precision_recall_at_thresholds(
+            p, r, t, [.05, .1, .15, .2, .3, np.inf, -np.inf, np.nan])
+        np.testing.assert_equal(
+            selected_p, [.2, .3, .3, .1, 0., 0., .2, 0.])
+        np.testing.assert_equal(
+            selected_r, [.8, .6, .6, 1., 0., 0., .8, 0.])
+
+        # test scalar threshold
+        selected_p, selected_r = precision_recall_at_thresholds(p, r, t, .25)
+        np.testing.assert_equal(selected_p, [.1])
+        np.testing.assert_equal(selected_r, [1.])
+
+        # test the thresholds through the segment auc curve
+        _, selected_p, selected_r = binary_classification_segment_auc_curve(
+            self.Y_TRUE, self.Y_PROB, selected_threshold=[.2, .5, 1.])
+        p, r, t = precision_recall_curve(self.Y_TRUE, self.Y_PROB)
+        i = np.where(t > .5)[0][0]
+        self.assertEqual(selected_p[1], p[i])
+        self.assertEqual(selected_r[1], r[i])
+        self.assertEqual(selected_p[2], 0.)
+        self.assertEqual(selected_r[2], 0.)
+
+    def test_curve_max_points(self):
+        r = binary_classification_auc_curve(
+            self.Y_TRUE, self.Y_PROB, max_points=10)
+        for d in json.loads(r.data.data.decode('utf-8'))['data']:
+            self.assertLessEqual(len(d['dataPoints']), 10)
+
+        r = binary_classification_segment_auc_curve(
+            self.Y_TRUE, self.Y_PROB, max_points=10)
+        for d in json.loads(r.data.data.decode('utf-8'))['data']:
+            self.assertLessEqual(len(d['dataPoints']), 10)
+
 if __name__ == '__main__':
     unittest.main()
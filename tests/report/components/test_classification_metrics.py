@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import warnings
+
+import numpy as np
+from sklearn.metrics import (average_precision_score, confusion_matrix,
+                             precision_recall_curve,
+                             precision_recall_fscore_support)
+
+from mlcomp.report import ClassificationMetrics
+
+
+class ClassificationMetricsTestCase(unittest.TestCase):
+
+    def test_confusion_matrix(self):
+        y_true = np.asarray([0, 1, 2, 2, 1, 0, 3])
+        y_pred = np.asarray([0, 2, 2, 1, 1, 0, 4])
+        m = ClassificationMetrics(y_true, y_pred)
+        np.testing.assert_equal(m.labels, [0, 1, 2, 3, 4])
+        np.testing.assert_equal(m.confusion_matrix,
+                                confusion_matrix(y_true, y_pred))
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            expected = precision_recall_fscore_support(y_true, y_pred)
+            for a, b in zip(m.precision_recall_fscore_support(), expected):
+                np.testing.assert_equal(a, b)
+
+            # test specified labels, with some values not in the labels
+            labels = [2, 0, 5]
+            m = ClassificationMetrics(y_true, y_pred, labels=labels)
+            np.testing.assert_equal(m.labels, labels)
+            np.testing.assert_equal(
+                m.confusion_matrix,
+                confusion_matrix(y_true, y_pred, labels=labels)
+            )
+            expected = precision_recall_fscore_support(
+                y_true, y_pred, labels=labels)
+            for a, b in zip(m.precision_recall_fscore_support(), expected):
+                np.testing.assert_equal(a, b)
+
+        # test string labels
+        m = ClassificationMetrics(['b', 'a', 'b'], ['a', 'a', 'b'])
+        np.testing.assert_equal(m.labels, ['a', 'b'])
+        np.testing.assert_equal(m.confusion_matrix, [[1, 0], [1, 1]])
+
+        # test empty labels
+        with self.assertRaises(ValueError):
+            _ = ClassificationMetrics(y_true, y_pred, labels=[]).labels
+
+    def test_precision_recall_curve(self):
+        rs = np.random.RandomState(1234)
+        y_true = rs.randint(0, 2, size=1000)
+        for y_prob in (rs.rand(1000), rs.randint(0, 10, size=1000) / 9.):
+            m = ClassificationMetrics(y_true, y_prob=y_prob)
+            for pos_class in (0, 1):
+                if pos_class == 1:
+                    t, p = y_true, y_prob
+                else:
+                    t, p = 1 - y_true, 1. - y_prob
+                for a, b in zip(m.precision_recall_curve(pos_class),
+                                precision_recall_curve(t, p)):
+                    np.testing.assert_equal(a, b)
+                self.assertEqual(m.average_precision(pos_class),
+                                 average_precision_score(t, p))
+
+        # test two-column probabilities
+        m = ClassificationMetrics(
+            y_true, y_prob=np.stack([1. - y_prob, y_prob], axis=1))
+        np.testing.assert_equal(m.y_prob, y_prob)
+
+        # test errors
+        with self.assertRaises(ValueError):
+            m.precision_recall_curve(2)
+        with self.assertRaises(ValueError):
+            ClassificationMetrics(y_true).precision_recall_curve()
+        with self.assertRaises(ValueError):
+            _ = ClassificationMetrics(y_true).confusion_matrix
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -103,6 +103,35 @@ class TrainingMetricsTestCase(unittest.TestCase):
         np.testing.assert_almost_equal(
             np.asarray([r['y'] for r in r_data]), loss)
 
+    def test_loss_accuracy_curve_max_points(self):
+        steps = np.arange(10000)
+        loss = np.exp(-steps * 1e-3) + np.random.normal(size=10000) * .1
+        loss[5000] = 100.
+        r = loss_accuracy_curve(
+            metrics=[{'name': 'loss', 'steps': steps, 'values': loss}],
+            max_points=100
+        )
+        r_data = json.loads(r.data.data.decode('utf-8'))['data'][0]
+        x = np.asarray([p['x'] for p in r_data['dataPoints']])
+        y = np.asarray([p['y'] for p in r_data['dataPoints']])
+        self.assertLessEqual(len(x), 100)
+        self.assertEqual(x[0], 0)
+        self.assertEqual(x[-1], 9999)
+        self.assertIn(5000, x)
+        np.testing.assert_almost_equal(y, loss[x])
+
+    def test_loss_accuracy_curve_data_points_format(self):
+        steps = np.arange(5)
+        loss = np.asarray([5., 4., 3., 2., 1.])
+        r = loss_accuracy_curve(
+            metrics=[{'name': 'loss', 'steps': steps, 'values': loss}],
+            data_points_format='columns'
+        )
+        r_data = json.loads(r.data.data.decode('utf-8'))['data'][0]
+        self.assertNotIn('dataPoints', r_data)
+        self.assertEqual(r_data['dataColumns'],
+                         {'x': steps.tolist(), 'y': loss.tolist()})
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -117,5 +117,30 @@ class ReportObjectTestCase(unittest.TestCase):
             )
 
 
+    def test_unique_name_scopes(self):
+        names = [None, 'X', 'x', 'x_2', 'x', None, 'The X', 'x_1', None]
+        obj = _MyReportObject(
+            children=[_MyReportObject(name=n) for n in names],
+            name='Root'
+        )
+        obj.assign_name_scopes()
+        self.assertEqual(
+            [c.name_scope for c in obj.children],
+            ['root/my_report_object', 'root/x', 'root/x_1', 'root/x_2',
+             'root/x_3', 'root/my_report_object_1', 'root/x_4', 'root/x_1_1',
+             'root/my_report_object_2']
+        )
+
+        # a long name should be truncated before numbered
+        obj = _MyReportObject(children=[_MyReportObject(name='y' * 80)] * 2)
+        obj.children.append(_MyReportObject(name='y' * 80))
+        obj.assign_name_scopes()
+        self.assertEqual(
+            [c.name_scope for c in obj.children],
+            ['my_report_object/' + 'y' * 64] * 2 +
+            ['my_report_object/' + 'y' * 64 + '_1']
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,9 +2,12 @@
 # -*- coding: utf-8 -*-
 import gzip
 import json
+import math
 import unittest
+from base64 import b64decode
 from io import BytesIO
 
+import numpy as np
 from PIL import Image as PILImage
 
 from mlcomp.report import ReportSaver, Report
@@ -470,5 +473,77 @@ class ElementsTestCase(unittest.TestCase):
                                'type': 'column'}]}
                 )
 
+    def test_CanvasJS_data_points(self):
+        x = np.asarray([0, 1, 2])
+        y = np.asarray([.5, np.nan, 1.5])
+        self.assertEqual(
+            CanvasJS.data_points(x, [1, 2, 3]),
+            {'dataPoints': [{'x': 0, 'y': 1}, {'x': 1, 'y': 2},
+                            {'x': 2, 'y': 3}]}
+        )
+        self.assertEqual(
+            CanvasJS.data_points(x, [1, 2, 3], 'columns'),
+            {'dataColumns': {'x': [0, 1, 2], 'y': [1, 2, 3]}}
+        )
+        r = CanvasJS.data_points(x, y, 'binary')['dataColumns']
+        self.assertEqual(r['encoding'], 'base64')
+        np.testing.assert_equal(
+            np.frombuffer(b64decode(r['x']), dtype='<f8'), x)
+        np.testing.assert_equal(
+            np.frombuffer(b64decode(r['y']), dtype='<f8'), y)
+
+        with self.assertRaises(ValueError):
+            _ = CanvasJS.data_points(x, y, 'unknown')
+        with self.assertRaises(ValueError):
+            _ = CanvasJS.data_points(x, y[:2])
+
+    def test_DataTable(self):
+        with TemporaryDirectory() as tempdir:
+            r = DataTable(
+                columns=['a', 'b', 'c', 'd'],
+                values=[[1, 2, 3], [1.5, float('nan'), 2.0],
+                        [True, False, True], ['x', None, 1.25]],
+                index=[['i', 'i', 'j'], [1, 2, 2]],
+                index_names=['first', None],
+                title='My Table'
+            )
+            ReportSaver(tempdir).save(r)
+            self.assertTrue(is_report_element(r))
+            self.assertEqual(
+                json.loads(r.to_json(sort_keys=True)),
+                {'__id__': 0,
+                 '__type__': 'DataTable',
+                 'data': {'__id__': 1,
+                          '__type__': 'Resource',
+                          'extension': '.json',
+                          'gzip_compress': True,
+                          'name': 'Data',
+                          'name_scope': 'data_table/data',
+                          'path': 'res/data_table/data.json'},
+                 'name_scope': 'data_table',
+                 'title': 'My Table'}
+            )
+            with gzip.open(tempdir + '/res/data_table/data.json.gz') as f:
+                data = json.loads(f.read().decode('utf-8'))
+            self.assertTrue(math.isnan(data['values'][1][1]))
+            data['values'][1][1] = None
+            self.assertEqual(
+                data,
+                {'num_rows': 3,
+                 'columns': ['a', 'b', 'c', 'd'],
+                 'kinds': ['i', 'f', 'b', 's'],
+                 'values': [[1, 2, 3], [1.5, None, 2.0],
+                            [True, False, True], ['x', '', '1.25']],
+                 'index_names': ['first', None],
+                 'index': [{'values': ['i', 'j'], 'spans': [2, 1]},
+                           {'values': ['1', '2'], 'spans': [1, 2]}]}
+            )
+
+        # test errors
+        with self.assertRaises(ValueError):
+            _ = DataTable(columns=['a', 'b'], values=[[1, 2], [3]])
+        with self.assertRaises(ValueError):
+            _ = DataTable(columns=['a'], values=[[1, 2], [3, 4]])
+
 if __name__ == '__main__':
     unittest.main()
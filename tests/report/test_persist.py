@@ -3,9 +3,12 @@ import copy
 import os
 import unittest
 
+import numpy as np
+
+from mlcomp import __version__
 from mlcomp.utils import TemporaryDirectory
 from mlcomp.report import (ReportSaver, ReportObject, Resource,
-                           default_report_types, Report)
+                           default_report_types, Report, ReportJsonEncoder)
 
 from .helper import to_config
 
@@ -73,6 +76,14 @@ class PersistTestCase(unittest.TestCase):
             saver = ReportSaver(tempdir + '/2', overwrite=True)
             saver.save(report)
 
+            # test writing with workers
+            saver = ReportSaver(tempdir + '/4', save_workers=2)
+            saver.save(report)
+            report2 = saver.load()
+            self.assertEqual(to_config(report), to_config(report2))
+            self.assertEqual(report.children[1].children[0].data,
+                             report2.children[1].children[0].data)
+
             # test the `save` and `load` method of Report
             report.save(tempdir + '/3')
             report2 = Report.load(tempdir + '/3')
@@ -90,5 +101,123 @@ class PersistTestCase(unittest.TestCase):
             with self.assertRaises(IOError):
                 report.save(tempdir + '/3')
 
+    def test_lazy_and_partial_load(self):
+        report = Report(
+            children=[
+                Resource(data=b'123'),
+                MyReportObject(
+                    Resource(data=b'456'),
+                    children=[
+                        Resource(data=b'789')
+                    ]
+                )
+            ]
+        )
+
+        with default_report_types({'MyReport': MyReportObject}), \
+                TemporaryDirectory() as tempdir:
+            saver = ReportSaver(tempdir)
+            saver.save(report)
+
+            # test lazy loading
+            report2 = Report.load(tempdir, lazy=True)
+            self.assertEqual(to_config(report), to_config(report2))
+            resources = [report2.children[0], report2.children[1].value,
+                         report2.children[1].children[0]]
+            self.assertFalse(any(r.has_loaded for r in resources))
+            self.assertEqual(resources[1].data, b'456')
+            self.assertTrue(resources[1].has_loaded)
+            self.assertFalse(resources[0].has_loaded)
+
+            # test partial loading
+            name_scope = report.children[1].name_scope
+            self.assertIs(report.find_name_scope(name_scope),
+                          report.children[1])
+            self.assertIsNone(report.find_name_scope(name_scope + '/x'))
+            os.remove(os.path.join(
+                tempdir, report2.children[0].path))
+            obj = saver.load(name_scope=name_scope)
+            self.assertIsInstance(obj, MyReportObject)
+            self.assertEqual(obj.name_scope, name_scope)
+            self.assertEqual(obj.value.data, b'456')
+            self.assertEqual(obj.children[0].data, b'789')
+            obj = saver.load(name_scope=report.children[1].value.name_scope)
+            self.assertEqual(obj.data, b'456')
+            with self.assertRaises(KeyError):
+                saver.load(name_scope=name_scope + '/x')
+
+            # the removed resource should only fail when accessed
+            report2 = saver.load(lazy=True)
+            with self.assertRaises(IOError):
+                _ = report2.children[0].data
+
+    def test_shared_objects(self):
+        shared = Resource(data=b'123')
+        report = Report(
+            children=[
+                MyReportObject(shared, children=[MyReportObject(1)]),
+                MyReportObject(children=[shared]),
+            ]
+        )
+
+        with default_report_types({'MyReport': MyReportObject}), \
+                TemporaryDirectory() as tempdir:
+            saver = ReportSaver(tempdir)
+            saver.save(report)
+            with open(os.path.join(tempdir, 'report.json'), 'rb') as f:
+                cnt = f.read().decode('utf-8')
+            # the streaming output should be identical to the ordinary one
+            self.assertEqual(
+                cnt,
+                ReportJsonEncoder(sort_keys=True).encode({
+                    'generator': 'mlcomp %s' % __version__,
+                    'report': report,
+                })
+            )
+            self.assertEqual(cnt.count('"ObjectRef"'), 1)
+
+            report2 = saver.load()
+            self.assertEqual(to_config(report), to_config(report2))
+            self.assertIs(report2.children[0].value,
+                          report2.children[1].children[0])
+            self.assertEqual(report2.children[0].value.data, b'123')
+
+    def test_ndarray_spill(self):
+        small = np.arange(4, dtype=np.int32)
+        large = np.arange(24, dtype=np.float64).reshape([2, 3, 4])
+        report = Report(
+            children=[
+                MyReportObject(small),
+                MyReportObject(large),
+                MyReportObject(large),
+                MyReportObject(np.asarray(['a', None], dtype=object)),
+            ]
+        )
+
+        with default_report_types({'MyReport': MyReportObject}), \
+                TemporaryDirectory() as tempdir:
+            saver = ReportSaver(tempdir, ndarray_spill_size=64)
+            saver.save(report)
+            self.assertEqual(
+                sorted(os.listdir(os.path.join(tempdir, 'res/_ndarray'))),
+                ['1.npy']
+            )
+            report2 = saver.load()
+            values = [c.value for c in report2.children]
+            self.assertNotIsInstance(values[0], np.memmap)
+            np.testing.assert_equal(values[0], small)
+            self.assertIsInstance(values[1], np.memmap)
+            self.assertEqual(values[1].dtype, large.dtype)
+            np.testing.assert_equal(values[1], large)
+            self.assertIs(values[2], values[1])
+            self.assertFalse(values[1].flags.writeable)
+            self.assertEqual(values[3].tolist(), ['a', None])
+
+            # the spilled arrays cannot be loaded without resource manager
+            with open(os.path.join(tempdir, 'report.json'), 'rb') as f:
+                cnt = f.read().decode('utf-8')
+            with self.assertRaises(ValueError):
+                ReportObject.from_json(cnt)
+
 if __name__ == '__main__':
     unittest.main()
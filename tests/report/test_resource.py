@@ -109,6 +109,111 @@ class ResourceTestCase(unittest.TestCase):
             with self.assertRaises(ValueError):
                 rm.load('3/4/5.txt')
 
+    def test_ResourceManager_workers(self):
+        with TemporaryDirectory() as tempdir:
+            with ResourceManager(save_dir=tempdir, rel_path='res',
+                                 workers=4) as rm:
+                paths = [
+                    rm.save(six.b(str(i)) * 1000, 'a/%d' % i, extension='.txt',
+                            gzip_compress=(i % 2 == 0))
+                    for i in range(32)
+                ]
+                rm.wait()
+                self.assertEqual(paths,
+                                 ['res/a/%d.txt' % i for i in range(32)])
+                for i, p in enumerate(paths):
+                    self.assertEqual(rm.load(p, gzip_compress=(i % 2 == 0)),
+                                     six.b(str(i)) * 1000)
+
+                # the errors in the workers should be raised by `wait`
+                os.makedirs(os.path.join(tempdir, 'b.txt'))
+                self.assertEqual(rm.save(b'123', 'b', extension='.txt'),
+                                 'res/b.txt')
+                rm.save(b'456', 'c', extension='.txt')
+                with self.assertRaises(IOError):
+                    rm.wait()
+                self.assertEqual(rm.load('res/c.txt'), b'456')
+                rm.wait()
+
+    def test_compression(self):
+        # test the resource config
+        r = Resource(b'123', compression='gzip')
+        self.assertTrue(r.gzip_compress)
+        self.assertEqual(r.codec, 'gzip')
+        self.assertEqual(r.to_config(), {'data': b'123', 'gzip_compress': True})
+        r = Resource(b'123', compression='lzma', compression_level=1)
+        self.assertEqual(r.codec, 'lzma')
+        self.assertEqual(
+            r.to_config(),
+            {'data': b'123', 'compression': 'lzma', 'compression_level': 1}
+        )
+        with self.assertRaises(ValueError):
+            Resource(b'123', gzip_compress=True, compression='zlib')
+
+        with TemporaryDirectory() as tempdir:
+            rm = ResourceManager(tempdir)
+            for codec, suffix in [('gzip', '.gz'), ('zlib', '.zz'),
+                                  ('lzma', '.xz')]:
+                self.assertEqual(
+                    rm.save(b'123', codec, '.txt', compression=codec,
+                            compression_level=1),
+                    codec + '.txt'
+                )
+                self.assertTrue(
+                    os.path.isfile(os.path.join(tempdir, codec + '.txt' +
+                                                suffix)))
+                self.assertEqual(rm.load(codec + '.txt', compression=codec),
+                                 b'123')
+            with self.assertRaises(KeyError):
+                rm.save(b'123', 'x', '.txt', compression='unknown')
+
+            # test overriding the compression of resources
+            rm = ResourceManager(tempdir, compression='zlib')
+            r = Resource(b'123', extension='.txt', gzip_compress=True)
+            r2 = Resource(b'456', extension='.txt')
+            report = MyReportObject(children=[r, r2])
+            report.assign_name_scopes()
+            report.save_resources(rm)
+            self.assertFalse(r.gzip_compress)
+            self.assertEqual(r.compression, 'zlib')
+            self.assertIsNone(r2.codec)
+            r = Report.from_json(r.to_json())
+            r.load_resources(rm)
+            self.assertEqual(r.data, b'123')
+
+    def test_ResourceManager_blob_dir(self):
+        with TemporaryDirectory() as tempdir:
+            blob_dir = os.path.join(tempdir, 'blobs')
+            for name in ('1', '2'):
+                rm = ResourceManager(os.path.join(tempdir, name),
+                                     blob_dir=blob_dir)
+                self.assertEqual(rm.save(b'123', 'a', extension='.txt'),
+                                 'a.txt')
+                self.assertEqual(rm.save(b'123', 'b', extension='.txt',
+                                         gzip_compress=True), 'b.txt')
+                self.assertEqual(rm.save(b'456', 'c', extension='.txt'),
+                                 'c.txt')
+                self.assertEqual(rm.load('a.txt'), b'123')
+                self.assertEqual(rm.load('b.txt', gzip_compress=True), b'123')
+                self.assertEqual(rm.load('c.txt'), b'456')
+
+            # identical resources should share the same blob
+            def inode(path):
+                return os.stat(os.path.join(tempdir, path)).st_ino
+            self.assertEqual(inode('1/a.txt'), inode('2/a.txt'))
+            self.assertEqual(inode('1/b.txt.gz'), inode('2/b.txt.gz'))
+            self.assertNotEqual(inode('1/a.txt'), inode('1/b.txt.gz'))
+            self.assertNotEqual(inode('1/a.txt'), inode('1/c.txt'))
+            self.assertEqual(
+                sum(len(files) for _, _, files in os.walk(blob_dir)), 3)
+
+            # overwriting a resource should not change the blob
+            rm = ResourceManager(os.path.join(tempdir, '2'))
+            rm.save(b'789', 'a', extension='.txt')
+            self.assertEqual(rm.load('a.txt'), b'789')
+            with open(os.path.join(tempdir, '1/a.txt'), 'rb') as f:
+                self.assertEqual(f.read(), b'123')
+
     def test_SaveLoadResources(self):
         with default_report_types({'MyReport': MyReportObject}), \
                 TemporaryDirectory() as tempdir:
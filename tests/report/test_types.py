@@ -69,6 +69,54 @@ class TypesTestCase(unittest.TestCase):
         self.assertEqual(ctx.type_to_name(HTML), 'HTML')
         self.assertEqual(ctx.type_to_name(MyReport), my_report_name)
 
+    def test_cache(self):
+        ctx = ReportTypes()
+        for _ in range(2):
+            self.assertIs(ctx.name_to_type('HTML'), HTML)
+            self.assertEqual(ctx.type_to_name(HTML), 'HTML')
+            with self.assertRaisesRegex(KeyError, 'MyReport'):
+                ctx.name_to_type('MyReport')
+            with self.assertRaises(KeyError):
+                ctx.type_to_name(MyReport)
+
+        # the caches should be cleared once the mappings are changed
+        ctx.mappings['MyReport'] = MyReport
+        self.assertIs(ctx.name_to_type('MyReport'), MyReport)
+        self.assertEqual(ctx.type_to_name(MyReport), 'MyReport')
+        ctx.mappings.update({'HTML': MyReport})
+        self.assertIs(ctx.name_to_type('HTML'), MyReport)
+        del ctx.mappings['MyReport']
+        with self.assertRaises(KeyError):
+            ctx.name_to_type('MyReport')
+        self.assertEqual(ctx.type_to_name(MyReport), 'HTML')
+        ctx.mappings = {}
+        self.assertIs(ctx.name_to_type('HTML'), HTML)
+        with self.assertRaises(KeyError):
+            ctx.type_to_name(MyReport)
+        ctx.safe_mode = False
+        self.assertEqual(ctx.type_to_name(MyReport), my_report_name)
+        self.assertIs(ctx.name_to_type(my_report_name), MyReport)
+
+        # the failures should not be cached, and the in-place union of
+        # the mappings (Python 3.9+) should also clear the caches
+        if hasattr(dict, '__ior__'):
+            mappings = ctx.mappings
+            self.assertIs(ctx.name_to_type('HTML'), HTML)
+            mappings |= {'HTML': MyReport}
+            self.assertIs(ctx.name_to_type('HTML'), MyReport)
+            with self.assertRaises(KeyError):
+                ctx.name_to_type('MyReport')
+            mappings |= {'MyReport': MyReport}
+            self.assertIs(ctx.name_to_type('MyReport'), MyReport)
+            ctx.mappings = {}
+
+        # the copied context should not share the caches
+        ctx2 = ctx.copy({'MyReport': MyReport})
+        self.assertIs(ctx2.name_to_type('MyReport'), MyReport)
+        with self.assertRaises(KeyError):
+            ctx.name_to_type('MyReport')
+        self.assertEqual(ctx.mappings, {})
+
     def test_context(self):
         ctx = get_default_report_types()
         self.assertTrue(ctx.safe_mode)
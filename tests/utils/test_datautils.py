@@ -3,7 +3,8 @@ import unittest
 import numpy as np
 
 from mlcomp.utils import (minibatch_iterator, minibatch_slices_iterator,
-                          split_numpy_arrays, split_numpy_array)
+                          split_numpy_arrays, split_numpy_array,
+                          downsample_curve)
 from tests.helper import TestCase
 
 
@@ -160,5 +161,46 @@ class SplitNumpyArraysTestCase(TestCase):
         np.testing.assert_equal(right, [9])
 
 
+class DownsampleCurveTestCase(TestCase):
+
+    def test_small_curve(self):
+        x, y = np.arange(10), np.arange(10.)
+        for method in ('lttb', 'minmax'):
+            x2, y2 = downsample_curve(x, y, 10, method=method)
+            self.assertIs(x2, x)
+            self.assertIs(y2, y)
+
+    def test_downsample(self):
+        x = np.arange(10000)
+        y = np.sin(x * 1e-3)
+        y[1234] = 10.
+        y[5678] = -10.
+        for method in ('lttb', 'minmax'):
+            for max_points in (3, 4, 5, 100, 101):
+                x2, y2 = downsample_curve(x, y, max_points, method=method)
+                self.assertLessEqual(len(x2), max_points)
+                self.assertEqual(x2[0], 0)
+                self.assertEqual(x2[-1], 9999)
+                self.assertTrue(np.all(np.diff(x2) > 0))
+                np.testing.assert_equal(y2, y[x2])
+            self.assertIn(1234, x2)
+            self.assertIn(5678, x2)
+
+        # test NaN values
+        y[:5000] = np.nan
+        for method in ('lttb', 'minmax'):
+            x2, y2 = downsample_curve(x, y, 100, method=method)
+            self.assertLessEqual(len(x2), 100)
+            self.assertIn(5678, x2)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            downsample_curve(np.arange(10), np.arange(9), 5)
+        with self.assertRaises(ValueError):
+            downsample_curve(np.arange(10), np.arange(10), 2)
+        with self.assertRaises(ValueError):
+            downsample_curve(np.arange(10), np.arange(10), 5, method='x')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -134,6 +134,64 @@ class JsonEncoderTestCase(TestCase):
         e = _MyJsonEncoder(sort_keys=True, object_ref=False)
         self.assertEqual(e.encode(REF_OBJECT[0]), REF_OBJECT[2])
 
+    def test_binary_ndarray(self):
+        arrays = [
+            np.arange(16, dtype=np.int32),
+            np.asarray(1.5, dtype=np.float64),
+            np.arange(24, dtype='>f4').reshape([2, 3, 4]),
+            np.arange(24, dtype=np.int64).reshape([4, 6])[:, ::2],
+            np.asarray([True, False]),
+            np.asarray(['a', 'bc']),
+            np.zeros([0, 3], dtype=np.uint8),
+        ]
+        for compress in (False, True):
+            e = JsonEncoder(ndarray_format='binary', ndarray_compress=compress)
+            cnt = e.encode(arrays)
+            decoded = JsonDecoder().decode(cnt)
+            for a, b in zip(arrays, decoded):
+                self.assertEqual(b.shape, a.shape)
+                self.assertEqual(b.dtype.newbyteorder('<'),
+                                 a.dtype.newbyteorder('<'))
+                np.testing.assert_equal(b, a)
+            self.assertIn(
+                '"encoding": "%s"' % ('zlib' if compress else 'base64'), cnt)
+
+        # the buffer should be encoded in little-endian
+        e = JsonEncoder(ndarray_format='binary', sort_keys=True)
+        self.assertEqual(
+            e.encode(np.asarray([1, 2], dtype='>u2')),
+            '{"__id__": 0, "__type__": "ndarray", "data": "AQACAA==", '
+            '"dtype": "<u2", "encoding": "base64", "shape": [2]}'
+        )
+
+        # arrays of object dtype should be encoded as lists
+        e = JsonEncoder(ndarray_format='binary', sort_keys=True)
+        self.assertEqual(
+            e.encode(np.asarray([1, 'a'], dtype=object)),
+            '{"__id__": 0, "__type__": "ndarray", "data": [1, "a"], '
+            '"dtype": "object"}'
+        )
+
+        with self.assertRaisesRegex(ValueError, 'Unknown ndarray format'):
+            JsonEncoder(ndarray_format='xyz')
+
+    def test_dump(self):
+        class _Writer(object):
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, s):
+                self.chunks.append(s)
+
+        for obj, expected in (BASIC_OBJECT, MY_OBJECT, REF_OBJECT[:2]):
+            e = _MyJsonEncoder(sort_keys=True)
+            for buffer_size in (1, 16, 65536):
+                w = _Writer()
+                e.dump(obj, w, buffer_size=buffer_size)
+                self.assertEqual(''.join(w.chunks), expected)
+                if buffer_size >= 16:
+                    self.assertTrue(all(len(c) >= 16 for c in w.chunks[:-1]))
+
 
 class JsonDecoderTestCase(TestCase):
 
@@ -156,6 +214,20 @@ class JsonDecoderTestCase(TestCase):
         self.assertIs(decoded[1], decoded[0])
         self.assertIs(decoded[2].value, decoded[0])
 
+    def test_object_ref_id_popped(self):
+        class _PopIdJsonDecoder(_MyJsonDecoder):
+
+            def _pop_id_handler(self, v):
+                v.pop('__id__', None)
+                return iter(())
+
+            OBJECT_HANDLERS = \
+                [_pop_id_handler] + _MyJsonDecoder.OBJECT_HANDLERS
+
+        decoded = _PopIdJsonDecoder().decode(REF_OBJECT[1])
+        self.assertIs(decoded[1], decoded[0])
+        self.assertIs(decoded[2].value, decoded[0])
+
     def test_object_ref_error(self):
         with self.assertRaisesRegex(
                 KeyError, r'Object reference .* is not defined.'):